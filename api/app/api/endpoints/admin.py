@@ -1,20 +1,25 @@
-from fastapi import APIRouter, HTTPException, BackgroundTasks
-from app.services.scheduler import scheduler_service
+from fastapi import APIRouter, Depends, HTTPException
+from app.db.session import get_db
+from app.services.run_state import get_run_store
+from supabase import Client
 
 router = APIRouter()
 
-@router.post("/crawl/manual")
-async def trigger_manual_crawl(background_tasks: BackgroundTasks):
+@router.post("/crawl/manual", status_code=202)
+def trigger_manual_crawl(db: Client = Depends(get_db)):
     """
     Manually trigger the daily update job.
-    This runs in the background to avoid blocking the request.
+    Only records a run request; the pipeline worker (python -m app.worker) picks it up
+    within WORK_POLL_SECONDS, so no crawl ever runs in an API process.
     """
     try:
-        # Run in background to return response immediately
-        background_tasks.add_task(scheduler_service.trigger_manual_update)
-        return {"message": "Manual crawl triggered successfully. Check logs for progress."}
+        run = get_run_store().request_run(db)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to trigger crawl: {str(e)}")
+    return {
+        "message": "Manual crawl requested. The worker starts it shortly; check its logs for progress.",
+        "run_id": run["run_id"]
+    }
 
 @router.get("/crawl/debug")
 async def debug_crawl():
@@ -10,7 +10,7 @@ class AlertRequest(BaseModel):
     email: str # In a real app, we'd get this from the JWT token
 
 @router.post("/{event_id}")
-async def toggle_alert(
+def toggle_alert(
     event_id: int, 
     request: AlertRequest,
     authorization: str = Header(None),
@@ -43,10 +43,10 @@ async def toggle_alert(
         # Subscribe
         db.table("alerts").insert({"user_id": user_id, "event_id": event_id}).execute()
         
-        # Send welcome email (async in production, sync for MVP)
+        # Queue the welcome email (first alert only); the outbox worker delivers it
         # We use the email provided in request for now as Supabase user object might need extra call to get email if not in session
         # But actually user.user.email should be available
         user_email = user.user.email or request.email
-        email_service.send_welcome_email(user_email, user_email.split("@")[0])
+        email_service.queue_welcome_email(user_email, user_email.split("@")[0], user_id=user_id, db=db)
         
         return {"status": "subscribed", "message": "Alert set! Check your email."}
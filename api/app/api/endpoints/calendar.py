@@ -0,0 +1,173 @@
+import calendar as month_calendar
+from collections import Counter
+from datetime import date
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request, Response
+from typing import Optional, Set
+import orjson
+from app.api.fieldsets import parse_fields, select_columns
+from app.api.serialization import ORJSONBytesResponse, project, sparse
+from app.core.config import get_settings
+from app.db.session import get_db
+from app.schemas.event import CalendarRangeResponse, EventResponse
+from app.services.calendar_index import get_calendar_index
+from app.services.calendar_snapshots import (
+    EMPTY_SNAPSHOT, MONTH_PATTERN, SNAPSHOT_ALL, TICKER_PATTERN,
+    Snapshot, get_snapshot_store, month_snapshot, ticker_snapshot
+)
+from app.services.read_cache import cached_read
+from supabase import Client
+
+router = APIRouter()
+
+# Longest window /range answers (a month view with the surrounding weeks fits)
+RANGE_MAX_DAYS = 62
+
+
+def _accepted_encodings(header: str) -> Set[str]:
+    """Content codings of an Accept-Encoding header with q > 0."""
+    accepted = set()
+    for part in header.split(","):
+        coding, _, params = part.partition(";")
+        coding = coding.strip().lower()
+        q = 1.0
+        params = params.strip().lower()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if coding and q > 0:
+            accepted.add(coding)
+    return accepted
+
+
+def _not_modified(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison (RFC 9110): any encoding's tag of the same content matches."""
+    if not if_none_match:
+        return False
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*":
+            return True
+        tag = tag.removeprefix("W/").strip('"')
+        if tag.split("-")[0] == etag:
+            return True
+    return False
+
+
+def _serve(snapshot: Snapshot, request: Request) -> Response:
+    """
+    The stored bytes as-is: brotli, gzip or identity by Accept-Encoding, each with its
+    own strong ETag; 304 when the client already has the content.
+    """
+    headers = {
+        "Cache-Control": f"public, max-age={get_settings().SNAPSHOT_MAX_AGE_SECONDS}",
+        "Vary": "Accept-Encoding"
+    }
+    accepted = _accepted_encodings(request.headers.get("accept-encoding", ""))
+
+    if snapshot.br is not None and ("br" in accepted or "*" in accepted):
+        body, coding = snapshot.br, "br"
+    elif "gzip" in accepted or "*" in accepted:
+        body, coding = snapshot.gzip, "gzip"
+    else:
+        body, coding = snapshot.body, None
+
+    headers["ETag"] = f'"{snapshot.etag}-{coding}"' if coding else f'"{snapshot.etag}"'
+    if _not_modified(request.headers.get("if-none-match"), snapshot.etag):
+        return Response(status_code=304, headers=headers)
+
+    if coding:
+        headers["Content-Encoding"] = coding
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def _load(name: str, db: Client) -> Optional[Snapshot]:
+    return cached_read(("snapshot", name), lambda: get_snapshot_store().read(name, db))
+
+
+@router.get("/")
+def read_calendar(request: Request, db: Client = Depends(get_db)):
+    """
+    All ACTIVE events ordered by target date, from the snapshot written by the last
+    pipeline run (no events query, no JSON encoding). Same body as /events.
+    """
+    snapshot = _load(SNAPSHOT_ALL, db)
+    if snapshot is None:
+        raise HTTPException(status_code=404, detail="Calendar snapshot not generated yet")
+    return _serve(snapshot, request)
+
+
+@router.get("/months/{month}")
+def read_calendar_month(
+    request: Request,
+    month: str = Path(..., pattern=MONTH_PATTERN.pattern, description="YYYY-MM"),
+    db: Client = Depends(get_db)
+):
+    """
+    ACTIVE events with a target date in this month.
+    """
+    return _serve(_load(month_snapshot(month), db) or EMPTY_SNAPSHOT, request)
+
+
+@router.get("/tickers/{ticker}")
+def read_calendar_ticker(request: Request, ticker: str, db: Client = Depends(get_db)):
+    """
+    ACTIVE events related to this ticker.
+    """
+    ticker = ticker.upper()
+    if not TICKER_PATTERN.match(ticker):
+        raise HTTPException(status_code=400, detail="Invalid ticker")
+    return _serve(_load(ticker_snapshot(ticker), db) or EMPTY_SNAPSHOT, request)
+
+
+@router.get("/range", response_model=CalendarRangeResponse)
+def read_calendar_range(
+    month: Optional[str] = Query(None, pattern=MONTH_PATTERN.pattern, description="YYYY-MM, instead of start/end"),
+    start: Optional[date] = Query(None, description="First day of the window"),
+    end: Optional[date] = Query(None, description="Last day of the window (inclusive)"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields and/or presets (calendar, card)"),
+    db: Client = Depends(get_db)
+):
+    """
+    ACTIVE events in a month or week window, with per-day counts.
+    Answered from an in-process index of the calendar snapshot (no database query);
+    before the first snapshot exists, from the (status, target_date) index instead.
+    """
+    if month:
+        year, number = (int(part) for part in month.split("-"))
+        start, end = date(year, number, 1), date(year, number, month_calendar.monthrange(year, number)[1])
+    elif start is None or end is None:
+        raise HTTPException(status_code=400, detail="Give month, or start and end")
+    if end < start:
+        raise HTTPException(status_code=400, detail="end is before start")
+    if (end - start).days >= RANGE_MAX_DAYS:
+        raise HTTPException(status_code=400, detail=f"Window is longer than {RANGE_MAX_DAYS} days")
+    fieldset = parse_fields(fields)
+
+    def load():
+        snapshot = _load(SNAPSHOT_ALL, db)
+        if snapshot is not None:
+            index = get_calendar_index(snapshot.etag, lambda: orjson.loads(snapshot.body))
+            events = index.month(month) if month else index.window(start, end)
+            day_counts = index.counts(start, end)
+        else:
+            events = db.table("events")\
+                .select(select_columns(fieldset, "id", "target_date"))\
+                .eq("status", "ACTIVE")\
+                .gte("target_date", start.isoformat())\
+                .lte("target_date", end.isoformat())\
+                .order("target_date")\
+                .order("id")\
+                .execute().data
+            day_counts = dict(Counter(str(event["target_date"])[:10] for event in events))
+
+        return orjson.dumps({
+            "start": start,
+            "end": end,
+            "day_counts": day_counts,
+            "events": [sparse(e, fieldset) if fieldset else project(EventResponse, e) for e in events]
+        })
+
+    body = cached_read(("calendar-range", start, end, fieldset), load)
+    return ORJSONBytesResponse(body, headers={"Cache-Control": f"public, max-age={get_settings().SNAPSHOT_MAX_AGE_SECONDS}"})
@@ -1,47 +1,184 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
 from typing import List, Optional
-from app.schemas.event import EventCreate, EventResponse, EventUpdate
+from datetime import date
+from app.schemas.event import (
+    EventCreate, EventDetailResponse, EventResponse, EventUpdate, EventSort, EventStatus, EventType,
+    HypeSeriesResponse, MetricResolution
+)
+from app.api.pagination import EVENT_SORTS, encode_cursor, keyset_filter
+from app.api.fieldsets import DETAIL_EXTRA_FIELDS, EVENT_COLUMN_FIELDS, parse_fields, select_columns
+from app.api.serialization import ORJSONBytesResponse, dump_event_detail, dump_events, iter_events
+from app.core.config import get_settings
 from app.db.session import get_db
+from app.services.read_cache import cached_read, invalidate_events
+from app.services.hype_series import BUCKET_UNITS, SUMMARY_BUCKETS, lttb, summarize, to_point
 from supabase import Client
 
 router = APIRouter()
 
+# Series points are computed here (not trusted DB rows): validate + serialize in one pass
+SERIES_ADAPTER = TypeAdapter(HypeSeriesResponse)
+
+
+def _metric_buckets(db: Client, event_id: int, unit: str, **params):
+    """hype_metric_buckets rows as series points, oldest first."""
+    response = db.rpc("hype_metric_buckets", {"p_event_id": event_id, "p_bucket": unit, **params}).execute()
+    return [to_point(row) for row in reversed(response.data or [])]
+
+
 @router.get("/", response_model=List[EventResponse])
 def read_events(
-    skip: int = 0, 
-    limit: int = 100, 
+    status: Optional[List[EventStatus]] = Query(None, description="One or more statuses"),
+    ticker: Optional[str] = Query(None, description="Events related to this ticker"),
+    date_from: Optional[date] = Query(None, description="target_date on or after"),
+    date_to: Optional[date] = Query(None, description="target_date on or before"),
+    min_hype_score: Optional[int] = Query(None, ge=0, le=100),
+    event_type: Optional[EventType] = None,
+    sort: EventSort = EventSort.HYPE_SCORE_DESC,
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page"),
+    limit: int = Query(100, ge=1, le=500),
+    skip: int = Query(0, ge=0, description="Deprecated offset paging (ignored with a cursor)"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields and/or presets (calendar, card)"),
     db: Client = Depends(get_db)
 ):
     """
-    Retrieve active events.
+    Retrieve events, filtered and sorted, with keyset pagination.
+    The body is the page; the cursor of the next page is returned in the
+    X-Next-Cursor header (absent on the last page).
+    Pages are served from the read cache until the pipeline or an API write changes events;
+    pages larger than API_STREAM_MIN_ROWS are streamed instead (and not cached).
+    With fields=, only those columns are read and returned (id is always included).
     """
-    # Supabase-py query
-    response = db.table("events").select("*").range(skip, skip + limit - 1).execute()
-    return response.data
+    fieldset = parse_fields(fields)
+    statuses = tuple(sorted({s.value for s in status})) if status else ()
+    ticker = ticker.upper() if ticker else None
+    key = (
+        "events", statuses, ticker, date_from, date_to, min_hype_score,
+        event_type.value if event_type else None, sort.value, cursor, limit, 0 if cursor else skip, fieldset
+    )
+
+    def fetch():
+        column, descending = EVENT_SORTS[sort.value]
+        # The sort column is read even when not requested: the next cursor is built from it
+        query = db.table("events").select(select_columns(fieldset, "id", column))
+
+        if statuses:
+            query = query.in_("status", list(statuses))
+        if ticker:
+            query = query.contains("related_tickers", [ticker])
+        if date_from:
+            query = query.gte("target_date", date_from.isoformat())
+        if date_to:
+            query = query.lte("target_date", date_to.isoformat())
+        if min_hype_score is not None:
+            query = query.gte("hype_score", min_hype_score)
+        if event_type:
+            query = query.eq("event_type", event_type.value)
+
+        after = keyset_filter(sort.value, cursor)
+        if after:
+            query = query.or_(after)
+
+        # Stable order: ties on the sort column are broken by id
+        query = query.order(column, desc=descending).order("id", desc=descending)
+        if after or not skip:
+            query = query.limit(limit + 1)
+        else:
+            query = query.range(skip, skip + limit)
 
-@router.get("/{event_id}", response_model=EventResponse)
-def read_event(event_id: int, db: Client = Depends(get_db)):
+        rows = query.execute().data
+        headers = {}
+        if len(rows) > limit:
+            rows = rows[:limit]
+            headers["X-Next-Cursor"] = encode_cursor(sort.value, rows[-1])
+        return rows, headers
+
+    if limit > get_settings().API_STREAM_MIN_ROWS:
+        rows, headers = fetch()
+        return StreamingResponse(iter_events(rows, fieldset), media_type="application/json", headers=headers)
+
+    def load():
+        rows, headers = fetch()
+        return dump_events(rows, fieldset), headers
+
+    body, headers = cached_read(key, load)
+    return ORJSONBytesResponse(body, headers=headers)
+
+@router.get("/{event_id}", response_model=EventDetailResponse)
+def read_event(
+    event_id: int,
+    fields: Optional[str] = Query(None, description="Comma-separated fields and/or presets; also proxies, metrics_summary"),
+    db: Client = Depends(get_db)
+):
     """
     Get a specific event by ID.
+    The metric history is summarized (latest day, 7-day delta, 30-day sparkline), so the
+    response size does not grow with the event's age; see /{event_id}/metrics for the series.
+    With fields=, proxies and metrics_summary are only loaded when requested.
     """
-    response = db.table("events").select("*, hype_metrics(*), event_proxies(*)").eq("id", event_id).execute()
-    
-    if not response.data:
-        raise HTTPException(status_code=404, detail="Event not found")
-        
-    # Map relationships manually if needed, but Supabase returns nested JSON 
-    # which matches our Pydantic model structure (hype_metrics, proxies)
-    # Note: Supabase returns 'event_proxies' but our model expects 'proxies'.
-    # We might need a validator or alias in Pydantic, or map it here.
-    # Let's adjust the Pydantic model alias in a future step if needed.
-    # For now, let's assume the DB relationship name matches or we map it.
-    
-    event_data = response.data[0]
-    # Simple mapping for 'event_proxies' -> 'proxies' if needed
-    if 'event_proxies' in event_data:
-        event_data['proxies'] = event_data.pop('event_proxies')
+    fieldset = parse_fields(fields, EVENT_COLUMN_FIELDS + DETAIL_EXTRA_FIELDS)
+    with_proxies = fieldset is None or "proxies" in fieldset
+    with_summary = fieldset is None or "metrics_summary" in fieldset
+
+    def load():
+        select = select_columns(fieldset, "id")
+        if with_proxies:
+            select += ", event_proxies(*)"
+        response = db.table("events").select(select).eq("id", event_id).execute()
         
-    return event_data
+        if not response.data:
+            raise HTTPException(status_code=404, detail="Event not found")
+            
+        event_data = response.data[0]
+        # Supabase returns the relationship as 'event_proxies'; the model calls it 'proxies'
+        if 'event_proxies' in event_data:
+            event_data['proxies'] = event_data.pop('event_proxies')
+
+        if with_summary:
+            # Includes archived metrics of FINISHED events
+            daily = _metric_buckets(db, event_id, BUCKET_UNITS["daily"], p_limit=SUMMARY_BUCKETS)
+            event_data['metrics_summary'] = summarize(daily)
+
+        return dump_event_detail(event_data, fieldset), {}
+
+    body, headers = cached_read(("event", event_id, fieldset), load)
+    return ORJSONBytesResponse(body, headers=headers)
+
+@router.get("/{event_id}/metrics", response_model=HypeSeriesResponse)
+def read_event_metrics(
+    event_id: int,
+    date_from: Optional[date] = Query(None, description="recorded_at on or after"),
+    date_to: Optional[date] = Query(None, description="recorded_at on or before"),
+    resolution: MetricResolution = MetricResolution.DAILY,
+    max_points: int = Query(120, ge=3, le=1000, description="Longer series are downsampled (LTTB)"),
+    db: Client = Depends(get_db)
+):
+    """
+    Hype metric time series: per-day or per-week averages, bucketed in the database
+    and downsampled to at most max_points.
+    """
+    key = ("metrics", event_id, date_from, date_to, resolution.value, max_points)
+
+    def load():
+        points = _metric_buckets(
+            db,
+            event_id,
+            BUCKET_UNITS[resolution.value],
+            p_from=date_from.isoformat() if date_from else None,
+            p_to=date_to.isoformat() if date_to else None
+        )
+        series = {
+            "event_id": event_id,
+            "resolution": resolution,
+            "points": lttb(points, max_points),
+            "buckets": len(points)
+        }
+        return SERIES_ADAPTER.dump_json(SERIES_ADAPTER.validate_python(series)), {}
+
+    body, headers = cached_read(key, load)
+    return ORJSONBytesResponse(body, headers=headers)
 
 @router.post("/", response_model=EventResponse)
 def create_event(event: EventCreate, db: Client = Depends(get_db)):
@@ -60,5 +197,6 @@ def create_event(event: EventCreate, db: Client = Depends(get_db)):
     
     if not response.data:
          raise HTTPException(status_code=400, detail="Could not create event")
-         
+    
+    invalidate_events(db)
     return response.data[0]
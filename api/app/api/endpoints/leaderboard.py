@@ -0,0 +1,49 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import Optional
+from app.core.config import get_settings
+from app.db.session import get_db
+from app.schemas.event import EventRankResponse, LeaderboardResponse
+from app.services.calendar_snapshots import TICKER_PATTERN
+from app.services.leaderboard import get_leaderboard
+from supabase import Client
+
+router = APIRouter()
+
+
+def _ticker(ticker: Optional[str]) -> Optional[str]:
+    if ticker is None:
+        return None
+    ticker = ticker.upper()
+    if not TICKER_PATTERN.match(ticker):
+        raise HTTPException(status_code=400, detail="Invalid ticker")
+    return ticker
+
+
+@router.get("/", response_model=LeaderboardResponse)
+def read_leaderboard(
+    ticker: Optional[str] = Query(None, description="Only events related to this ticker"),
+    limit: int = Query(10, ge=1),
+    db: Client = Depends(get_db)
+):
+    """
+    Hottest upcoming ACTIVE events by hype score (ties by id), overall or per ticker.
+    Served from the in-process leaderboard; no events query per request.
+    """
+    ticker = _ticker(ticker)
+    limit = min(limit, get_settings().LEADERBOARD_MAX_LIMIT)
+    total, entries = get_leaderboard().top(db, limit, ticker)
+    return {"ticker": ticker, "total": total, "entries": entries}
+
+
+@router.get("/events/{event_id}", response_model=EventRankResponse)
+def read_event_rank(
+    event_id: int,
+    ticker: Optional[str] = Query(None, description="Rank among events related to this ticker"),
+    db: Client = Depends(get_db)
+):
+    """
+    Rank of one event on the overall or a ticker leaderboard.
+    """
+    ticker = _ticker(ticker)
+    rank, total, score = get_leaderboard().rank(db, event_id, ticker)
+    return {"event_id": event_id, "ticker": ticker, "rank": rank, "total": total, "hype_score": score}
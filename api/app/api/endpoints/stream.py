@@ -0,0 +1,64 @@
+import asyncio
+from fastapi import APIRouter, Header, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from typing import Optional
+from app.core.config import get_settings
+from app.services.calendar_snapshots import TICKER_PATTERN
+from app.services.live_updates import HEARTBEAT_FRAME, StreamFilter, get_live_update_hub
+
+router = APIRouter()
+
+
+def _stream_filter(tickers: Optional[str], ids: Optional[str]) -> StreamFilter:
+    ticker_set = {t.strip().upper() for t in (tickers or "").split(",") if t.strip()}
+    if any(not TICKER_PATTERN.match(t) for t in ticker_set):
+        raise HTTPException(status_code=400, detail="Invalid ticker")
+    try:
+        id_set = {int(i) for i in (ids or "").split(",") if i.strip()}
+    except ValueError:
+        raise HTTPException(status_code=400, detail="ids must be integers")
+    if len(ticker_set) + len(id_set) > get_settings().STREAM_MAX_FILTER_IDS:
+        raise HTTPException(status_code=400, detail="Too many filters")
+    return StreamFilter(frozenset(ticker_set), frozenset(id_set))
+
+
+@router.get("/events")
+async def stream_events(
+    tickers: Optional[str] = Query(None, description="Comma-separated tickers to follow"),
+    ids: Optional[str] = Query(None, description="Comma-separated event ids to follow"),
+    last_event_id: Optional[str] = Query(None, description="Resume point, when the Last-Event-ID header cannot be set"),
+    last_event_id_header: Optional[str] = Header(None, alias="Last-Event-ID"),
+):
+    """
+    Server-Sent Events: "created", "score" and "status" (or "updated") messages carry
+    the event's card fields (same as /events?fields=card).
+    "reset" means updates were missed (resume point gone, or client too slow):
+    refetch /events. Without filters every event is sent; otherwise events matching
+    any ticker or id.
+    """
+    settings = get_settings()
+    hub = get_live_update_hub()
+    stream_filter = _stream_filter(tickers, ids)
+    if hub.full:
+        raise HTTPException(status_code=503, detail="Too many stream subscribers")
+
+    async def frames():
+        # Subscribed once streaming starts, so the finally below always unsubscribes
+        subscriber, backlog = hub.subscribe(stream_filter, last_event_id_header or last_event_id)
+        try:
+            yield f"retry: {settings.STREAM_RETRY_MS}\n\n".encode()
+            for frame in backlog:
+                yield frame
+            while True:
+                try:
+                    yield await asyncio.wait_for(subscriber.queue.get(), settings.STREAM_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield HEARTBEAT_FRAME
+        finally:
+            hub.unsubscribe(subscriber)
+
+    return StreamingResponse(
+        frames(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -0,0 +1,63 @@
+"""
+Sparse Fieldsets
+
+`fields=` on the event endpoints: a comma-separated list of EventResponse fields
+and/or preset names. The same list drives the column projection of the database
+query and the shape of every returned object, so unused columns (descriptions,
+source URLs, ...) are neither read nor sent.
+
+Presets:
+- calendar: what a calendar grid cell shows
+- card: what the dashboard event card shows (web/src/components/event-card.tsx)
+"""
+
+from typing import Iterable, Optional, Tuple
+from fastapi import HTTPException
+
+
+# EventResponse fields backed by an events column
+EVENT_COLUMN_FIELDS = (
+    "id", "title", "description", "source_url", "target_date", "is_date_confirmed",
+    "event_type", "hype_score", "gpt_confidence", "related_tickers", "status",
+    "created_at", "updated_at"
+)
+
+# Event detail only: loaded by extra queries, skipped unless requested
+DETAIL_EXTRA_FIELDS = ("proxies", "metrics_summary")
+
+EVENT_FIELD_PRESETS = {
+    "calendar": ("id", "title", "target_date", "hype_score", "related_tickers"),
+    "card": (
+        "id", "title", "target_date", "is_date_confirmed", "event_type",
+        "hype_score", "related_tickers", "status"
+    ),
+}
+
+
+def parse_fields(fields: Optional[str], allowed: Iterable[str] = EVENT_COLUMN_FIELDS) -> Optional[Tuple[str, ...]]:
+    """
+    Requested fields in declaration order (id always included), or None for the full
+    object. Raises 400 for unknown names.
+    """
+    if not fields:
+        return None
+    allowed = tuple(allowed)
+    requested = {"id"}
+    for name in (part.strip() for part in fields.split(",")):
+        if not name:
+            continue
+        if name in EVENT_FIELD_PRESETS:
+            requested.update(EVENT_FIELD_PRESETS[name])
+        elif name in allowed:
+            requested.add(name)
+        else:
+            raise HTTPException(status_code=400, detail=f"Unknown field: {name}")
+    return tuple(name for name in allowed if name in requested)
+
+
+def select_columns(fields: Optional[Tuple[str, ...]], *required: str) -> str:
+    """PostgREST select list for the fieldset plus columns the endpoint itself needs."""
+    if fields is None:
+        return "*"
+    columns = [name for name in EVENT_COLUMN_FIELDS if name in fields or name in required]
+    return ",".join(columns)
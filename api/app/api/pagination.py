@@ -0,0 +1,61 @@
+"""
+Keyset Pagination
+
+Opaque cursors for list endpoints: a page is fetched with
+`WHERE (sort_column, id) < (last value, last id)` (or > for ascending sorts)
+instead of OFFSET, so every page costs one index range scan however deep it is.
+
+The cursor is the sort key of the last row of the previous page, tagged with the
+sort it belongs to (a cursor from another sort order is rejected).
+"""
+
+import base64
+import json
+from datetime import date, datetime
+from typing import Any, Dict, Optional, Tuple
+from fastapi import HTTPException
+
+
+# sort name -> (column, descending); ties are broken by id in the same direction
+EVENT_SORTS: Dict[str, Tuple[str, bool]] = {
+    "hype_score_desc": ("hype_score", True),
+    "target_date_asc": ("target_date", False),
+    "target_date_desc": ("target_date", True),
+    "created_at_desc": ("created_at", True),
+}
+
+# Cursor values are re-parsed by column type before they reach a filter
+_CURSOR_PARSERS = {
+    "hype_score": int,
+    "target_date": lambda value: date.fromisoformat(value).isoformat(),
+    "created_at": lambda value: datetime.fromisoformat(value).isoformat(),
+}
+
+
+def encode_cursor(sort: str, row: Dict[str, Any]) -> str:
+    column, _ = EVENT_SORTS[sort]
+    raw = json.dumps([sort, row[column], row["id"]], default=str, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(sort: str, cursor: str) -> Tuple[Any, int]:
+    """Return (sort value, id) of the cursor row. Raises 400 for malformed or foreign cursors."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        cursor_sort, value, row_id = json.loads(raw)
+        if cursor_sort != sort:
+            raise HTTPException(status_code=400, detail="Cursor belongs to a different sort order")
+        column, _ = EVENT_SORTS[sort]
+        return _CURSOR_PARSERS[column](value), int(row_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def keyset_filter(sort: str, cursor: Optional[str]) -> Optional[str]:
+    """PostgREST `or` filter selecting rows after the cursor, or None for the first page."""
+    if not cursor:
+        return None
+    column, descending = EVENT_SORTS[sort]
+    value, row_id = decode_cursor(sort, cursor)
+    op = "lt" if descending else "gt"
+    return f'{column}.{op}."{value}",and({column}.eq."{value}",id.{op}.{row_id})'
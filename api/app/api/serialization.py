@@ -0,0 +1,92 @@
+"""
+Response Serialization
+
+Fast path for JSON responses built from our own database rows:
+
+- Trusted construction: events table rows already have the EventResponse shape, so
+  they are projected onto the model's fields (defaults filled in) and dumped with
+  orjson instead of being validated field by field.
+  API_TRUSTED_SERIALIZATION=false restores the validating TypeAdapter path
+- ORJSONBytesResponse: returns pre-serialized bytes as-is (anything else via orjson)
+- Sparse fieldsets (fields=): only the requested fields are dumped
+- Streaming: large listings are written as a JSON array in chunks, so serialization
+  overlaps sending and no single response buffer is built
+
+See scripts/bench_serialization.py for the numbers.
+"""
+
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Type
+import orjson
+from fastapi import Response
+from pydantic import BaseModel, TypeAdapter
+from app.core.config import get_settings
+from app.schemas.event import EventDetailResponse, EventResponse
+
+
+EVENT_LIST_ADAPTER = TypeAdapter(List[EventResponse])
+EVENT_DETAIL_ADAPTER = TypeAdapter(EventDetailResponse)
+
+STREAM_CHUNK_ROWS = 100
+
+
+class ORJSONBytesResponse(Response):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return orjson.dumps(content)
+
+
+@lru_cache(maxsize=None)
+def _fields(model: Type[BaseModel]) -> Tuple[Tuple[str, Any], ...]:
+    """(name, default) of every model field; required fields default to None."""
+    return tuple(
+        (name, None if field.is_required() else field.get_default(call_default_factory=True))
+        for name, field in model.model_fields.items()
+    )
+
+
+def project(model: Type[BaseModel], row: Dict[str, Any]) -> Dict[str, Any]:
+    """Trusted construction: the row restricted to the model's fields, defaults filled in."""
+    return {name: row[name] if name in row else default for name, default in _fields(model)}
+
+
+def sparse(row: Dict[str, Any], fields: Tuple[str, ...]) -> Dict[str, Any]:
+    """Only the requested fields (see app/api/fieldsets.py)."""
+    return {name: row.get(name) for name in fields}
+
+
+def dump_events(rows: List[Dict[str, Any]], fields: Optional[Tuple[str, ...]] = None) -> bytes:
+    """JSON array of EventResponse from events rows (only `fields` of each, when given)."""
+    if fields is not None:
+        # A sparse object has no model to validate against: always the trusted projection
+        return orjson.dumps([sparse(row, fields) for row in rows])
+    if get_settings().API_TRUSTED_SERIALIZATION:
+        return orjson.dumps([project(EventResponse, row) for row in rows])
+    return EVENT_LIST_ADAPTER.dump_json(EVENT_LIST_ADAPTER.validate_python(rows))
+
+
+def dump_event_detail(row: Dict[str, Any], fields: Optional[Tuple[str, ...]] = None) -> bytes:
+    """EventDetailResponse from an events row with proxies and metrics_summary attached."""
+    if fields is not None:
+        return orjson.dumps(sparse(row, fields))
+    if get_settings().API_TRUSTED_SERIALIZATION:
+        return orjson.dumps(project(EventDetailResponse, row))
+    return EVENT_DETAIL_ADAPTER.dump_json(EVENT_DETAIL_ADAPTER.validate_python(row))
+
+
+def iter_events(
+    rows: List[Dict[str, Any]],
+    fields: Optional[Tuple[str, ...]] = None,
+    chunk_rows: int = STREAM_CHUNK_ROWS
+) -> Iterator[bytes]:
+    """The dump_events body in chunks of chunk_rows events (for StreamingResponse)."""
+    yield b"["
+    for start in range(0, len(rows), chunk_rows):
+        chunk = dump_events(rows[start:start + chunk_rows], fields)
+        if start:
+            yield b","
+        yield chunk[1:-1]  # Array items without the brackets
+    yield b"]"
@@ -0,0 +1,45 @@
+-- Migration 003: Lease-based leader lock for scheduled jobs
+-- Run this on Supabase SQL Editor
+
+-- Step 1: One row per job name, owned by the instance currently running it
+CREATE TABLE IF NOT EXISTS public.job_leases (
+  name text PRIMARY KEY,
+  owner text NOT NULL,
+  expires_at timestamp with time zone NOT NULL,
+  acquired_at timestamp with time zone DEFAULT now() NOT NULL
+);
+
+-- Step 2: Acquire (or take over an expired) lease atomically
+CREATE OR REPLACE FUNCTION public.acquire_job_lease(p_name text, p_owner text, p_ttl_seconds int)
+RETURNS boolean AS $$
+BEGIN
+  INSERT INTO public.job_leases AS l (name, owner, expires_at, acquired_at)
+  VALUES (p_name, p_owner, now() + make_interval(secs => p_ttl_seconds), now())
+  ON CONFLICT (name) DO UPDATE
+    SET owner = excluded.owner,
+        expires_at = excluded.expires_at,
+        acquired_at = excluded.acquired_at
+    WHERE l.expires_at < now() OR l.owner = excluded.owner;
+  RETURN FOUND;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Step 3: Heartbeat: extend the lease only while we still own it
+CREATE OR REPLACE FUNCTION public.renew_job_lease(p_name text, p_owner text, p_ttl_seconds int)
+RETURNS boolean AS $$
+BEGIN
+  UPDATE public.job_leases
+  SET expires_at = now() + make_interval(secs => p_ttl_seconds)
+  WHERE name = p_name AND owner = p_owner;
+  RETURN FOUND;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Step 4: Release on normal completion
+CREATE OR REPLACE FUNCTION public.release_job_lease(p_name text, p_owner text)
+RETURNS boolean AS $$
+BEGIN
+  DELETE FROM public.job_leases WHERE name = p_name AND owner = p_owner;
+  RETURN FOUND;
+END;
+$$ LANGUAGE plpgsql;
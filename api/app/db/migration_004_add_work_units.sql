@@ -0,0 +1,61 @@
+-- Migration 004: Durable work queue for sharded pipeline execution
+-- Run this on Supabase SQL Editor
+
+-- Step 1: One row per work unit (ticker for discovery, event for hype) per run
+CREATE TABLE IF NOT EXISTS public.work_units (
+  id bigint GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+  run_id text NOT NULL,
+  phase text NOT NULL CHECK (phase IN ('discovery', 'hype')),
+  unit_key text NOT NULL,
+  payload jsonb DEFAULT '{}'::jsonb NOT NULL,
+  status text CHECK (status IN ('QUEUED', 'CLAIMED', 'DONE', 'FAILED')) DEFAULT 'QUEUED' NOT NULL,
+  attempts int DEFAULT 0 NOT NULL,
+  lease_owner text,
+  lease_expires_at timestamp with time zone,
+  result jsonb,
+  error text,
+  created_at timestamp with time zone DEFAULT timezone('utc'::text, now()) NOT NULL,
+  updated_at timestamp with time zone DEFAULT timezone('utc'::text, now()) NOT NULL,
+  UNIQUE (run_id, phase, unit_key)
+);
+
+-- Step 2: Index for claim scans
+CREATE INDEX IF NOT EXISTS idx_work_units_claimable
+ON public.work_units(run_id, phase, status);
+
+-- Step 3: Claim queued or lease-expired units without blocking other workers
+CREATE OR REPLACE FUNCTION public.claim_work_units(
+  p_owner text,
+  p_limit int,
+  p_ttl_seconds int,
+  p_max_attempts int,
+  p_run_id text DEFAULT NULL,
+  p_phase text DEFAULT NULL
+)
+RETURNS SETOF public.work_units AS $$
+BEGIN
+  -- Units whose worker died on the last allowed attempt are given up
+  UPDATE public.work_units
+  SET status = 'FAILED', error = 'lease expired after max attempts', updated_at = now()
+  WHERE status = 'CLAIMED' AND lease_expires_at < now() AND attempts >= p_max_attempts;
+
+  RETURN QUERY
+  UPDATE public.work_units w
+  SET status = 'CLAIMED',
+      attempts = w.attempts + 1,
+      lease_owner = p_owner,
+      lease_expires_at = now() + make_interval(secs => p_ttl_seconds),
+      updated_at = now()
+  WHERE w.id IN (
+    SELECT id FROM public.work_units
+    WHERE (p_run_id IS NULL OR run_id = p_run_id)
+      AND (p_phase IS NULL OR phase = p_phase)
+      AND attempts < p_max_attempts
+      AND (status = 'QUEUED' OR (status = 'CLAIMED' AND lease_expires_at < now()))
+    ORDER BY id
+    LIMIT p_limit
+    FOR UPDATE SKIP LOCKED
+  )
+  RETURNING w.*;
+END;
+$$ LANGUAGE plpgsql;
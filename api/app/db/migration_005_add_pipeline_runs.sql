@@ -0,0 +1,18 @@
+-- Migration 005: Checkpointed, resumable pipeline runs
+-- Run this on Supabase SQL Editor
+
+-- Step 1: One row per daily run; per-unit checkpoints live in work_units (migration 004)
+CREATE TABLE IF NOT EXISTS public.pipeline_runs (
+  run_id text PRIMARY KEY,
+  status text CHECK (status IN ('RUNNING', 'COMPLETED', 'ABANDONED')) DEFAULT 'RUNNING' NOT NULL,
+  phase text,
+  leader text,
+  summary jsonb,
+  started_at timestamp with time zone DEFAULT timezone('utc'::text, now()) NOT NULL,
+  finished_at timestamp with time zone
+);
+
+-- Step 2: Index for finding the run to resume
+CREATE INDEX IF NOT EXISTS idx_pipeline_runs_running
+ON public.pipeline_runs(started_at DESC)
+WHERE status = 'RUNNING';
@@ -0,0 +1,14 @@
+-- Migration 006: Seen-article fingerprints across runs
+-- Run this on Supabase SQL Editor
+
+-- Step 1: Exact store behind the in-process Bloom filter
+-- fingerprint = "u:" + hash of the canonical URL, or "t:" + hash of the normalized title
+CREATE TABLE IF NOT EXISTS public.seen_articles (
+  fingerprint text PRIMARY KEY,
+  first_seen_at timestamp with time zone DEFAULT timezone('utc'::text, now()) NOT NULL,
+  expires_at timestamp with time zone NOT NULL
+);
+
+-- Step 2: Index for purging expired fingerprints
+CREATE INDEX IF NOT EXISTS idx_seen_articles_expires_at
+ON public.seen_articles(expires_at);
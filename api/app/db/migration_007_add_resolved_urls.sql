@@ -0,0 +1,14 @@
+-- Migration 007: Canonical publisher URLs for Google News redirect links
+-- Run this on Supabase SQL Editor
+
+-- Step 1: Persistent resolver cache (a redirect link is resolved once, ever)
+-- redirect_url = canonical form of the news.google.com link (tracking params stripped)
+CREATE TABLE IF NOT EXISTS public.resolved_urls (
+  redirect_url text PRIMARY KEY,
+  canonical_url text NOT NULL,
+  resolved_at timestamp with time zone DEFAULT timezone('utc'::text, now()) NOT NULL
+);
+
+-- Step 2: Exact-match duplicate check on events.source_url (replaces the title ILIKE scan)
+CREATE INDEX IF NOT EXISTS idx_events_source_url
+ON public.events(source_url);
@@ -0,0 +1,48 @@
+-- Migration 008: Event lifecycle (finish past events, freeze stale PENDING, archive metrics)
+-- Run this on Supabase SQL Editor
+
+-- Step 1: Scoring freeze for PENDING events that never published
+ALTER TABLE public.events ADD COLUMN IF NOT EXISTS scoring_frozen_at timestamp with time zone;
+
+-- Step 2: Live working set of Phase 2 (unfinished, not frozen)
+CREATE INDEX IF NOT EXISTS idx_events_live
+ON public.events(target_date)
+WHERE status <> 'FINISHED' AND scoring_frozen_at IS NULL;
+
+-- Step 3: Metric history of FINISHED events, moved out of the hot hype_metrics table
+CREATE TABLE IF NOT EXISTS public.hype_metrics_archive (
+  id bigint PRIMARY KEY,
+  event_id bigint REFERENCES public.events(id) ON DELETE CASCADE NOT NULL,
+  recorded_at date NOT NULL,
+  search_volume int DEFAULT 0,
+  community_buzz int DEFAULT 0,
+  youtube_count int DEFAULT 0,
+  created_at timestamp with time zone NOT NULL,
+  archived_at timestamp with time zone DEFAULT timezone('utc'::text, now()) NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_hype_metrics_archive_event_id
+ON public.hype_metrics_archive(event_id);
+
+-- Step 4: Move metrics of FINISHED events in one statement (idempotent, catches up after failures)
+CREATE OR REPLACE FUNCTION public.archive_finished_event_metrics()
+RETURNS int AS $$
+DECLARE
+  moved_count int;
+BEGIN
+  WITH moved AS (
+    DELETE FROM public.hype_metrics m
+    USING public.events e
+    WHERE m.event_id = e.id AND e.status = 'FINISHED'
+    RETURNING m.*
+  )
+  INSERT INTO public.hype_metrics_archive
+    (id, event_id, recorded_at, search_volume, community_buzz, youtube_count, created_at)
+  SELECT id, event_id, recorded_at, search_volume, community_buzz, youtube_count, created_at
+  FROM moved
+  ON CONFLICT (id) DO NOTHING;
+
+  GET DIAGNOSTICS moved_count = ROW_COUNT;
+  RETURN moved_count;
+END;
+$$ LANGUAGE plpgsql;
@@ -0,0 +1,36 @@
+-- Migration 009: Adaptive per-event refresh cadence
+-- Run this on Supabase SQL Editor
+
+-- Step 1: When each event is scored next, and how much its score moves between refreshes
+ALTER TABLE public.events ADD COLUMN IF NOT EXISTS next_refresh_at timestamp with time zone DEFAULT now();
+ALTER TABLE public.events ADD COLUMN IF NOT EXISTS score_volatility float DEFAULT 0;
+
+-- Step 2: Priority queue of live events by due time
+CREATE INDEX IF NOT EXISTS idx_events_next_refresh
+ON public.events(next_refresh_at)
+WHERE status <> 'FINISHED' AND scoring_frozen_at IS NULL;
+
+-- Step 3: Claim the most overdue events without blocking a concurrent tick
+-- Claimed events are pushed to p_retry_at; scoring then sets the real next refresh
+CREATE OR REPLACE FUNCTION public.claim_due_events(
+  p_now timestamp with time zone,
+  p_limit int,
+  p_retry_at timestamp with time zone
+)
+RETURNS SETOF public.events AS $$
+BEGIN
+  RETURN QUERY
+  UPDATE public.events e
+  SET next_refresh_at = p_retry_at
+  WHERE e.id IN (
+    SELECT id FROM public.events
+    WHERE status <> 'FINISHED'
+      AND scoring_frozen_at IS NULL
+      AND next_refresh_at <= p_now
+    ORDER BY next_refresh_at
+    LIMIT p_limit
+    FOR UPDATE SKIP LOCKED
+  )
+  RETURNING e.*;
+END;
+$$ LANGUAGE plpgsql;
@@ -0,0 +1,18 @@
+-- Migration 010: Indexes for the filtered, keyset-paginated events listing
+-- Run this on Supabase SQL Editor
+
+-- Step 1: One index per sort order, with id as the tie-breaker the cursor uses
+-- (a page is an index range scan, however deep it is)
+CREATE INDEX IF NOT EXISTS idx_events_hype_score_id ON public.events(hype_score DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_events_target_date_id ON public.events(target_date, id);
+CREATE INDEX IF NOT EXISTS idx_events_created_at_id ON public.events(created_at DESC, id DESC);
+
+-- Step 2: Status-filtered listings (the common "ACTIVE by hype" / calendar pages)
+CREATE INDEX IF NOT EXISTS idx_events_status_hype_score_id ON public.events(status, hype_score DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_events_status_target_date_id ON public.events(status, target_date, id);
+
+-- Step 3: Ticker filter (related_tickers @> '{TICKER}')
+CREATE INDEX IF NOT EXISTS idx_events_related_tickers ON public.events USING gin(related_tickers);
+
+-- Step 4: Superseded by idx_events_hype_score_id
+DROP INDEX IF EXISTS public.idx_events_hype_score;
@@ -0,0 +1,19 @@
+-- Migration 011: Cross-process read cache invalidation
+-- Run this on Supabase SQL Editor
+
+-- Step 1: Data version per cached dataset; API processes poll it, writers bump it
+CREATE TABLE IF NOT EXISTS public.cache_versions (
+  name text PRIMARY KEY,
+  version bigint DEFAULT 0 NOT NULL,
+  updated_at timestamp with time zone DEFAULT timezone('utc'::text, now()) NOT NULL
+);
+
+-- Step 2: Atomic bump (creates the row on first use)
+CREATE OR REPLACE FUNCTION public.bump_cache_version(p_name text)
+RETURNS bigint AS $$
+  INSERT INTO public.cache_versions (name, version, updated_at)
+  VALUES (p_name, 1, now())
+  ON CONFLICT (name) DO UPDATE
+  SET version = public.cache_versions.version + 1, updated_at = now()
+  RETURNING version;
+$$ LANGUAGE sql;
@@ -0,0 +1,14 @@
+-- Migration 012: Pre-compressed calendar snapshots
+-- Run this on Supabase SQL Editor
+
+-- Step 1: One row per snapshot ("all", "months/2026-11", "tickers/NVDA"), written at
+-- the end of each pipeline run; etag is the content hash shared by every encoding
+CREATE TABLE IF NOT EXISTS public.calendar_snapshots (
+  name text PRIMARY KEY,
+  etag text NOT NULL,
+  body text NOT NULL,
+  body_gzip bytea NOT NULL,
+  body_br bytea,
+  event_count integer DEFAULT 0 NOT NULL,
+  generated_at timestamp with time zone DEFAULT timezone('utc'::text, now()) NOT NULL
+);
@@ -0,0 +1,44 @@
+-- Migration 013: Bucketed hype time series (bounded metric responses)
+-- Run this on Supabase SQL Editor
+
+-- Step 1: Range scans per event (superseding the event_id-only indexes)
+CREATE INDEX IF NOT EXISTS idx_hype_metrics_event_recorded ON public.hype_metrics(event_id, recorded_at);
+CREATE INDEX IF NOT EXISTS idx_hype_metrics_archive_event_recorded ON public.hype_metrics_archive(event_id, recorded_at);
+DROP INDEX IF EXISTS public.idx_hype_metrics_event_id;
+DROP INDEX IF EXISTS public.idx_hype_metrics_archive_event_id;
+
+-- Step 2: Per-day / per-week averages of live and archived metrics.
+-- p_limit keeps only the latest buckets (NULL = all); rows come newest first
+CREATE OR REPLACE FUNCTION public.hype_metric_buckets(
+  p_event_id bigint,
+  p_bucket text,
+  p_from date DEFAULT NULL,
+  p_to date DEFAULT NULL,
+  p_limit int DEFAULT NULL
+)
+RETURNS TABLE (
+  bucket date,
+  search_volume double precision,
+  community_buzz double precision,
+  youtube_count double precision,
+  samples int
+) AS $$
+  SELECT date_trunc(p_bucket, m.recorded_at)::date AS bucket,
+         avg(m.search_volume)::double precision,
+         avg(m.community_buzz)::double precision,
+         avg(m.youtube_count)::double precision,
+         count(*)::int
+  FROM (
+    SELECT recorded_at, search_volume, community_buzz, youtube_count
+    FROM public.hype_metrics WHERE event_id = p_event_id
+    UNION ALL
+    SELECT recorded_at, search_volume, community_buzz, youtube_count
+    FROM public.hype_metrics_archive WHERE event_id = p_event_id
+  ) m
+  WHERE p_bucket IN ('day', 'week')
+    AND (p_from IS NULL OR m.recorded_at >= p_from)
+    AND (p_to IS NULL OR m.recorded_at <= p_to)
+  GROUP BY 1
+  ORDER BY 1 DESC
+  LIMIT p_limit;
+$$ LANGUAGE sql STABLE;
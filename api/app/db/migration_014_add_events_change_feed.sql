@@ -0,0 +1,19 @@
+-- Migration 014: events.updated_at as a change feed (in-memory hype leaderboard)
+-- Run this on Supabase SQL Editor
+
+-- Step 1: Every UPDATE stamps updated_at with the database clock, whatever the writer sent
+CREATE OR REPLACE FUNCTION public.touch_updated_at()
+RETURNS trigger AS $$
+BEGIN
+  NEW.updated_at = now();
+  RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS events_touch_updated_at ON public.events;
+CREATE TRIGGER events_touch_updated_at
+  BEFORE UPDATE ON public.events
+  FOR EACH ROW EXECUTE FUNCTION public.touch_updated_at();
+
+-- Step 2: "Changed since" polls of API processes
+CREATE INDEX IF NOT EXISTS idx_events_updated_at_id ON public.events(updated_at, id);
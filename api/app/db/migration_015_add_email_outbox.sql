@@ -0,0 +1,74 @@
+-- Migration 015: Email outbox (alert emails are queued, a worker delivers them)
+-- Run this on Supabase SQL Editor
+
+-- Step 1: One row per email; dedupe_key drops repeats (e.g. one welcome email per user)
+CREATE TABLE IF NOT EXISTS public.email_outbox (
+  id bigint GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+  kind text NOT NULL,
+  dedupe_key text UNIQUE,
+  sender text NOT NULL,
+  recipients text[] NOT NULL,
+  subject text NOT NULL,
+  html text NOT NULL,
+  status text CHECK (status IN ('QUEUED', 'SENDING', 'SENT', 'FAILED')) DEFAULT 'QUEUED' NOT NULL,
+  attempts int DEFAULT 0 NOT NULL,
+  next_attempt_at timestamp with time zone DEFAULT now() NOT NULL,
+  lease_owner text,
+  lease_expires_at timestamp with time zone,
+  provider_id text,
+  error text,
+  sent_at timestamp with time zone,
+  created_at timestamp with time zone DEFAULT timezone('utc'::text, now()) NOT NULL,
+  updated_at timestamp with time zone DEFAULT timezone('utc'::text, now()) NOT NULL
+);
+
+-- Step 2: Index for claim scans (only unfinished messages)
+CREATE INDEX IF NOT EXISTS idx_email_outbox_due
+ON public.email_outbox(next_attempt_at, id) WHERE status IN ('QUEUED', 'SENDING');
+
+-- Step 3: Claim due or lease-expired messages without blocking other workers
+CREATE OR REPLACE FUNCTION public.claim_email_outbox(
+  p_owner text,
+  p_limit int,
+  p_ttl_seconds int,
+  p_max_attempts int
+)
+RETURNS SETOF public.email_outbox AS $$
+BEGIN
+  -- Messages whose worker died on the last allowed attempt are given up
+  UPDATE public.email_outbox
+  SET status = 'FAILED', error = 'lease expired after max attempts', updated_at = now()
+  WHERE status = 'SENDING' AND lease_expires_at < now() AND attempts >= p_max_attempts;
+
+  RETURN QUERY
+  UPDATE public.email_outbox o
+  SET status = 'SENDING',
+      attempts = o.attempts + 1,
+      lease_owner = p_owner,
+      lease_expires_at = now() + make_interval(secs => p_ttl_seconds),
+      updated_at = now()
+  WHERE o.id IN (
+    SELECT id FROM public.email_outbox
+    WHERE (status = 'QUEUED' AND next_attempt_at <= now())
+       OR (status = 'SENDING' AND lease_expires_at < now())
+    ORDER BY next_attempt_at, id
+    LIMIT p_limit
+    FOR UPDATE SKIP LOCKED
+  )
+  RETURNING o.*;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Step 4: Mark a sent batch in one call (only messages we still hold)
+CREATE OR REPLACE FUNCTION public.complete_email_outbox(
+  p_owner text,
+  p_ids bigint[],
+  p_provider_ids text[]
+)
+RETURNS void AS $$
+  UPDATE public.email_outbox o
+  SET status = 'SENT', provider_id = s.provider_id, error = NULL, sent_at = now(),
+      lease_owner = NULL, lease_expires_at = NULL, updated_at = now()
+  FROM unnest(p_ids, p_provider_ids) AS s(id, provider_id)
+  WHERE o.id = s.id AND o.lease_owner = p_owner;
+$$ LANGUAGE sql;
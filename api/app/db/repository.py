@@ -0,0 +1,626 @@
+"""
+Repository Layer
+
+Pluggable data-access layer for the pipeline. Two backends are available:
+- SupabaseRepository: the existing Supabase client (PostgREST over HTTP)
+- PostgresRepository: direct Postgres via an asyncpg pool (see app/db/postgres.py)
+
+The backend is selected with the DB_BACKEND setting ("supabase" or "postgres").
+"""
+
+import asyncio
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import List, Dict, Any, Optional
+from app.core.config import get_settings
+from app.services.change_feed import PAGE_ROWS, iter_pages
+
+
+# Columns Phase 2 reads per event (SchedulerService._hype_unit_payload); a superset of the
+# card fieldset, so the scored row can be published as a live update as-is
+HYPE_UNIT_COLUMNS = (
+    "id", "title", "related_tickers", "gpt_confidence", "status",
+    "hype_score", "score_volatility", "target_date", "is_date_confirmed", "event_type"
+)
+
+
+def escape_like(value: str) -> str:
+    """Escape LIKE/ILIKE wildcards (backslash is the default escape) so `value` matches literally."""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+class BaseRepository(ABC):
+    """
+    Abstract Base Class for data-access backends.
+    All methods are async so that network-bound backends can share the event loop.
+    """
+
+    @abstractmethod
+    async def find_event_ids_by_title(self, title_fragment: str) -> List[int]:
+        """Return ids of events whose title contains the fragment (case-insensitive)."""
+        pass
+
+    @abstractmethod
+    async def find_event_ids_by_source_url(self, source_url: str) -> List[int]:
+        """Return ids of events with exactly this source URL (indexed)."""
+        pass
+
+    @abstractmethod
+    async def insert_event(self, event_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Insert a new event and return the stored row."""
+        pass
+
+    @abstractmethod
+    async def list_unfinished_events(self) -> List[Dict[str, Any]]:
+        """Return the events Phase 2 scores (HYPE_UNIT_COLUMNS only): not FINISHED and scoring not frozen."""
+        pass
+
+    @abstractmethod
+    async def list_active_events(self) -> List[Dict[str, Any]]:
+        """Return ACTIVE events ordered by (target_date, id) (calendar snapshots)."""
+        pass
+
+    @abstractmethod
+    async def count_live_events(self) -> int:
+        """Number of events Phase 2 scores (see list_unfinished_events)."""
+        pass
+
+    @abstractmethod
+    async def claim_due_events(self, now: str, limit: int, retry_at: str) -> List[Dict[str, Any]]:
+        """
+        Claim up to `limit` live events due for a refresh, most overdue first (moves them
+        to retry_at). Returns HYPE_UNIT_COLUMNS only.
+        """
+        pass
+
+    @abstractmethod
+    async def finish_events_before(self, cutoff_date: str) -> List[int]:
+        """Mark unfinished events with target_date before the cutoff FINISHED. Returns their ids."""
+        pass
+
+    @abstractmethod
+    async def freeze_stale_pending_events(self, created_before: str) -> int:
+        """Freeze scoring of PENDING events created before the cutoff. Returns the count."""
+        pass
+
+    @abstractmethod
+    async def archive_finished_event_metrics(self) -> int:
+        """Move hype_metrics rows of FINISHED events to the archive. Returns the count."""
+        pass
+
+    @abstractmethod
+    async def update_event(self, event_id: int, data: Dict[str, Any]) -> None:
+        """Update columns of a single event."""
+        pass
+
+    @abstractmethod
+    async def get_latest_metrics(self, event_id: int) -> Optional[Dict[str, Any]]:
+        """Return the most recent hype_metrics row for an event."""
+        pass
+
+    @abstractmethod
+    async def insert_hype_metrics(self, rows: List[Dict[str, Any]]) -> int:
+        """
+        Bulk insert hype_metrics rows.
+
+        Returns:
+            Number of rows written
+        """
+        pass
+
+    @abstractmethod
+    async def acquire_lease(self, name: str, owner: str, ttl_seconds: int) -> bool:
+        """Acquire the named job lease, taking it over if the current one expired."""
+        pass
+
+    @abstractmethod
+    async def renew_lease(self, name: str, owner: str, ttl_seconds: int) -> bool:
+        """Extend a lease we own. Returns False if the lease was lost."""
+        pass
+
+    @abstractmethod
+    async def release_lease(self, name: str, owner: str) -> None:
+        """Release a lease we own."""
+        pass
+
+    @abstractmethod
+    async def enqueue_work_units(self, rows: List[Dict[str, Any]]) -> None:
+        """Insert work units, ignoring ones already enqueued for the run."""
+        pass
+
+    @abstractmethod
+    async def claim_work_units(
+        self,
+        owner: str,
+        limit: int,
+        ttl_seconds: int,
+        max_attempts: int,
+        run_id: Optional[str] = None,
+        phase: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Atomically claim queued or lease-expired work units."""
+        pass
+
+    @abstractmethod
+    async def update_work_unit(self, unit_id: int, owner: str, data: Dict[str, Any]) -> None:
+        """Finish a claimed unit (only if we still hold its lease) and clear the lease."""
+        pass
+
+    @abstractmethod
+    async def renew_work_unit_leases(self, unit_ids: List[int], owner: str, ttl_seconds: int) -> List[int]:
+        """Extend the leases of claimed units we still hold. Returns their ids."""
+        pass
+
+    @abstractmethod
+    async def list_work_units(self, run_id: str, phase: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Return all work units of a run."""
+        pass
+
+    @abstractmethod
+    async def release_work_unit_claims(self, run_id: str, owner: str, max_attempts: int) -> int:
+        """
+        Requeue units of a run still claimed by a (crashed) owner whose lease has expired;
+        units that used their last attempt are marked FAILED instead (claim skips them).
+        Unexpired claims are left alone. Returns the count.
+        """
+        pass
+
+    @abstractmethod
+    async def fail_open_work_units(self, run_id: str, error: str) -> int:
+        """Mark the QUEUED and CLAIMED units of a run FAILED so no worker claims them. Returns the count."""
+        pass
+
+    @abstractmethod
+    async def get_incomplete_run(self) -> Optional[Dict[str, Any]]:
+        """Return the most recent pipeline run that is still RUNNING."""
+        pass
+
+    @abstractmethod
+    async def insert_pipeline_run(self, run: Dict[str, Any]) -> None:
+        """Record a new pipeline run."""
+        pass
+
+    @abstractmethod
+    async def update_pipeline_run(self, run_id: str, data: Dict[str, Any]) -> None:
+        """Update a pipeline run (phase checkpoint, status, summary)."""
+        pass
+
+    @abstractmethod
+    async def find_seen_articles(self, fingerprints: List[str]) -> List[str]:
+        """Return the given fingerprints that are stored and not expired."""
+        pass
+
+    @abstractmethod
+    async def upsert_seen_articles(self, fingerprints: List[str], expires_at: str) -> None:
+        """Store fingerprints (or extend their expiry)."""
+        pass
+
+    @abstractmethod
+    async def list_seen_articles(self, after: Optional[str], limit: int) -> List[str]:
+        """Page through unexpired fingerprints in key order (keyset pagination)."""
+        pass
+
+    @abstractmethod
+    async def delete_expired_seen_articles(self) -> int:
+        """Delete expired fingerprints. Returns the count."""
+        pass
+
+    @abstractmethod
+    async def find_resolved_urls(self, redirect_urls: List[str]) -> Dict[str, str]:
+        """Return {redirect_url: canonical_url} for the links resolved before."""
+        pass
+
+    @abstractmethod
+    async def upsert_resolved_urls(self, resolved: Dict[str, str]) -> None:
+        """Store {redirect_url: canonical_url} resolutions."""
+        pass
+
+    @abstractmethod
+    async def bump_cache_version(self, name: str) -> int:
+        """Increment a read cache data version (see app/services/read_cache.py). Returns the new version."""
+        pass
+
+    @abstractmethod
+    async def list_calendar_snapshot_etags(self) -> Dict[str, str]:
+        """Return {name: etag} of the stored calendar snapshots."""
+        pass
+
+    @abstractmethod
+    async def upsert_calendar_snapshots(self, rows: List[Dict[str, Any]]) -> None:
+        """Store calendar snapshots (body_gzip/body_br as bytes) keyed by name."""
+        pass
+
+    @abstractmethod
+    async def delete_calendar_snapshots(self, names: List[str]) -> None:
+        pass
+
+    @abstractmethod
+    async def claim_email_outbox(self, owner: str, limit: int, ttl_seconds: int, max_attempts: int) -> List[Dict[str, Any]]:
+        """Atomically claim due or lease-expired outbox messages (see app/services/email_outbox.py)."""
+        pass
+
+    @abstractmethod
+    async def complete_email_outbox(self, ids: List[int], provider_ids: List[str], owner: str) -> None:
+        """Mark claimed messages SENT (only those we still hold)."""
+        pass
+
+    @abstractmethod
+    async def release_email_outbox(self, message_id: int, owner: str, status: str, error: str, retry_in: float) -> None:
+        """Requeue (due in `retry_in` seconds) or fail a claimed message and clear its lease."""
+        pass
+
+    async def close(self) -> None:
+        """Release backend resources (connection pools etc.)."""
+        pass
+
+
+async def _execute(query):
+    """Send a PostgREST request from a worker thread (the supabase client is blocking)."""
+    return await asyncio.to_thread(query.execute)
+
+
+class SupabaseRepository(BaseRepository):
+    """
+    Repository backed by the Supabase client (PostgREST over HTTP).
+    The client is synchronous, so every request runs in a worker thread and the event
+    loop (lease heartbeats, concurrent pipeline stages) keeps running meanwhile.
+    """
+
+    def __init__(self, client):
+        self.client = client
+
+    async def find_event_ids_by_title(self, title_fragment: str) -> List[int]:
+        response = await _execute(
+            self.client.table("events")
+            .select("id")
+            .ilike("title", f"%{escape_like(title_fragment)}%")
+        )
+        return [row["id"] for row in response.data]
+
+    async def find_event_ids_by_source_url(self, source_url: str) -> List[int]:
+        response = await _execute(
+            self.client.table("events")
+            .select("id")
+            .eq("source_url", source_url)
+        )
+        return [row["id"] for row in response.data]
+
+    async def insert_event(self, event_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        response = await _execute(self.client.table("events").insert(event_data))
+        return response.data[0] if response.data else None
+
+    async def list_unfinished_events(self) -> List[Dict[str, Any]]:
+        response = await _execute(
+            self.client.table("events")
+            .select(",".join(HYPE_UNIT_COLUMNS))
+            .neq("status", "FINISHED")
+            .is_("scoring_frozen_at", "null")
+        )
+        return response.data
+
+    async def list_active_events(self) -> List[Dict[str, Any]]:
+        def page(last):
+            query = self.client.table("events").select("*").eq("status", "ACTIVE")
+            if last is not None:
+                # Keyset on (target_date, id): a single select stops at PostgREST max-rows
+                query = query.or_(
+                    f'target_date.gt.{last["target_date"]},'
+                    f'and(target_date.eq.{last["target_date"]},id.gt.{last["id"]})'
+                )
+            return query.order("target_date").order("id").limit(PAGE_ROWS).execute().data
+
+        return await asyncio.to_thread(lambda: list(iter_pages(page)))
+
+    async def count_live_events(self) -> int:
+        response = await _execute(
+            self.client.table("events")
+            .select("id", count="exact")
+            .neq("status", "FINISHED")
+            .is_("scoring_frozen_at", "null")
+            .limit(1)
+        )
+        return response.count or 0
+
+    async def claim_due_events(self, now: str, limit: int, retry_at: str) -> List[Dict[str, Any]]:
+        response = await _execute(self.client.rpc("claim_due_events", {
+            "p_now": now, "p_limit": limit, "p_retry_at": retry_at
+        }).select(",".join(HYPE_UNIT_COLUMNS)))
+        return response.data or []
+
+    async def finish_events_before(self, cutoff_date: str) -> List[int]:
+        response = await _execute(
+            self.client.table("events")
+            .update({"status": "FINISHED", "updated_at": datetime.now().isoformat()})
+            .neq("status", "FINISHED")
+            .lt("target_date", cutoff_date)
+        )
+        return [row["id"] for row in response.data or []]
+
+    async def freeze_stale_pending_events(self, created_before: str) -> int:
+        response = await _execute(
+            self.client.table("events")
+            .update({"scoring_frozen_at": datetime.now(timezone.utc).isoformat()})
+            .eq("status", "PENDING")
+            .is_("scoring_frozen_at", "null")
+            .lt("created_at", created_before)
+        )
+        return len(response.data or [])
+
+    async def archive_finished_event_metrics(self) -> int:
+        response = await _execute(self.client.rpc("archive_finished_event_metrics", {}))
+        return int(response.data or 0)
+
+    async def update_event(self, event_id: int, data: Dict[str, Any]) -> None:
+        await _execute(self.client.table("events").update(data).eq("id", event_id))
+
+    async def get_latest_metrics(self, event_id: int) -> Optional[Dict[str, Any]]:
+        response = await _execute(
+            self.client.table("hype_metrics")
+            .select("*")
+            .eq("event_id", event_id)
+            .order("recorded_at", desc=True)
+            .limit(1)
+        )
+        return response.data[0] if response.data else None
+
+    async def insert_hype_metrics(self, rows: List[Dict[str, Any]]) -> int:
+        if not rows:
+            return 0
+        # PostgREST accepts an array body, so the whole batch is one round trip
+        await _execute(self.client.table("hype_metrics").insert(rows))
+        return len(rows)
+
+    async def acquire_lease(self, name: str, owner: str, ttl_seconds: int) -> bool:
+        response = await _execute(self.client.rpc("acquire_job_lease", {
+            "p_name": name, "p_owner": owner, "p_ttl_seconds": ttl_seconds
+        }))
+        return bool(response.data)
+
+    async def renew_lease(self, name: str, owner: str, ttl_seconds: int) -> bool:
+        response = await _execute(self.client.rpc("renew_job_lease", {
+            "p_name": name, "p_owner": owner, "p_ttl_seconds": ttl_seconds
+        }))
+        return bool(response.data)
+
+    async def release_lease(self, name: str, owner: str) -> None:
+        await _execute(self.client.rpc("release_job_lease", {"p_name": name, "p_owner": owner}))
+
+    async def enqueue_work_units(self, rows: List[Dict[str, Any]]) -> None:
+        if not rows:
+            return
+        await _execute(
+            self.client.table("work_units")
+            .upsert(rows, on_conflict="run_id,phase,unit_key", ignore_duplicates=True)
+        )
+
+    async def claim_work_units(
+        self,
+        owner: str,
+        limit: int,
+        ttl_seconds: int,
+        max_attempts: int,
+        run_id: Optional[str] = None,
+        phase: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        response = await _execute(self.client.rpc("claim_work_units", {
+            "p_owner": owner,
+            "p_limit": limit,
+            "p_ttl_seconds": ttl_seconds,
+            "p_max_attempts": max_attempts,
+            "p_run_id": run_id,
+            "p_phase": phase
+        }))
+        return response.data or []
+
+    async def update_work_unit(self, unit_id: int, owner: str, data: Dict[str, Any]) -> None:
+        await _execute(self.client.table("work_units").update({
+            **data,
+            "lease_owner": None,
+            "lease_expires_at": None,
+            "updated_at": datetime.now().isoformat()
+        }).eq("id", unit_id).eq("lease_owner", owner))
+
+    async def renew_work_unit_leases(self, unit_ids: List[int], owner: str, ttl_seconds: int) -> List[int]:
+        if not unit_ids:
+            return []
+        now = datetime.now(timezone.utc)
+        response = await _execute(self.client.table("work_units").update({
+            "lease_expires_at": (now + timedelta(seconds=ttl_seconds)).isoformat(),
+            "updated_at": now.isoformat()
+        }).in_("id", unit_ids).eq("status", "CLAIMED").eq("lease_owner", owner))
+        return [row["id"] for row in response.data or []]
+
+    async def list_work_units(self, run_id: str, phase: Optional[str] = None) -> List[Dict[str, Any]]:
+        def page(last):
+            query = self.client.table("work_units").select("*").eq("run_id", run_id)
+            if phase:
+                query = query.eq("phase", phase)
+            if last is not None:
+                query = query.gt("id", last["id"])
+            return query.order("id").limit(PAGE_ROWS).execute().data
+
+        # Runs can exceed PostgREST max-rows, so page on id
+        return await asyncio.to_thread(lambda: list(iter_pages(page)))
+
+    async def release_work_unit_claims(self, run_id: str, owner: str, max_attempts: int) -> int:
+        now = datetime.now(timezone.utc).isoformat()
+        failed = await _execute(self.client.table("work_units").update({
+            "status": "FAILED",
+            "error": "leader lost on the last attempt",
+            "lease_owner": None,
+            "lease_expires_at": None,
+            "updated_at": now
+        }).eq("run_id", run_id).eq("status", "CLAIMED").eq("lease_owner", owner)
+          .lt("lease_expires_at", now).gte("attempts", max_attempts))
+        requeued = await _execute(self.client.table("work_units").update({
+            "status": "QUEUED",
+            "lease_owner": None,
+            "lease_expires_at": None,
+            "updated_at": now
+        }).eq("run_id", run_id).eq("status", "CLAIMED").eq("lease_owner", owner)
+          .lt("lease_expires_at", now))
+        return len(failed.data or []) + len(requeued.data or [])
+
+    async def fail_open_work_units(self, run_id: str, error: str) -> int:
+        response = await _execute(self.client.table("work_units").update({
+            "status": "FAILED",
+            "error": error,
+            "lease_owner": None,
+            "lease_expires_at": None,
+            "updated_at": datetime.now(timezone.utc).isoformat()
+        }).eq("run_id", run_id).in_("status", ["QUEUED", "CLAIMED"]))
+        return len(response.data or [])
+
+    async def get_incomplete_run(self) -> Optional[Dict[str, Any]]:
+        response = await _execute(
+            self.client.table("pipeline_runs")
+            .select("*")
+            .eq("status", "RUNNING")
+            .order("started_at", desc=True)
+            .limit(1)
+        )
+        return response.data[0] if response.data else None
+
+    async def insert_pipeline_run(self, run: Dict[str, Any]) -> None:
+        await _execute(self.client.table("pipeline_runs").insert(run))
+
+    async def update_pipeline_run(self, run_id: str, data: Dict[str, Any]) -> None:
+        await _execute(self.client.table("pipeline_runs").update(data).eq("run_id", run_id))
+
+    async def find_seen_articles(self, fingerprints: List[str]) -> List[str]:
+        if not fingerprints:
+            return []
+        response = await _execute(
+            self.client.table("seen_articles")
+            .select("fingerprint")
+            .in_("fingerprint", fingerprints)
+            .gt("expires_at", datetime.now(timezone.utc).isoformat())
+        )
+        return [row["fingerprint"] for row in response.data]
+
+    async def upsert_seen_articles(self, fingerprints: List[str], expires_at: str) -> None:
+        if not fingerprints:
+            return
+        await _execute(
+            self.client.table("seen_articles")
+            .upsert(
+                [{"fingerprint": fp, "expires_at": expires_at} for fp in fingerprints],
+                on_conflict="fingerprint"
+            )
+        )
+
+    async def list_seen_articles(self, after: Optional[str], limit: int) -> List[str]:
+        query = self.client.table("seen_articles")\
+            .select("fingerprint")\
+            .gt("expires_at", datetime.now(timezone.utc).isoformat())
+        if after is not None:
+            query = query.gt("fingerprint", after)
+        response = await _execute(query.order("fingerprint").limit(limit))
+        return [row["fingerprint"] for row in response.data]
+
+    async def delete_expired_seen_articles(self) -> int:
+        response = await _execute(
+            self.client.table("seen_articles")
+            .delete()
+            .lt("expires_at", datetime.now(timezone.utc).isoformat())
+        )
+        return len(response.data or [])
+
+    async def bump_cache_version(self, name: str) -> int:
+        response = await _execute(self.client.rpc("bump_cache_version", {"p_name": name}))
+        return int(response.data or 0)
+
+    async def list_calendar_snapshot_etags(self) -> Dict[str, str]:
+        response = await _execute(self.client.table("calendar_snapshots").select("name, etag"))
+        return {row["name"]: row["etag"] for row in response.data}
+
+    async def upsert_calendar_snapshots(self, rows: List[Dict[str, Any]]) -> None:
+        if not rows:
+            return
+        # PostgREST takes bytea as a '\x…' hex string
+        payload = [
+            {
+                **row,
+                "body_gzip": "\\x" + row["body_gzip"].hex(),
+                "body_br": "\\x" + row["body_br"].hex() if row.get("body_br") is not None else None,
+                "generated_at": datetime.now(timezone.utc).isoformat()
+            }
+            for row in rows
+        ]
+        await _execute(self.client.table("calendar_snapshots").upsert(payload, on_conflict="name"))
+
+    async def delete_calendar_snapshots(self, names: List[str]) -> None:
+        if not names:
+            return
+        await _execute(self.client.table("calendar_snapshots").delete().in_("name", names))
+
+    async def claim_email_outbox(self, owner: str, limit: int, ttl_seconds: int, max_attempts: int) -> List[Dict[str, Any]]:
+        response = await _execute(self.client.rpc("claim_email_outbox", {
+            "p_owner": owner,
+            "p_limit": limit,
+            "p_ttl_seconds": ttl_seconds,
+            "p_max_attempts": max_attempts
+        }))
+        return response.data or []
+
+    async def complete_email_outbox(self, ids: List[int], provider_ids: List[str], owner: str) -> None:
+        if not ids:
+            return
+        await _execute(self.client.rpc("complete_email_outbox", {
+            "p_owner": owner, "p_ids": ids, "p_provider_ids": provider_ids
+        }))
+
+    async def release_email_outbox(self, message_id: int, owner: str, status: str, error: str, retry_in: float) -> None:
+        now = datetime.now(timezone.utc)
+        await _execute(self.client.table("email_outbox").update({
+            "status": status,
+            "error": error,
+            "next_attempt_at": (now + timedelta(seconds=retry_in)).isoformat(),
+            "lease_owner": None,
+            "lease_expires_at": None,
+            "updated_at": now.isoformat()
+        }).eq("id", message_id).eq("lease_owner", owner))
+
+    async def find_resolved_urls(self, redirect_urls: List[str]) -> Dict[str, str]:
+        if not redirect_urls:
+            return {}
+        response = await _execute(
+            self.client.table("resolved_urls")
+            .select("redirect_url, canonical_url")
+            .in_("redirect_url", redirect_urls)
+        )
+        return {row["redirect_url"]: row["canonical_url"] for row in response.data}
+
+    async def upsert_resolved_urls(self, resolved: Dict[str, str]) -> None:
+        if not resolved:
+            return
+        await _execute(
+            self.client.table("resolved_urls")
+            .upsert(
+                [{"redirect_url": key, "canonical_url": value} for key, value in resolved.items()],
+                on_conflict="redirect_url"
+            )
+        )
+
+
+@lru_cache()
+def get_repository() -> BaseRepository:
+    """
+    Return the configured repository backend (singleton per process).
+    """
+    settings = get_settings()
+
+    if settings.DB_BACKEND == "postgres":
+        # Imported lazily so asyncpg is only required when the backend is used
+        from app.db.postgres import PostgresRepository
+        if not settings.DATABASE_URL:
+            raise ValueError("DATABASE_URL must be set when DB_BACKEND=postgres")
+        return PostgresRepository(
+            dsn=settings.DATABASE_URL,
+            min_size=settings.DB_POOL_MIN_SIZE,
+            max_size=settings.DB_POOL_MAX_SIZE
+        )
+
+    from app.db.session import get_db
+    return SupabaseRepository(get_db())
@@ -40,6 +40,9 @@ create table public.events (
   gpt_confidence float default 0, -- GPT extraction confidence (0.0-1.0)
   related_tickers text[], -- Array of ticker codes
   status text check (status in ('PENDING', 'ACTIVE', 'FINISHED')) default 'PENDING',
+  scoring_frozen_at timestamp with time zone, -- Stale PENDING event: no longer scored
+  next_refresh_at timestamp with time zone default now(), -- Adaptive refresh cadence
+  score_volatility float default 0, -- EWMA of score changes between refreshes
   created_at timestamp with time zone default timezone('utc'::text, now()) not null,
   updated_at timestamp with time zone default timezone('utc'::text, now()) not null
 );
@@ -65,6 +68,360 @@ create table public.event_proxies (
 
 -- Indexes for performance
 create index idx_events_status on public.events(status);
-create index idx_events_hype_score on public.events(hype_score desc);
-create index idx_hype_metrics_event_id on public.hype_metrics(event_id);
 create index idx_hype_metrics_recorded_at on public.hype_metrics(recorded_at);
+
+-- 5. Job Leases (leader lock for scheduled jobs)
+-- One row per job name, owned by the instance currently running it
+create table public.job_leases (
+  name text primary key,
+  owner text not null,
+  expires_at timestamp with time zone not null,
+  acquired_at timestamp with time zone default now() not null
+);
+
+-- Acquire (or take over an expired) lease atomically
+create or replace function public.acquire_job_lease(p_name text, p_owner text, p_ttl_seconds int)
+returns boolean as $$
+begin
+  insert into public.job_leases as l (name, owner, expires_at, acquired_at)
+  values (p_name, p_owner, now() + make_interval(secs => p_ttl_seconds), now())
+  on conflict (name) do update
+    set owner = excluded.owner,
+        expires_at = excluded.expires_at,
+        acquired_at = excluded.acquired_at
+    where l.expires_at < now() or l.owner = excluded.owner;
+  return found;
+end;
+$$ language plpgsql;
+
+-- Heartbeat: extend the lease only while we still own it
+create or replace function public.renew_job_lease(p_name text, p_owner text, p_ttl_seconds int)
+returns boolean as $$
+begin
+  update public.job_leases
+  set expires_at = now() + make_interval(secs => p_ttl_seconds)
+  where name = p_name and owner = p_owner;
+  return found;
+end;
+$$ language plpgsql;
+
+-- Release on normal completion
+create or replace function public.release_job_lease(p_name text, p_owner text)
+returns boolean as $$
+begin
+  delete from public.job_leases where name = p_name and owner = p_owner;
+  return found;
+end;
+$$ language plpgsql;
+
+-- 6. Work Units (durable queue for sharded pipeline runs)
+-- One row per work unit (ticker for discovery, event for hype) per run
+create table public.work_units (
+  id bigint generated by default as identity primary key,
+  run_id text not null,
+  phase text not null check (phase in ('discovery', 'hype')),
+  unit_key text not null,
+  payload jsonb default '{}'::jsonb not null,
+  status text check (status in ('QUEUED', 'CLAIMED', 'DONE', 'FAILED')) default 'QUEUED' not null,
+  attempts int default 0 not null,
+  lease_owner text,
+  lease_expires_at timestamp with time zone,
+  result jsonb,
+  error text,
+  created_at timestamp with time zone default timezone('utc'::text, now()) not null,
+  updated_at timestamp with time zone default timezone('utc'::text, now()) not null,
+  unique (run_id, phase, unit_key)
+);
+
+create index idx_work_units_claimable on public.work_units(run_id, phase, status);
+
+-- Claim queued or lease-expired units without blocking other workers
+create or replace function public.claim_work_units(
+  p_owner text,
+  p_limit int,
+  p_ttl_seconds int,
+  p_max_attempts int,
+  p_run_id text default null,
+  p_phase text default null
+)
+returns setof public.work_units as $$
+begin
+  -- Units whose worker died on the last allowed attempt are given up
+  update public.work_units
+  set status = 'FAILED', error = 'lease expired after max attempts', updated_at = now()
+  where status = 'CLAIMED' and lease_expires_at < now() and attempts >= p_max_attempts;
+
+  return query
+  update public.work_units w
+  set status = 'CLAIMED',
+      attempts = w.attempts + 1,
+      lease_owner = p_owner,
+      lease_expires_at = now() + make_interval(secs => p_ttl_seconds),
+      updated_at = now()
+  where w.id in (
+    select id from public.work_units
+    where (p_run_id is null or run_id = p_run_id)
+      and (p_phase is null or phase = p_phase)
+      and attempts < p_max_attempts
+      and (status = 'QUEUED' or (status = 'CLAIMED' and lease_expires_at < now()))
+    order by id
+    limit p_limit
+    for update skip locked
+  )
+  returning w.*;
+end;
+$$ language plpgsql;
+
+-- 7. Pipeline Runs (checkpointed, resumable daily runs)
+-- Per-unit checkpoints live in work_units
+create table public.pipeline_runs (
+  run_id text primary key,
+  status text check (status in ('RUNNING', 'COMPLETED', 'ABANDONED')) default 'RUNNING' not null,
+  phase text,
+  leader text,
+  summary jsonb,
+  started_at timestamp with time zone default timezone('utc'::text, now()) not null,
+  finished_at timestamp with time zone
+);
+
+create index idx_pipeline_runs_running on public.pipeline_runs(started_at desc) where status = 'RUNNING';
+
+-- 8. Seen Articles (fingerprints of processed articles, with expiry)
+-- fingerprint = "u:" + canonical URL hash or "t:" + normalized title hash
+create table public.seen_articles (
+  fingerprint text primary key,
+  first_seen_at timestamp with time zone default timezone('utc'::text, now()) not null,
+  expires_at timestamp with time zone not null
+);
+
+create index idx_seen_articles_expires_at on public.seen_articles(expires_at);
+
+-- 9. Resolved URLs (Google News redirect link -> canonical publisher URL)
+create table public.resolved_urls (
+  redirect_url text primary key,
+  canonical_url text not null,
+  resolved_at timestamp with time zone default timezone('utc'::text, now()) not null
+);
+
+create index idx_events_source_url on public.events(source_url);
+
+-- 10. Event Lifecycle (finished events leave the Phase 2 working set)
+create index idx_events_live on public.events(target_date)
+  where status <> 'FINISHED' and scoring_frozen_at is null;
+
+-- Metric history of FINISHED events, moved out of hype_metrics
+create table public.hype_metrics_archive (
+  id bigint primary key,
+  event_id bigint references public.events(id) on delete cascade not null,
+  recorded_at date not null,
+  search_volume int default 0,
+  community_buzz int default 0,
+  youtube_count int default 0,
+  created_at timestamp with time zone not null,
+  archived_at timestamp with time zone default timezone('utc'::text, now()) not null
+);
+
+create or replace function public.archive_finished_event_metrics()
+returns int as $$
+declare
+  moved_count int;
+begin
+  with moved as (
+    delete from public.hype_metrics m
+    using public.events e
+    where m.event_id = e.id and e.status = 'FINISHED'
+    returning m.*
+  )
+  insert into public.hype_metrics_archive
+    (id, event_id, recorded_at, search_volume, community_buzz, youtube_count, created_at)
+  select id, event_id, recorded_at, search_volume, community_buzz, youtube_count, created_at
+  from moved
+  on conflict (id) do nothing;
+
+  get diagnostics moved_count = row_count;
+  return moved_count;
+end;
+$$ language plpgsql;
+
+-- 11. Refresh Cadence (per-event next_refresh_at instead of a nightly pass)
+create index idx_events_next_refresh on public.events(next_refresh_at)
+  where status <> 'FINISHED' and scoring_frozen_at is null;
+
+-- Claim the most overdue events; scoring sets the real next refresh
+create or replace function public.claim_due_events(
+  p_now timestamp with time zone,
+  p_limit int,
+  p_retry_at timestamp with time zone
+)
+returns setof public.events as $$
+begin
+  return query
+  update public.events e
+  set next_refresh_at = p_retry_at
+  where e.id in (
+    select id from public.events
+    where status <> 'FINISHED'
+      and scoring_frozen_at is null
+      and next_refresh_at <= p_now
+    order by next_refresh_at
+    limit p_limit
+    for update skip locked
+  )
+  returning e.*;
+end;
+$$ language plpgsql;
+
+-- 12. Events Listing (keyset pagination: one index per sort order, id as tie-breaker)
+create index idx_events_hype_score_id on public.events(hype_score desc, id desc);
+create index idx_events_target_date_id on public.events(target_date, id);
+create index idx_events_created_at_id on public.events(created_at desc, id desc);
+create index idx_events_status_hype_score_id on public.events(status, hype_score desc, id desc);
+create index idx_events_status_target_date_id on public.events(status, target_date, id);
+create index idx_events_related_tickers on public.events using gin(related_tickers);
+
+-- 13. Cache Versions (cross-process read cache invalidation)
+create table public.cache_versions (
+  name text primary key,
+  version bigint default 0 not null,
+  updated_at timestamp with time zone default timezone('utc'::text, now()) not null
+);
+
+create or replace function public.bump_cache_version(p_name text)
+returns bigint as $$
+  insert into public.cache_versions (name, version, updated_at)
+  values (p_name, 1, now())
+  on conflict (name) do update
+  set version = public.cache_versions.version + 1, updated_at = now()
+  returning version;
+$$ language sql;
+
+-- 14. Calendar Snapshots (pre-serialized, pre-compressed ACTIVE calendar)
+create table public.calendar_snapshots (
+  name text primary key,
+  etag text not null,
+  body text not null,
+  body_gzip bytea not null,
+  body_br bytea,
+  event_count integer default 0 not null,
+  generated_at timestamp with time zone default timezone('utc'::text, now()) not null
+);
+
+-- 15. Hype Time Series (bucketed, newest first; p_limit keeps the latest buckets)
+create index idx_hype_metrics_event_recorded on public.hype_metrics(event_id, recorded_at);
+create index idx_hype_metrics_archive_event_recorded on public.hype_metrics_archive(event_id, recorded_at);
+
+create or replace function public.hype_metric_buckets(
+  p_event_id bigint,
+  p_bucket text,
+  p_from date default null,
+  p_to date default null,
+  p_limit int default null
+)
+returns table (
+  bucket date,
+  search_volume double precision,
+  community_buzz double precision,
+  youtube_count double precision,
+  samples int
+) as $$
+  select date_trunc(p_bucket, m.recorded_at)::date as bucket,
+         avg(m.search_volume)::double precision,
+         avg(m.community_buzz)::double precision,
+         avg(m.youtube_count)::double precision,
+         count(*)::int
+  from (
+    select recorded_at, search_volume, community_buzz, youtube_count
+    from public.hype_metrics where event_id = p_event_id
+    union all
+    select recorded_at, search_volume, community_buzz, youtube_count
+    from public.hype_metrics_archive where event_id = p_event_id
+  ) m
+  where p_bucket in ('day', 'week')
+    and (p_from is null or m.recorded_at >= p_from)
+    and (p_to is null or m.recorded_at <= p_to)
+  group by 1
+  order by 1 desc
+  limit p_limit;
+$$ language sql stable;
+
+-- 16. Events Change Feed (updated_at stamped by the database; leaderboard sync polls it)
+create or replace function public.touch_updated_at()
+returns trigger as $$
+begin
+  new.updated_at = now();
+  return new;
+end;
+$$ language plpgsql;
+
+create trigger events_touch_updated_at
+  before update on public.events
+  for each row execute function public.touch_updated_at();
+
+create index idx_events_updated_at_id on public.events(updated_at, id);
+
+-- 17. Email Outbox (alert emails are queued, a worker delivers them in batches)
+create table public.email_outbox (
+  id bigint generated by default as identity primary key,
+  kind text not null,
+  dedupe_key text unique,
+  sender text not null,
+  recipients text[] not null,
+  subject text not null,
+  html text not null,
+  status text check (status in ('QUEUED', 'SENDING', 'SENT', 'FAILED')) default 'QUEUED' not null,
+  attempts int default 0 not null,
+  next_attempt_at timestamp with time zone default now() not null,
+  lease_owner text,
+  lease_expires_at timestamp with time zone,
+  provider_id text,
+  error text,
+  sent_at timestamp with time zone,
+  created_at timestamp with time zone default timezone('utc'::text, now()) not null,
+  updated_at timestamp with time zone default timezone('utc'::text, now()) not null
+);
+
+create index idx_email_outbox_due on public.email_outbox(next_attempt_at, id) where status in ('QUEUED', 'SENDING');
+
+create or replace function public.claim_email_outbox(
+  p_owner text,
+  p_limit int,
+  p_ttl_seconds int,
+  p_max_attempts int
+)
+returns setof public.email_outbox as $$
+begin
+  update public.email_outbox
+  set status = 'FAILED', error = 'lease expired after max attempts', updated_at = now()
+  where status = 'SENDING' and lease_expires_at < now() and attempts >= p_max_attempts;
+
+  return query
+  update public.email_outbox o
+  set status = 'SENDING',
+      attempts = o.attempts + 1,
+      lease_owner = p_owner,
+      lease_expires_at = now() + make_interval(secs => p_ttl_seconds),
+      updated_at = now()
+  where o.id in (
+    select id from public.email_outbox
+    where (status = 'QUEUED' and next_attempt_at <= now())
+       or (status = 'SENDING' and lease_expires_at < now())
+    order by next_attempt_at, id
+    limit p_limit
+    for update skip locked
+  )
+  returning o.*;
+end;
+$$ language plpgsql;
+
+create or replace function public.complete_email_outbox(
+  p_owner text,
+  p_ids bigint[],
+  p_provider_ids text[]
+)
+returns void as $$
+  update public.email_outbox o
+  set status = 'SENT', provider_id = s.provider_id, error = null, sent_at = now(),
+      lease_owner = null, lease_expires_at = null, updated_at = now()
+  from unnest(p_ids, p_provider_ids) as s(id, provider_id)
+  where o.id = s.id and o.lease_owner = p_owner;
+$$ language sql;
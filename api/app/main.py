@@ -1,6 +1,6 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.api.endpoints import events, alerts
+from app.api.endpoints import events, alerts, calendar, leaderboard, stream
 
 app = FastAPI(title="Alpha Calendar API", version="0.1.0")
 
@@ -10,22 +10,31 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 app.include_router(events.router, prefix="/api/v1/events", tags=["events"])
+app.include_router(calendar.router, prefix="/api/v1/calendar", tags=["calendar"])
+app.include_router(leaderboard.router, prefix="/api/v1/leaderboard", tags=["leaderboard"])
+app.include_router(stream.router, prefix="/api/v1/stream", tags=["stream"])
 app.include_router(alerts.router, prefix="/api/v1/alerts", tags=["alerts"])
 from app.api.endpoints import admin
 app.include_router(admin.router, prefix="/api/v1/admin", tags=["admin"])
 
-from app.services.scheduler import scheduler_service
+from app.core.config import get_settings
 
-@app.on_event("startup")
-async def startup_event():
-    scheduler_service.start()
+# The scheduler normally runs in its own worker process (python -m app.worker).
+# RUN_SCHEDULER_IN_API=true keeps the old single-process behaviour for small deploys.
+if get_settings().RUN_SCHEDULER_IN_API:
+    @app.on_event("startup")
+    async def startup_event():
+        from app.services.scheduler import scheduler_service
+        scheduler_service.start()
 
-@app.on_event("shutdown")
-async def shutdown_event():
-    scheduler_service.shutdown()
+    @app.on_event("shutdown")
+    async def shutdown_event():
+        from app.services.scheduler import scheduler_service
+        scheduler_service.shutdown()
 
 @app.get("/")
 def read_root():
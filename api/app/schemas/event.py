@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import Dict, List, Optional
 from datetime import date, datetime
 from enum import Enum
 
@@ -13,6 +13,16 @@ class EventStatus(str, Enum):
     ACTIVE = 'ACTIVE'
     FINISHED = 'FINISHED'
 
+class EventSort(str, Enum):
+    HYPE_SCORE_DESC = 'hype_score_desc'
+    TARGET_DATE_ASC = 'target_date_asc'
+    TARGET_DATE_DESC = 'target_date_desc'
+    CREATED_AT_DESC = 'created_at_desc'
+
+class MetricResolution(str, Enum):
+    DAILY = 'daily'
+    WEEKLY = 'weekly'
+
 class MembershipTier(str, Enum):
     FREE = 'FREE'
     PRO = 'PRO'
@@ -35,6 +45,26 @@ class HypeMetricResponse(HypeMetricBase):
     class Config:
         from_attributes = True
 
+# --- Hype Time Series (bucketed, downsampled; see /events/{id}/metrics) ---
+class HypeMetricValues(BaseModel):
+    search_volume: float = 0
+    community_buzz: float = 0
+    youtube_count: float = 0
+
+class HypeSeriesPoint(HypeMetricValues):
+    recorded_at: date  # Bucket start (the Monday for weekly buckets)
+
+class HypeSeriesResponse(BaseModel):
+    event_id: int
+    resolution: MetricResolution
+    points: List[HypeSeriesPoint] = []
+    buckets: int = 0  # Buckets in range before downsampling
+
+class HypeMetricsSummary(BaseModel):
+    latest: Optional[HypeSeriesPoint] = None
+    delta_7d: Optional[HypeMetricValues] = None  # latest minus the last day at least 7 days earlier
+    sparkline: List[float] = []  # Daily totals of the last 30 days, oldest first
+
 # --- Event Proxies ---
 class EventProxyBase(BaseModel):
     proxy_name: str
@@ -89,3 +119,33 @@ class EventResponse(EventBase):
 
     class Config:
         from_attributes = True
+
+class EventDetailResponse(EventResponse):
+    # Constant-size summary instead of the full metric history (hype_metrics stays empty)
+    metrics_summary: HypeMetricsSummary = HypeMetricsSummary()
+
+class CalendarRangeResponse(BaseModel):
+    start: date
+    end: date
+    day_counts: Dict[date, int] = {}  # Days of the window that have events
+    events: List[EventResponse] = []  # Sparse objects with fields=
+
+class LeaderboardEntry(BaseModel):
+    rank: int
+    id: int
+    title: str
+    target_date: date
+    hype_score: int
+    related_tickers: List[str] = []
+
+class LeaderboardResponse(BaseModel):
+    ticker: Optional[str] = None  # None = all upcoming ACTIVE events
+    total: int  # Events in this scope
+    entries: List[LeaderboardEntry] = []
+
+class EventRankResponse(BaseModel):
+    event_id: int
+    ticker: Optional[str] = None
+    rank: Optional[int] = None  # None when the event is not on this leaderboard
+    total: int
+    hype_score: Optional[int] = None
@@ -0,0 +1,81 @@
+"""
+Calendar Range Index
+
+In-process sorted index of the ACTIVE calendar for month/week navigation:
+
+- Built from the "all" calendar snapshot (already ordered by target_date, id), so a
+  window query never touches the database; rebuilt when the snapshot's ETag changes
+- Window queries are two bisects over the target dates plus a slice
+- Per-day counts come from the distinct days and their counts (also bisected)
+- Months are pre-grouped as (start, end) offsets, so a month view is a slice lookup
+"""
+
+import threading
+from bisect import bisect_left, bisect_right
+from datetime import date
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class CalendarIndex:
+    """
+    Args:
+        events: ACTIVE events ordered by (target_date, id)
+        version: ETag of the snapshot the index was built from
+    """
+
+    def __init__(self, events: List[Dict[str, Any]], version: str = ""):
+        self.version = version
+        self.events = events
+        self.dates = [str(event["target_date"])[:10] for event in events]
+
+        # Distinct days and their event counts
+        self.days: List[str] = []
+        counts: List[int] = []
+        for day in self.dates:
+            if self.days and self.days[-1] == day:
+                counts[-1] += 1
+            else:
+                self.days.append(day)
+                counts.append(1)
+        self.day_counts = counts
+
+        # "YYYY-MM" -> (first, last + 1) event offsets
+        self.months: Dict[str, Tuple[int, int]] = {}
+        for i, day in enumerate(self.dates):
+            start, _ = self.months.get(day[:7], (i, i))
+            self.months[day[:7]] = (start, i + 1)
+
+    def window(self, start: date, end: date) -> List[Dict[str, Any]]:
+        """Events with start <= target_date <= end, in calendar order."""
+        lo = bisect_left(self.dates, start.isoformat())
+        hi = bisect_right(self.dates, end.isoformat())
+        return self.events[lo:hi]
+
+    def month(self, month: str) -> List[Dict[str, Any]]:
+        start, end = self.months.get(month, (0, 0))
+        return self.events[start:end]
+
+    def counts(self, start: date, end: date) -> Dict[str, int]:
+        """{day: number of events} for days in the window that have events."""
+        lo = bisect_left(self.days, start.isoformat())
+        hi = bisect_right(self.days, end.isoformat())
+        return dict(zip(self.days[lo:hi], self.day_counts[lo:hi]))
+
+
+_index: Optional[CalendarIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_calendar_index(version: str, load_events) -> CalendarIndex:
+    """
+    The process-wide index for snapshot `version`; `load_events()` is only called to
+    (re)build it when the version changed.
+    """
+    global _index
+    index = _index
+    if index is not None and index.version == version:
+        return index
+    with _index_lock:
+        if _index is None or _index.version != version:
+            _index = CalendarIndex(load_events(), version)
+        return _index
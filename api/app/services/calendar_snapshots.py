@@ -0,0 +1,307 @@
+"""
+Calendar Snapshots
+
+The calendar view of ACTIVE events is the hottest read and only changes when the
+pipeline writes, so the leader renders it once at the end of each pipeline run:
+
+- Snapshots: the full active calendar ("all"), one per target month
+  ("months/2026-11") and one per related ticker ("tickers/NVDA")
+- Each snapshot is serialized once and stored pre-compressed (gzip, plus brotli when
+  the brotli package is installed) under a strong ETag (content hash)
+- Unchanged snapshots are not rewritten; snapshots whose month or ticker no longer
+  has ACTIVE events are removed
+- Stores (SNAPSHOT_STORE): "database" (calendar_snapshots table, served by
+  /api/v1/calendar) or "directory" (files under SNAPSHOT_DIR for a shared volume,
+  a static server or a CDN origin, e.g. nginx gzip_static/brotli_static)
+
+Serving a snapshot skips the events query and JSON encoding entirely.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import re
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+from app.core.config import get_settings
+from app.api.serialization import dump_events
+from app.services.cpu_pool import run_cpu
+from app.services.read_cache import publish_events_changed
+
+try:
+    import brotli
+except ImportError:  # Optional: without it snapshots are served gzip/identity only
+    brotli = None
+
+
+SNAPSHOT_ALL = "all"
+MONTH_PATTERN = re.compile(r"^\d{4}-(0[1-9]|1[0-2])$")
+TICKER_PATTERN = re.compile(r"^[A-Z0-9.\-]{1,15}$")
+
+@dataclass
+class Snapshot:
+    name: str
+    etag: str  # Content hash of body, shared by every encoding
+    body: bytes
+    gzip: bytes
+    br: Optional[bytes]
+    event_count: int
+
+
+def month_snapshot(month: str) -> str:
+    return f"months/{month}"
+
+
+def ticker_snapshot(ticker: str) -> str:
+    return f"tickers/{ticker.upper()}"
+
+
+def group_calendar(events: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+    """Snapshot name -> events, keeping the (target_date, id) order of `events`."""
+    groups: Dict[str, List[Dict[str, Any]]] = {SNAPSHOT_ALL: list(events)}
+    for event in events:
+        month = str(event.get("target_date") or "")[:7]
+        if MONTH_PATTERN.match(month):
+            groups.setdefault(month_snapshot(month), []).append(event)
+        tickers = {str(t).upper() for t in event.get("related_tickers") or []}
+        for ticker in sorted(tickers):
+            # Names become URL paths and file names: skip anything that is not a plain ticker
+            if TICKER_PATTERN.match(ticker):
+                groups.setdefault(ticker_snapshot(ticker), []).append(event)
+    return groups
+
+
+def encode_snapshot(name: str, events: List[Dict[str, Any]]) -> Snapshot:
+    body = dump_events(events)  # Same bytes as an /events page
+    return Snapshot(
+        name=name,
+        etag=hashlib.sha256(body).hexdigest()[:32],
+        body=body,
+        gzip=gzip.compress(body, compresslevel=9, mtime=0),  # mtime=0: same body, same bytes
+        br=brotli.compress(body, quality=11) if brotli is not None else None,
+        event_count=len(events)
+    )
+
+
+def render_snapshots(groups: Dict[str, List[Dict[str, Any]]]) -> List[Snapshot]:
+    """Serialize and compress every group (CPU-bound; runs in the CPU pool when enabled)."""
+    return [encode_snapshot(name, events) for name, events in groups.items()]
+
+
+# Served for a month or ticker without ACTIVE events
+EMPTY_SNAPSHOT = encode_snapshot("empty", [])
+
+
+class SnapshotStore(ABC):
+    """
+    Abstract destination of published snapshots.
+    """
+
+    @abstractmethod
+    async def etags(self) -> Dict[str, str]:
+        """Name -> ETag of every stored snapshot."""
+        pass
+
+    @abstractmethod
+    async def save(self, snapshots: List[Snapshot]) -> None:
+        pass
+
+    @abstractmethod
+    async def delete(self, names: List[str]) -> None:
+        pass
+
+    @abstractmethod
+    def read(self, name: str, db=None) -> Optional[Snapshot]:
+        """Sync read for the API endpoints (which run in the threadpool)."""
+        pass
+
+
+def _from_bytea(value: Any) -> Optional[bytes]:
+    """PostgREST returns bytea as a '\\x…' hex string."""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return bytes.fromhex(value[2:] if value.startswith("\\x") else value)
+    return bytes(value)
+
+
+class DatabaseSnapshotStore(SnapshotStore):
+    """
+    Snapshots in the calendar_snapshots table (works across API and worker hosts).
+    Writes go through the repository; reads use the API's Supabase client.
+    """
+
+    def __init__(self, repository=None):
+        self.repository = repository
+
+    async def etags(self) -> Dict[str, str]:
+        return await self.repository.list_calendar_snapshot_etags()
+
+    async def save(self, snapshots: List[Snapshot]) -> None:
+        await self.repository.upsert_calendar_snapshots([
+            {
+                "name": s.name,
+                "etag": s.etag,
+                "body": s.body.decode(),
+                "body_gzip": s.gzip,
+                "body_br": s.br,
+                "event_count": s.event_count
+            }
+            for s in snapshots
+        ])
+
+    async def delete(self, names: List[str]) -> None:
+        await self.repository.delete_calendar_snapshots(names)
+
+    def read(self, name: str, db=None) -> Optional[Snapshot]:
+        if db is None:
+            from app.db.session import get_db
+            db = get_db()
+        response = db.table("calendar_snapshots")\
+            .select("etag, body, body_gzip, body_br, event_count")\
+            .eq("name", name)\
+            .execute()
+        if not response.data:
+            return None
+        row = response.data[0]
+        return Snapshot(
+            name=name,
+            etag=row["etag"],
+            body=row["body"].encode(),
+            gzip=_from_bytea(row["body_gzip"]),
+            br=_from_bytea(row.get("body_br")),
+            event_count=row.get("event_count") or 0
+        )
+
+
+class DirectorySnapshotStore(SnapshotStore):
+    """
+    Snapshots as static files: <dir>/<name>.json, .json.gz, .json.br, plus
+    <dir>/manifest.json (name -> etag). Files are replaced atomically, the manifest last.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def _path(self, name: str, suffix: str) -> str:
+        return os.path.join(self.directory, f"{name}.json{suffix}")
+
+    def _manifest_path(self) -> str:
+        return os.path.join(self.directory, "manifest.json")
+
+    def _read_manifest(self) -> Dict[str, Any]:
+        try:
+            with open(self._manifest_path(), "rb") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {"snapshots": {}}
+
+    def _write(self, path: str, data: bytes):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+    async def etags(self) -> Dict[str, str]:
+        return {name: entry["etag"] for name, entry in self._read_manifest()["snapshots"].items()}
+
+    async def save(self, snapshots: List[Snapshot]) -> None:
+        manifest = self._read_manifest()
+        for s in snapshots:
+            self._write(self._path(s.name, ""), s.body)
+            self._write(self._path(s.name, ".gz"), s.gzip)
+            if s.br is not None:
+                self._write(self._path(s.name, ".br"), s.br)
+            manifest["snapshots"][s.name] = {"etag": s.etag, "event_count": s.event_count}
+        manifest["generated_at"] = datetime.now(timezone.utc).isoformat()
+        self._write(self._manifest_path(), json.dumps(manifest, sort_keys=True).encode())
+
+    async def delete(self, names: List[str]) -> None:
+        manifest = self._read_manifest()
+        for name in names:
+            manifest["snapshots"].pop(name, None)
+        self._write(self._manifest_path(), json.dumps(manifest, sort_keys=True).encode())
+        for name in names:
+            for suffix in ("", ".gz", ".br"):
+                try:
+                    os.remove(self._path(name, suffix))
+                except FileNotFoundError:
+                    pass
+
+    def read(self, name: str, db=None) -> Optional[Snapshot]:
+        entry = self._read_manifest()["snapshots"].get(name)
+        if entry is None:
+            return None
+        try:
+            with open(self._path(name, ""), "rb") as f:
+                body = f.read()
+            with open(self._path(name, ".gz"), "rb") as f:
+                compressed = f.read()
+        except FileNotFoundError:
+            return None
+        try:
+            with open(self._path(name, ".br"), "rb") as f:
+                br = f.read()
+        except FileNotFoundError:
+            br = None
+        return Snapshot(name, entry["etag"], body, compressed, br, entry.get("event_count", 0))
+
+
+class CalendarSnapshotPublisher:
+    """
+    Renders the ACTIVE calendar into snapshots and writes the ones that changed.
+
+    Args:
+        repository: Data access layer (source of ACTIVE events)
+        store: Snapshot destination
+    """
+
+    def __init__(self, repository, store: SnapshotStore):
+        self.repository = repository
+        self.store = store
+        self.published_at: Optional[float] = None  # time.monotonic() of the last publish
+
+    async def publish(self) -> Dict[str, int]:
+        """
+        Returns:
+            {"written": ..., "unchanged": ..., "removed": ...}
+        """
+        events = await self.repository.list_active_events()
+        snapshots = await run_cpu(render_snapshots, group_calendar(events))
+        names = {s.name for s in snapshots}
+
+        previous = await self.store.etags()
+        changed = [s for s in snapshots if previous.get(s.name) != s.etag]
+        removed = [name for name in previous if name not in names]
+
+        if changed:
+            await self.store.save(changed)
+        if removed:
+            await self.store.delete(removed)
+        if changed or removed:
+            await publish_events_changed(self.repository)
+        self.published_at = time.monotonic()
+
+        result = {"written": len(changed), "unchanged": len(snapshots) - len(changed), "removed": len(removed)}
+        print(
+            f"  Calendar snapshots: {result['written']} written, {result['unchanged']} unchanged, "
+            f"{result['removed']} removed ({len(events)} ACTIVE events)"
+        )
+        return result
+
+
+def get_snapshot_store(repository=None) -> SnapshotStore:
+    """The configured store; API processes only read, so they pass no repository."""
+    settings = get_settings()
+    if settings.SNAPSHOT_STORE == "directory":
+        return DirectorySnapshotStore(settings.SNAPSHOT_DIR)
+    return DatabaseSnapshotStore(repository)
+
+
+def get_snapshot_publisher(repository) -> CalendarSnapshotPublisher:
+    return CalendarSnapshotPublisher(repository, get_snapshot_store(repository))
@@ -0,0 +1,69 @@
+"""
+Events Change Feed
+
+events.updated_at is stamped by the database on every UPDATE (migration_014) and
+defaults to now() on INSERT, so "events changed since T" is one indexed range query.
+Readers keep a watermark (the highest updated_at seen) and re-read an overlap window
+before it, so rows committed late or stamped in the same transaction are not missed;
+whatever a reader does with a row must therefore be idempotent.
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+# Rows per database page (PostgREST max-rows)
+PAGE_ROWS = 1000
+
+
+def parse_timestamp(value: Any) -> datetime:
+    """PostgREST timestamp (ISO string) as an aware datetime."""
+    stamp = value if isinstance(value, datetime) else datetime.fromisoformat(str(value))
+    return stamp if stamp.tzinfo else stamp.replace(tzinfo=timezone.utc)
+
+
+def iter_pages(query_page: Callable[[Optional[Dict[str, Any]]], List[Dict[str, Any]]]) -> Iterator[Dict[str, Any]]:
+    """Every row of a query, PAGE_ROWS at a time; `query_page(last)` continues after row `last`."""
+    last = None
+    while True:
+        rows = query_page(last)
+        yield from rows
+        if len(rows) < PAGE_ROWS:
+            return
+        last = rows[-1]
+
+
+class ChangeFeedCursor:
+    """
+    Position of one reader in the change feed.
+
+    Args:
+        overlap_seconds: Re-read window before the watermark
+        start: Initial watermark (default: now)
+    """
+
+    def __init__(self, overlap_seconds: int = 120, start: Optional[datetime] = None):
+        self.overlap_seconds = overlap_seconds
+        self.watermark = start or datetime.now(timezone.utc)
+
+    def track(self, row: Dict[str, Any]):
+        if row.get("updated_at"):
+            self.watermark = max(self.watermark, parse_timestamp(row["updated_at"]))
+
+    def read(self, db, columns: Iterable[str]) -> Iterator[Dict[str, Any]]:
+        """Rows changed since the watermark (minus the overlap), oldest first; advances it."""
+        since = (self.watermark - timedelta(seconds=self.overlap_seconds)).isoformat()
+        select = ",".join(dict.fromkeys([*columns, "id", "updated_at"]))
+
+        def page(last):
+            query = db.table("events").select(select)
+            if last is None:
+                query = query.gte("updated_at", since)
+            else:
+                # Keyset on (updated_at, id): one bulk UPDATE stamps all its rows alike
+                stamp = last["updated_at"]
+                query = query.or_(f'updated_at.gt."{stamp}",and(updated_at.eq."{stamp}",id.gt.{last["id"]})')
+            return query.order("updated_at").order("id").limit(PAGE_ROWS).execute().data
+
+        for row in iter_pages(page):
+            self.track(row)
+            yield row
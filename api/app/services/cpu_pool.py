@@ -0,0 +1,56 @@
+"""
+CPU Pool
+
+Optional ProcessPoolExecutor for CPU-bound parse and match work (XML parsing,
+HTML stripping, keyword matching, JSON decoding), so parse-heavy runs use every
+core and never stall the event loop.
+
+CPU_POOL_WORKERS=0 (default) runs the work inline, as before.
+"""
+
+import asyncio
+import functools
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Optional
+from app.core.config import get_settings
+
+
+_executor: Optional[ProcessPoolExecutor] = None
+
+
+def get_cpu_pool() -> Optional[ProcessPoolExecutor]:
+    """Return the shared process pool, or None when disabled."""
+    global _executor
+    workers = get_settings().CPU_POOL_WORKERS
+
+    if workers <= 0:
+        return None
+
+    if _executor is None:
+        # spawn: forking a process that runs an event loop and scheduler threads is unsafe
+        _executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _executor
+
+
+async def run_cpu(fn: Callable[..., Any], *args: Any) -> Any:
+    """
+    Run a picklable module-level function in the process pool (or inline if disabled).
+    """
+    executor = get_cpu_pool()
+    if executor is None:
+        return fn(*args)
+
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, functools.partial(fn, *args))
+
+
+def shutdown_cpu_pool():
+    """Stop the pool's worker processes."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
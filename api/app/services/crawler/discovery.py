@@ -6,9 +6,15 @@ Event Discovery Crawler (RSS Version)
 변경: GPT가 날짜를 추출하므로 여기서는 기본값 할당하지 않음.
 """
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from app.services.crawler.base import BaseCrawler
-from datetime import datetime
+from app.services.crawler.parsing import (
+    FUTURE_KEYWORDS_KR, FUTURE_KEYWORDS_EN,
+    contains_future_keyword, is_past_tense, parse_discovery_feed
+)
+from app.services.crawler.fetch import SOURCE_GOOGLE_NEWS, fetch
+from app.services.cpu_pool import run_cpu
+import asyncio
 import httpx
 import xml.etree.ElementTree as ET
 from urllib.parse import quote
@@ -20,8 +26,8 @@ class EventDiscoveryCrawler(BaseCrawler):
     """
     
     # Keywords that indicate FUTURE events (not past)
-    FUTURE_KEYWORDS_KR = ["예정", "계획", "출시예정", "발표예정", "공개예정", "상반기", "하반기"]
-    FUTURE_KEYWORDS_EN = ["upcoming", "scheduled", "expected", "planned", "will launch", "to be released"]
+    FUTURE_KEYWORDS_KR = FUTURE_KEYWORDS_KR
+    FUTURE_KEYWORDS_EN = FUTURE_KEYWORDS_EN
     
     def __init__(self, ticker: str, headless: bool = True):
         super().__init__(headless)
@@ -45,22 +51,56 @@ class EventDiscoveryCrawler(BaseCrawler):
 
     def _contains_future_keyword(self, text: str) -> bool:
         """Check if text contains future-oriented keywords."""
-        text_lower = text.lower()
-        for kw in self.FUTURE_KEYWORDS_KR + self.FUTURE_KEYWORDS_EN:
-            if kw.lower() in text_lower:
-                return True
-        return False
+        return contains_future_keyword(text)
 
     def _is_past_tense(self, text: str) -> bool:
         """Check if text indicates past event (already happened)."""
-        past_indicators_kr = ["출시했", "발표했", "공개했", "선보였", "개최했", "열렸", "발매됐", "나왔"]
-        past_indicators_en = ["launched", "released", "announced", "unveiled", "revealed", "debuted"]
+        return is_past_tense(text)
+
+    async def fetch_feeds(self) -> List[Tuple[str, bytes]]:
+        """
+        Fetch the raw Korean and English RSS payloads concurrently.
+        
+        Returns:
+            List of (language, raw XML bytes) for feeds that answered 200
+        """
+        urls_to_fetch = [
+            (self.rss_url, "KR"),
+            (self.rss_url_en, "EN")
+        ]
+        
+        async def fetch_one(client: httpx.AsyncClient, rss_url: str, lang: str) -> Optional[Tuple[str, bytes]]:
+            try:
+                response = await fetch(client, SOURCE_GOOGLE_NEWS, rss_url)
+                
+                if response.status_code != 200:
+                    print(f"  Failed to fetch {lang} RSS: {response.status_code}")
+                    return None
+                
+                return (lang, response.content)
+            except Exception as e:
+                print(f"  Error fetching {lang} RSS: {e}")
+                return None
+        
+        async with httpx.AsyncClient() as client:
+            results = await asyncio.gather(*(fetch_one(client, url, lang) for url, lang in urls_to_fetch))
         
-        text_lower = text.lower()
-        for indicator in past_indicators_kr + past_indicators_en:
-            if indicator in text_lower:
-                return True
-        return False
+        return [r for r in results if r is not None]
+
+    async def parse_feed(self, content: bytes, lang: str) -> List[Dict[str, Any]]:
+        """
+        Parse one RSS payload into news items for GPT processing.
+        Skips obvious past events. Does NOT assign default dates.
+        Runs in the CPU pool when one is configured.
+        """
+        try:
+            parsed = await run_cpu(parse_discovery_feed, content, lang, self.ticker)
+        except ET.ParseError as e:
+            print(f"  Error parsing {lang} RSS: {e}")
+            return []
+        
+        print(f"  Found {parsed['found']} {lang} news items ({parsed['skipped_past']} skipped as past)")
+        return parsed["items"]
 
     async def run(self) -> List[Dict[str, Any]]:
         """
@@ -70,65 +110,8 @@ class EventDiscoveryCrawler(BaseCrawler):
         print(f"Fetching RSS for {self.ticker}...")
         discovered_events = []
         
-        # Fetch both Korean and English news
-        urls_to_fetch = [
-            (self.rss_url, "KR"),
-            (self.rss_url_en, "EN")
-        ]
-        
-        async with httpx.AsyncClient() as client:
-            for rss_url, lang in urls_to_fetch:
-                try:
-                    response = await client.get(rss_url, timeout=10.0)
-                    
-                    if response.status_code != 200:
-                        print(f"  Failed to fetch {lang} RSS: {response.status_code}")
-                        continue
-                    
-                    # Parse XML
-                    root = ET.fromstring(response.content)
-                    items = root.findall(".//item")
-                    
-                    print(f"  Found {len(items)} {lang} news items")
-                    
-                    # Process top 10 items per language
-                    for item in items[:10]:
-                        title = item.find("title").text if item.find("title") is not None else ""
-                        link = item.find("link").text if item.find("link") is not None else ""
-                        pub_date = item.find("pubDate").text if item.find("pubDate") is not None else ""
-                        description = item.find("description").text if item.find("description") is not None else ""
-                        
-                        if not title:
-                            continue
-                        
-                        # Clean title (remove source at the end, e.g. " - 뉴스1")
-                        if " - " in title:
-                            title = title.rsplit(" - ", 1)[0]
-                        
-                        # Pre-filter: Skip obvious past events
-                        if self._is_past_tense(title):
-                            print(f"    Skip (past): {title[:40]}...")
-                            continue
-                        
-                        # Preference for items with future keywords
-                        has_future_keyword = self._contains_future_keyword(title) or self._contains_future_keyword(description)
-                        
-                        # NO default date - GPT will extract or return null
-                        discovered_events.append({
-                            "type": "DISCOVERY",
-                            "ticker": self.ticker,
-                            "title": title,
-                            "description": description[:500] if description else "",  # Limit length
-                            "source_url": link,
-                            "crawled_at": datetime.now().isoformat(),
-                            "pub_date": pub_date,
-                            "target_date": None,  # GPT will extract
-                            "has_future_keyword": has_future_keyword,
-                            "language": lang
-                        })
-                        
-                except Exception as e:
-                    print(f"  Error fetching {lang} RSS: {e}")
+        for lang, content in await self.fetch_feeds():
+            discovered_events.extend(await self.parse_feed(content, lang))
         
         # Sort: prioritize items with future keywords
         discovered_events.sort(key=lambda x: (not x.get("has_future_keyword", False)))
@@ -0,0 +1,215 @@
+"""
+Shared Fetch Layer
+
+All upstream HTTP calls go through fetch(), which applies the source's
+resilience guard (see app/services/resilience.py):
+
+- 429/5xx and network errors are retried with backoff + jitter
+- other responses (200, 404, ...) are returned to the caller as before
+- an open breaker or spent run deadline raises SourceUnavailable without a request
+- requests to hedged sources get a second copy if the first is slower than the
+  observed p90, within the global hedge budget
+
+Sources:
+- google_news: discovery, Type A/B and Korean buzz RSS feeds
+- google_news_redirect: resolving news.google.com article links (separate breaker,
+  so slow resolution never trips the feed source)
+- reddit: Reddit JSON API
+- openai: GPT event extraction
+"""
+
+import asyncio
+from typing import Callable, Dict, Optional
+import httpx
+from app.core.config import get_settings
+from app.services.resilience import (
+    BREAKER_OPEN, CircuitBreaker, HedgeBudget, LatencyWindow, RetryPolicy,
+    SourceGuard, SourceUnavailable
+)
+
+
+SOURCE_GOOGLE_NEWS = "google_news"
+SOURCE_GOOGLE_NEWS_REDIRECT = "google_news_redirect"
+SOURCE_REDDIT = "reddit"
+SOURCE_OPENAI = "openai"
+
+# Per-attempt timeout per source (GPT completions are slower than feed fetches)
+SOURCE_TIMEOUTS = {
+    SOURCE_GOOGLE_NEWS: 8.0,
+    SOURCE_GOOGLE_NEWS_REDIRECT: 8.0,
+    SOURCE_REDDIT: 8.0,
+    SOURCE_OPENAI: 30.0,
+}
+
+# Idempotent feed reads with a long latency tail (GPT calls are never hedged)
+HEDGED_SOURCES = {SOURCE_GOOGLE_NEWS}
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+_guards: Dict[str, SourceGuard] = {}
+_latencies: Dict[str, LatencyWindow] = {}
+_hedge_budget: Optional[HedgeBudget] = None
+
+
+def get_source_guard(source: str) -> SourceGuard:
+    """Return the process-wide guard for a source (breaker state is shared by all callers)."""
+    guard = _guards.get(source)
+    if guard is None:
+        settings = get_settings()
+        guard = SourceGuard(
+            name=source,
+            retry=RetryPolicy(
+                max_attempts=settings.SOURCE_MAX_ATTEMPTS,
+                base_delay=settings.SOURCE_BACKOFF_BASE_SECONDS,
+                max_delay=settings.SOURCE_BACKOFF_MAX_SECONDS
+            ),
+            breaker=CircuitBreaker(
+                failure_threshold=settings.SOURCE_BREAKER_FAILURES,
+                reset_seconds=settings.SOURCE_BREAKER_RESET_SECONDS
+            ),
+            timeout=SOURCE_TIMEOUTS.get(source, 10.0),
+            run_deadline_seconds=settings.SOURCE_RUN_DEADLINE_SECONDS
+        )
+        _guards[source] = guard
+    return guard
+
+
+def begin_run(run_id: Optional[str]):
+    """Start per-run deadlines for every source (no-op while the same run continues)."""
+    for source in SOURCE_TIMEOUTS:
+        get_source_guard(source).begin_run(run_id)
+
+
+def get_hedge_budget() -> HedgeBudget:
+    """Return the process-wide hedge budget."""
+    global _hedge_budget
+    if _hedge_budget is None:
+        _hedge_budget = HedgeBudget(ratio=get_settings().HEDGE_BUDGET_RATIO)
+    return _hedge_budget
+
+
+def get_latency_window(source: str) -> LatencyWindow:
+    window = _latencies.get(source)
+    if window is None:
+        window = LatencyWindow(min_samples=get_settings().HEDGE_MIN_SAMPLES)
+        _latencies[source] = window
+    return window
+
+
+async def _send(
+    client: httpx.AsyncClient,
+    source: str,
+    method: str,
+    url: str,
+    timeout: float,
+    **kwargs
+) -> httpx.Response:
+    """
+    One attempt. For hedged sources, a second request is sent once the first has
+    been outstanding for the p90 latency; the first response wins and the other is cancelled.
+    """
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+
+    def request():
+        return asyncio.ensure_future(client.request(method, url, timeout=timeout, **kwargs))
+
+    hedge_after = None
+    if source in HEDGED_SOURCES:
+        get_hedge_budget().record_request()
+        hedge_after = get_latency_window(source).percentile(get_settings().HEDGE_PERCENTILE)
+
+    primary = request()
+    pending = {primary}
+    try:
+        if hedge_after is not None and hedge_after < timeout:
+            done, _ = await asyncio.wait(pending, timeout=hedge_after)
+            if not done and get_hedge_budget().try_spend():
+                pending.add(request())
+
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            winners = []
+            for task in done:
+                if task.exception() is None:
+                    winners.append(task.result())
+                else:
+                    error = task.exception()
+            if winners:
+                response = winners[0]
+                if response.status_code == 200:
+                    get_latency_window(source).record(loop.time() - started)
+                return response
+        raise error
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+
+def _retry_after(response: httpx.Response) -> Optional[float]:
+    try:
+        return float(response.headers["retry-after"])
+    except (KeyError, ValueError):
+        return None
+
+
+async def fetch(
+    client: httpx.AsyncClient,
+    source: str,
+    url: str,
+    method: str = "GET",
+    observe: Optional[Callable[[httpx.Response], None]] = None,
+    **kwargs
+) -> httpx.Response:
+    """
+    Send a request to `source` through its resilience guard.
+    `observe` is called with every response, including retried 429/5xx ones.
+
+    Returns:
+        The response (the last one if retries of a 429/5xx were exhausted)
+
+    Raises:
+        SourceUnavailable: Breaker open or run deadline spent
+        httpx.TransportError: Network errors after retries
+    """
+    guard = get_source_guard(source)
+    trial = guard.check()
+    attempt = 0
+
+    while True:
+        attempt += 1
+        started = guard.clock()
+        try:
+            response = await _send(client, source, method, url, guard.attempt_timeout(), **kwargs)
+        except httpx.TransportError as e:
+            trial = False
+            guard.record_failure(guard.clock() - started)
+            if guard.breaker.state == BREAKER_OPEN:
+                raise SourceUnavailable(source, f"circuit opened ({type(e).__name__})") from e
+            if not await guard.sleep_before_retry(attempt):
+                raise
+            continue
+        except BaseException:
+            # Cancelled (hedge loser, stage timeout) or not the source's fault: no verdict,
+            # but a half-open trial must not stay in flight and keep the breaker open for good
+            if trial:
+                guard.breaker.release_trial()
+            raise
+        trial = False
+
+        if observe is not None:
+            observe(response)
+
+        if response.status_code in RETRY_STATUSES:
+            guard.record_failure(guard.clock() - started)
+            if guard.breaker.state == BREAKER_OPEN:
+                return response
+            if not await guard.sleep_before_retry(attempt, _retry_after(response)):
+                return response
+            continue
+
+        guard.record_success()
+        return response
@@ -0,0 +1,228 @@
+"""
+Crawler Parsing
+
+Pure, CPU-bound parse and match functions shared by the crawlers:
+raw bytes in, compact records out.
+
+Everything here is a module-level function with picklable arguments so it can run
+either inline or in the process pool (see app/services/cpu_pool.py).
+"""
+
+import html
+import json
+import re
+import xml.etree.ElementTree as ET
+from datetime import datetime, timedelta
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+
+# Keywords that indicate FUTURE events (not past)
+FUTURE_KEYWORDS_KR = ["예정", "계획", "출시예정", "발표예정", "공개예정", "상반기", "하반기"]
+FUTURE_KEYWORDS_EN = ["upcoming", "scheduled", "expected", "planned", "will launch", "to be released"]
+
+# Keywords that indicate the event already happened
+PAST_INDICATORS_KR = ["출시했", "발표했", "공개했", "선보였", "개최했", "열렸", "발매됐", "나왔"]
+PAST_INDICATORS_EN = ["launched", "released", "announced", "unveiled", "revealed", "debuted"]
+
+_FUTURE_KEYWORDS = [kw.lower() for kw in FUTURE_KEYWORDS_KR + FUTURE_KEYWORDS_EN]
+_PAST_INDICATORS = PAST_INDICATORS_KR + PAST_INDICATORS_EN
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_SPACE_RE = re.compile(r"\s+")
+_NON_WORD_RE = re.compile(r"[^\w]+")
+
+# Query parameters that only track the click, not identify the article
+_TRACKING_PARAMS = {"oc", "hl", "gl", "ceid", "fbclid", "gclid", "ref", "cmpid"}
+
+
+def strip_html(text: Optional[str]) -> str:
+    """Strip tags/entities from an RSS description (Google News wraps it in <a>/<font>)."""
+    if not text:
+        return ""
+    return _SPACE_RE.sub(" ", html.unescape(_TAG_RE.sub(" ", text))).strip()
+
+
+def contains_future_keyword(text: str) -> bool:
+    """Check if text contains future-oriented keywords."""
+    text_lower = text.lower()
+    return any(kw in text_lower for kw in _FUTURE_KEYWORDS)
+
+
+def is_past_tense(text: str) -> bool:
+    """Check if text indicates past event (already happened)."""
+    text_lower = text.lower()
+    return any(indicator in text_lower for indicator in _PAST_INDICATORS)
+
+
+def canonical_url(url: str) -> str:
+    """
+    Canonical form of an article URL: lowercase scheme/host without "www.", no fragment,
+    no tracking parameters (utm_*, oc, ...), sorted query, no trailing slash.
+    """
+    if not url:
+        return ""
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in _TRACKING_PARAMS and not key.lower().startswith("utm_")
+    )
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit((parts.scheme.lower(), host, path, urlencode(query), ""))
+
+
+def normalize_title(title: str) -> str:
+    """Lowercase title with punctuation and whitespace collapsed (for fingerprints)."""
+    return _NON_WORD_RE.sub(" ", title.lower()).strip()
+
+
+def split_title_source(title: str) -> Tuple[str, str]:
+    """Clean title (remove source at the end, e.g. " - 뉴스1"). Returns (title, source)."""
+    if " - " in title:
+        title, source = title.rsplit(" - ", 1)
+        return title, source
+    return title, ""
+
+
+def parse_pub_date(pub_date_str: str) -> Optional[datetime]:
+    """
+    Parse RSS pubDate format (e.g., "Mon, 02 Dec 2024 10:30:00 GMT")
+    Returns datetime object or None if parsing fails.
+    """
+    try:
+        # RFC 2822 format commonly used in RSS
+        return parsedate_to_datetime(pub_date_str)
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_rss_items(content: bytes, limit: Optional[int] = None) -> List[Dict[str, str]]:
+    """
+    Parse an RSS payload into items.
+
+    Returns:
+        List of dicts with title (source removed), source, link, pub_date, description (plain text)
+    """
+    items = ET.fromstring(content).findall(".//item")
+    return _extract_items(items[:limit] if limit is not None else items)
+
+
+def _extract_items(items: List[ET.Element]) -> List[Dict[str, str]]:
+    results = []
+    for item in items:
+        title = item.findtext("title") or ""
+        title, source = split_title_source(title)
+        results.append({
+            "title": title,
+            "source": source,
+            "link": item.findtext("link") or "",
+            "pub_date": item.findtext("pubDate") or "",
+            "description": strip_html(item.findtext("description"))
+        })
+    return results
+
+
+def parse_discovery_feed(content: bytes, lang: str, ticker: str, limit: int = 10) -> Dict[str, Any]:
+    """
+    Parse a discovery RSS payload into news items for GPT processing.
+    Skips obvious past events. Does NOT assign default dates.
+
+    Returns:
+        Dict with items, found (items in the feed) and skipped_past
+    """
+    feed_items = ET.fromstring(content).findall(".//item")
+
+    items = []
+    skipped_past = 0
+    crawled_at = datetime.now().isoformat()
+
+    for item in _extract_items(feed_items[:limit]):
+        title = item["title"]
+        if not title:
+            continue
+
+        # Pre-filter: Skip obvious past events
+        if is_past_tense(title):
+            skipped_past += 1
+            continue
+
+        description = item["description"]
+        items.append({
+            "type": "DISCOVERY",
+            "ticker": ticker,
+            "title": title,
+            "source": item["source"],
+            "description": description[:500],  # Limit length
+            "source_url": item["link"],
+            "crawled_at": crawled_at,
+            "pub_date": item["pub_date"],
+            "target_date": None,  # GPT will extract
+            # Preference for items with future keywords
+            "has_future_keyword": contains_future_keyword(title) or contains_future_keyword(description),
+            "language": lang
+        })
+
+    return {"items": items, "found": len(feed_items), "skipped_past": skipped_past}
+
+
+def count_recent_items(content: bytes, days: int = 7, keep: int = 20) -> Tuple[int, List[Dict[str, str]]]:
+    """
+    Count RSS items published within the last `days` (hype proxy).
+    Items with an unparseable date are counted as recent (conservative).
+
+    Returns:
+        (recent count, up to `keep` recent items)
+    """
+    cutoff = datetime.now() - timedelta(days=days)
+    recent_count = 0
+    recent_items = []
+
+    for item in parse_rss_items(content):
+        pub_date = parse_pub_date(item["pub_date"])
+        # Make pub_date timezone-naive for comparison
+        is_recent = pub_date.replace(tzinfo=None) >= cutoff if pub_date else True
+
+        if is_recent:
+            recent_count += 1
+            if len(recent_items) < keep:
+                recent_items.append({
+                    "title": item["title"] or "No Title",
+                    "link": item["link"],
+                    "date_text": item["pub_date"]
+                })
+
+    return recent_count, recent_items
+
+
+def parse_reddit_listing(content: bytes, subreddit: str, days: int = 7) -> List[Dict[str, Any]]:
+    """
+    Decode a Reddit search/listing JSON payload into compact post records,
+    keeping only posts from the last `days`.
+    """
+    data = json.loads(content)
+    cutoff = datetime.now() - timedelta(days=days)
+    posts = []
+
+    for child in data.get("data", {}).get("children", []):
+        post_data = child.get("data", {})
+
+        # Filter for recent posts
+        post_date = datetime.fromtimestamp(post_data.get("created_utc", 0))
+        if post_date < cutoff:
+            continue
+
+        posts.append({
+            "subreddit": subreddit,
+            "title": post_data.get("title", ""),
+            "score": post_data.get("score", 0),
+            "num_comments": post_data.get("num_comments", 0),
+            "url": f"https://reddit.com{post_data.get('permalink', '')}",
+            "created_at": post_date.isoformat(),
+            "upvote_ratio": post_data.get("upvote_ratio", 0)
+        })
+
+    return posts
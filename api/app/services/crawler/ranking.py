@@ -0,0 +1,204 @@
+"""
+Discovery Candidate Ranking
+
+Local relevance ranker that decides which headlines of a ticker reach GPT.
+Each headline gets an expected-yield score from cheap signals:
+
+- future keywords: "예정", "upcoming", ... (GPT only keeps future events)
+- date expression: year + month/quarter/half resolves to a date; GPT rejects undated news
+- source reputation: wire services and major business papers first
+- recency: newer articles (pubDate), half-life of a few days
+- cluster size: the same story reported by several feeds/outlets
+- ticker position: company name early in the title = the story is about it
+
+Past-tense headlines never get here: parse_discovery_feed already drops them.
+
+Near-duplicate headlines are clustered and only the best one per cluster is kept,
+so GPT is never asked about the same story twice.
+
+Pure functions with picklable arguments, so ranking can run in the CPU pool.
+"""
+
+import math
+import re
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence, Set
+from app.services.crawler.parsing import FUTURE_KEYWORDS_KR, FUTURE_KEYWORDS_EN, parse_pub_date
+
+
+# Signal weights (score = weighted sum of 0-1 signals)
+WEIGHTS = {
+    "future": 2.0,
+    "date": 3.0,
+    "source": 1.0,
+    "recency": 1.0,
+    "cluster": 1.0,
+    "ticker": 1.5,
+}
+
+# Source reputation (0-1); unknown sources get DEFAULT_REPUTATION
+SOURCE_REPUTATION = {
+    "연합뉴스": 1.0, "연합인포맥스": 0.9, "한국경제": 0.9, "매일경제": 0.9, "서울경제": 0.85,
+    "조선비즈": 0.85, "머니투데이": 0.8, "이데일리": 0.8, "전자신문": 0.8, "디지털타임스": 0.8,
+    "뉴스1": 0.75, "뉴시스": 0.75, "zdnet korea": 0.75, "아시아경제": 0.7, "파이낸셜뉴스": 0.7,
+    "reuters": 1.0, "bloomberg": 1.0, "the wall street journal": 1.0, "wsj": 1.0,
+    "financial times": 1.0, "cnbc": 0.9, "associated press": 0.9, "techcrunch": 0.8,
+    "the verge": 0.8, "barron's": 0.8, "marketwatch": 0.75, "yahoo finance": 0.65,
+    "investing.com": 0.5, "seeking alpha": 0.45, "the motley fool": 0.35, "benzinga": 0.4,
+}
+DEFAULT_REPUTATION = 0.5
+
+# Recency half-life in days
+RECENCY_HALF_LIFE_DAYS = 3.0
+
+# Token Jaccard similarity at which two headlines are the same story
+CLUSTER_SIMILARITY = 0.5
+
+_YEAR_RE = re.compile(r"20\d{2}")
+_PERIOD_RE = re.compile(
+    r"\d{1,2}월|[1-4]분기|\bQ[1-4]\b|\b[1-4]Q\b|\bH[12]\b|상반기|하반기|연말|연초|봄|여름|가을|겨울|"
+    r"\b(jan(uary)?|feb(ruary)?|mar(ch)?|apr(il)?|may|june?|july?|aug(ust)?|sep(t(ember)?)?|"
+    r"oct(ober)?|nov(ember)?|dec(ember)?|spring|summer|fall|autumn|winter|first half|second half)\b",
+    re.IGNORECASE
+)
+_TOKEN_RE = re.compile(r"\w{2,}")
+
+_FUTURE_KEYWORDS = [kw.lower() for kw in FUTURE_KEYWORDS_KR + FUTURE_KEYWORDS_EN]
+
+
+def future_keyword_score(text: str) -> float:
+    """Distinct future keywords found (2+ = 1.0)."""
+    text_lower = text.lower()
+    hits = sum(1 for kw in _FUTURE_KEYWORDS if kw in text_lower)
+    return min(hits / 2, 1.0)
+
+
+def date_expression_score(text: str) -> float:
+    """
+    How resolvable the text's date expression is:
+    1.0 year + month/quarter/half/season, 0.7 period without year, 0.4 year only, 0 none.
+    """
+    has_period = bool(_PERIOD_RE.search(text))
+    has_year = bool(_YEAR_RE.search(text))
+    if has_period and has_year:
+        return 1.0
+    if has_period:
+        return 0.7
+    if has_year:
+        return 0.4
+    return 0.0
+
+
+def source_reputation(source: str) -> float:
+    source_lower = (source or "").lower()
+    if not source_lower:
+        return DEFAULT_REPUTATION
+    for name, score in SOURCE_REPUTATION.items():
+        if name in source_lower:
+            return score
+    return DEFAULT_REPUTATION
+
+
+def recency_score(pub_date: str, now: datetime) -> float:
+    """Exponential decay by article age; unknown dates score 0.5."""
+    published = parse_pub_date(pub_date) if pub_date else None
+    if published is None:
+        return 0.5
+    if published.tzinfo is None:
+        published = published.replace(tzinfo=timezone.utc)
+    age_days = max((now - published).total_seconds() / 86400, 0.0)
+    return math.pow(0.5, age_days / RECENCY_HALF_LIFE_DAYS)
+
+
+def ticker_position_score(title: str, names: Sequence[str]) -> float:
+    """1.0 if a ticker name opens the title, down to 0.5 at its end, 0 if absent."""
+    title_lower = title.lower()
+    positions = []
+    for name in names:
+        if not name:
+            continue
+        name_lower = name.lower()
+        if name.isascii() and len(name) <= 4:
+            # Short ASCII tickers ("V", "HD") must match as whole words
+            match = re.search(rf"\b{re.escape(name_lower)}\b", title_lower)
+            index = match.start() if match else -1
+        else:
+            index = title_lower.find(name_lower)
+        if index >= 0:
+            positions.append(index)
+    if not positions:
+        return 0.0
+    return 1.0 - 0.5 * min(positions) / max(len(title), 1)
+
+
+def _tokens(title: str) -> Set[str]:
+    return set(_TOKEN_RE.findall(title.lower()))
+
+
+def cluster_headlines(items: List[Dict[str, Any]]) -> List[List[int]]:
+    """Greedy single-pass clustering of near-duplicate headlines (token Jaccard)."""
+    clusters: List[List[int]] = []
+    cluster_tokens: List[Set[str]] = []
+
+    for index, item in enumerate(items):
+        tokens = _tokens(item.get("title", ""))
+        for members, seed in zip(clusters, cluster_tokens):
+            union = tokens | seed
+            if union and len(tokens & seed) / len(union) >= CLUSTER_SIMILARITY:
+                members.append(index)
+                break
+        else:
+            clusters.append([index])
+            cluster_tokens.append(tokens)
+    return clusters
+
+
+def relevance_score(
+    item: Dict[str, Any],
+    names: Sequence[str],
+    cluster_size: int = 1,
+    now: Optional[datetime] = None
+) -> float:
+    """Expected-yield score of one headline."""
+    now = now or datetime.now(timezone.utc)
+    title = item.get("title", "")
+    text = f"{title} {item.get('description', '')}"
+
+    signals = {
+        "future": future_keyword_score(text),
+        # A date in the title is what GPT extracts most reliably
+        "date": max(date_expression_score(title), 0.6 * date_expression_score(text)),
+        "source": source_reputation(item.get("source", "")),
+        "recency": recency_score(item.get("pub_date", ""), now),
+        "cluster": min((cluster_size - 1) / 3, 1.0),
+        "ticker": ticker_position_score(title, names),
+    }
+    return sum(WEIGHTS[key] * value for key, value in signals.items())
+
+
+def rank_candidates(
+    items: List[Dict[str, Any]],
+    names: Sequence[str],
+    min_title_length: int = 10
+) -> List[Dict[str, Any]]:
+    """
+    Rank a ticker's discovery items by expected GPT yield.
+
+    Returns:
+        One item per story cluster, best first, each annotated with
+        `relevance` and `cluster_size`
+    """
+    eligible = [item for item in items if len(item.get("title") or "") >= min_title_length]
+    now = datetime.now(timezone.utc)
+
+    ranked = []
+    for members in cluster_headlines(eligible):
+        scored = [
+            (relevance_score(eligible[i], names, len(members), now), eligible[i])
+            for i in members
+        ]
+        score, best = max(scored, key=lambda pair: pair[0])
+        ranked.append({**best, "relevance": round(score, 3), "cluster_size": len(members)})
+
+    ranked.sort(key=lambda item: item["relevance"], reverse=True)
+    return ranked
@@ -5,10 +5,14 @@ Fetches posts from Reddit subreddits using the public JSON API.
 No authentication required for public subreddits.
 """
 
-from typing import List, Dict, Any
-from datetime import datetime, timedelta
+from typing import List, Dict, Any, Optional
+from datetime import datetime
 import httpx
 from urllib.parse import quote
+from app.services.crawler.parsing import parse_reddit_listing, parse_rss_items
+from app.services.crawler.fetch import SOURCE_GOOGLE_NEWS, SOURCE_REDDIT, fetch
+from app.services.cpu_pool import run_cpu
+from app.services.resilience import SourceUnavailable
 
 
 class RedditCrawler:
@@ -36,11 +40,15 @@ class RedditCrawler:
         Search Reddit for posts mentioning the keyword.
         
         Returns:
-            Dict with post_count, total_score, total_comments, and posts list
+            Dict with post_count, total_score, total_comments, errors, and posts list
+        
+        Raises:
+            SourceUnavailable: Reddit's circuit is open or its run deadline is spent
         """
         all_posts = []
         total_score = 0
         total_comments = 0
+        errors = 0
         
         async with httpx.AsyncClient() as client:
             for subreddit in self.SUBREDDITS:
@@ -52,8 +60,11 @@ class RedditCrawler:
                         total_score += post.get("score", 0)
                         total_comments += post.get("num_comments", 0)
                         
+                except SourceUnavailable:
+                    raise
                 except Exception as e:
                     print(f"Error fetching from r/{subreddit}: {e}")
+                    errors += 1
                     continue
         
         return {
@@ -63,6 +74,7 @@ class RedditCrawler:
             "total_score": total_score,
             "total_comments": total_comments,
             "engagement": total_score + total_comments,  # Combined engagement metric
+            "errors": errors,  # Subreddits that could not be fetched
             "posts": all_posts[:20],  # Limit to top 20 posts
             "crawled_at": datetime.now().isoformat()
         }
@@ -87,46 +99,25 @@ class RedditCrawler:
             "limit": 25
         }
         
-        response = await client.get(
+        response = await fetch(
+            client,
+            SOURCE_REDDIT,
             url,
             params=params,
-            headers={"User-Agent": self.user_agent},
-            timeout=15.0
+            headers={"User-Agent": self.user_agent}
         )
         
         if response.status_code != 200:
-            print(f"Reddit API returned {response.status_code} for r/{subreddit}")
-            return []
-        
-        data = response.json()
-        posts = []
-        
-        # Parse Reddit's response structure
-        children = data.get("data", {}).get("children", [])
-        
-        one_week_ago = datetime.now() - timedelta(days=7)
-        
-        for child in children:
-            post_data = child.get("data", {})
-            
-            # Filter for recent posts
-            created_utc = post_data.get("created_utc", 0)
-            post_date = datetime.fromtimestamp(created_utc)
-            
-            if post_date < one_week_ago:
-                continue
-            
-            posts.append({
-                "subreddit": subreddit,
-                "title": post_data.get("title", ""),
-                "score": post_data.get("score", 0),
-                "num_comments": post_data.get("num_comments", 0),
-                "url": f"https://reddit.com{post_data.get('permalink', '')}",
-                "created_at": post_date.isoformat(),
-                "upvote_ratio": post_data.get("upvote_ratio", 0)
-            })
+            # Retries exhausted (429/5xx) or refused: the subreddit is unavailable, not quiet,
+            # so run() counts it in errors instead of scoring it as zero buzz
+            raise httpx.HTTPStatusError(
+                f"Reddit API returned {response.status_code} for r/{subreddit}",
+                request=response.request,
+                response=response
+            )
         
-        return posts
+        # Decode and filter recent posts (CPU pool when configured)
+        return await run_cpu(parse_reddit_listing, response.content, subreddit)
     
     async def get_subreddit_hot(self, subreddit: str = "stocks", limit: int = 50) -> List[Dict[str, Any]]:
         """
@@ -142,11 +133,12 @@ class RedditCrawler:
         url = f"https://www.reddit.com/r/{subreddit}/hot.json"
         
         async with httpx.AsyncClient() as client:
-            response = await client.get(
+            response = await fetch(
+                client,
+                SOURCE_REDDIT,
                 url,
                 params={"limit": limit},
-                headers={"User-Agent": self.user_agent},
-                timeout=15.0
+                headers={"User-Agent": self.user_agent}
             )
             
             if response.status_code != 200:
@@ -183,42 +175,29 @@ class NaverDiscussionCrawler:
         """
         Fetch Korean news/discussion data for the keyword.
         """
-        import xml.etree.ElementTree as ET
-        
         post_count = 0
         posts = []
         
         try:
             async with httpx.AsyncClient() as client:
-                response = await client.get(self.rss_url, timeout=15.0)
+                response = await fetch(client, SOURCE_GOOGLE_NEWS, self.rss_url)
                 
                 if response.status_code != 200:
-                    return self._empty_result()
-                
-                root = ET.fromstring(response.content)
-                items = root.findall(".//item")
+                    return self._empty_result(error=f"HTTP {response.status_code}")
                 
-                one_week_ago = datetime.now() - timedelta(days=7)
+                items = await run_cpu(parse_rss_items, response.content, 30)
                 
-                for item in items[:30]:
-                    title = item.find("title").text if item.find("title") is not None else ""
-                    link = item.find("link").text if item.find("link") is not None else ""
-                    pub_date = item.find("pubDate").text if item.find("pubDate") is not None else ""
-                    
-                    # Clean title
-                    if " - " in title:
-                        title = title.rsplit(" - ", 1)[0]
-                    
+                for item in items:
                     posts.append({
-                        "title": title,
-                        "url": link,
-                        "pub_date": pub_date
+                        "title": item["title"],
+                        "url": item["link"],
+                        "pub_date": item["pub_date"]
                     })
                     post_count += 1
                     
         except Exception as e:
             print(f"Error fetching Naver data for {self.keyword}: {e}")
-            return self._empty_result()
+            return self._empty_result(error=str(e))
         
         return {
             "source": "Naver/Korean News",
@@ -228,12 +207,15 @@ class NaverDiscussionCrawler:
             "crawled_at": datetime.now().isoformat()
         }
     
-    def _empty_result(self) -> Dict[str, Any]:
-        return {
+    def _empty_result(self, error: Optional[str] = None) -> Dict[str, Any]:
+        result = {
             "source": "Naver/Korean News",
             "keyword": self.keyword,
             "post_count": 0,
             "posts": [],
             "crawled_at": datetime.now().isoformat()
         }
+        if error:
+            result["error"] = error
+        return result
 
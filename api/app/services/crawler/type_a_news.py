@@ -2,8 +2,10 @@ from typing import List, Dict, Any, Optional
 from app.services.crawler.base import BaseCrawler
 from datetime import datetime
 import httpx
-import xml.etree.ElementTree as ET
 from urllib.parse import quote
+from app.services.crawler.parsing import parse_rss_items
+from app.services.crawler.fetch import SOURCE_GOOGLE_NEWS, fetch
+from app.services.cpu_pool import run_cpu
 
 class TypeANewsCrawler(BaseCrawler):
     """
@@ -30,38 +32,26 @@ class TypeANewsCrawler(BaseCrawler):
         
         try:
             async with httpx.AsyncClient() as client:
-                response = await client.get(self.rss_url, timeout=15.0)
+                response = await fetch(client, SOURCE_GOOGLE_NEWS, self.rss_url)
                 
                 if response.status_code != 200:
                     print(f"Failed to fetch RSS for {self.keyword}: {response.status_code}")
                     return []
                 
-                # Parse XML
-                root = ET.fromstring(response.content)
-                items = root.findall(".//item")
+                # Parse XML (CPU pool when configured)
+                items = await run_cpu(parse_rss_items, response.content, 20)  # Limit to top 20 items
+                crawled_at = datetime.now().isoformat()
                 
-                for item in items[:20]:  # Limit to top 20 items
-                    title = item.find("title").text if item.find("title") is not None else "No Title"
-                    link = item.find("link").text if item.find("link") is not None else ""
-                    pub_date = item.find("pubDate").text if item.find("pubDate") is not None else ""
-                    description = item.find("description").text if item.find("description") is not None else ""
-                    
-                    # Clean title (remove source at the end, e.g. " - 뉴스1")
-                    source = ""
-                    if " - " in title:
-                        parts = title.rsplit(" - ", 1)
-                        title = parts[0]
-                        source = parts[1] if len(parts) > 1 else ""
-                    
+                for item in items:
                     results.append({
                         "type": "TYPE_A",
-                        "source": source or "Google News",
+                        "source": item["source"] or "Google News",
                         "keyword": self.keyword,
-                        "title": title,
-                        "link": link,
-                        "summary": description,
-                        "pub_date": pub_date,
-                        "crawled_at": datetime.now().isoformat()
+                        "title": item["title"] or "No Title",
+                        "link": item["link"],
+                        "summary": item["description"],
+                        "pub_date": item["pub_date"],
+                        "crawled_at": crawled_at
                     })
                     
         except Exception as e:
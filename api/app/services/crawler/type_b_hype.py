@@ -1,8 +1,10 @@
 from typing import List, Dict, Any, Optional
-from datetime import datetime, timedelta
+from datetime import datetime
 import httpx
-import xml.etree.ElementTree as ET
 from urllib.parse import quote
+from app.services.crawler.parsing import count_recent_items, parse_pub_date
+from app.services.crawler.fetch import SOURCE_GOOGLE_NEWS, fetch
+from app.services.cpu_pool import run_cpu
 
 class TypeBHypeCrawler:
     """
@@ -25,12 +27,7 @@ class TypeBHypeCrawler:
         Parse RSS pubDate format (e.g., "Mon, 02 Dec 2024 10:30:00 GMT")
         Returns datetime object or None if parsing fails.
         """
-        try:
-            # RFC 2822 format commonly used in RSS
-            from email.utils import parsedate_to_datetime
-            return parsedate_to_datetime(pub_date_str)
-        except:
-            return None
+        return parse_pub_date(pub_date_str)
 
     async def run(self) -> List[Dict[str, Any]]:
         """
@@ -38,13 +35,9 @@ class TypeBHypeCrawler:
         """
         print(f"Fetching hype data for keyword: {self.keyword}...")
         
-        recent_post_count = 0
-        crawled_data = []
-        one_week_ago = datetime.now(tz=None) - timedelta(days=7)
-        
         try:
             async with httpx.AsyncClient() as client:
-                response = await client.get(self.rss_url, timeout=15.0)
+                response = await fetch(client, SOURCE_GOOGLE_NEWS, self.rss_url)
                 
                 if response.status_code != 200:
                     print(f"Failed to fetch RSS for {self.keyword}: {response.status_code}")
@@ -58,39 +51,9 @@ class TypeBHypeCrawler:
                         "error": f"HTTP {response.status_code}"
                     }]
                 
-                # Parse XML
-                root = ET.fromstring(response.content)
-                items = root.findall(".//item")
-                
-                for item in items:
-                    title = item.find("title").text if item.find("title") is not None else "No Title"
-                    link = item.find("link").text if item.find("link") is not None else ""
-                    pub_date_str = item.find("pubDate").text if item.find("pubDate") is not None else ""
-                    
-                    # Clean title (remove source at the end, e.g. " - 뉴스1")
-                    if " - " in title:
-                        title = title.rsplit(" - ", 1)[0]
-                    
-                    # Parse publication date and check if recent
-                    pub_date = self.parse_pub_date(pub_date_str)
-                    is_recent = False
-                    
-                    if pub_date:
-                        # Make pub_date timezone-naive for comparison
-                        pub_date_naive = pub_date.replace(tzinfo=None)
-                        is_recent = pub_date_naive >= one_week_ago
-                    else:
-                        # If we can't parse date, assume it's recent (conservative)
-                        is_recent = True
-                    
-                    if is_recent:
-                        recent_post_count += 1
-                        crawled_data.append({
-                            "title": title,
-                            "link": link,
-                            "date_text": pub_date_str
-                        })
-                        
+                # Parse XML and count recent items (CPU pool when configured)
+                recent_post_count, crawled_data = await run_cpu(count_recent_items, response.content)
+
         except Exception as e:
             print(f"Error fetching RSS for {self.keyword}: {e}")
             return [{
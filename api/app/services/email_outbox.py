@@ -0,0 +1,407 @@
+"""
+Email Outbox
+
+Durable queue between request handlers and the email provider, so an API request
+never waits on Resend:
+
+- Writers (alerts endpoint, ...) append messages and return; a unique dedupe_key
+  drops repeats (e.g. one welcome email per user)
+- EmailDeliveryWorker (scheduler job, every EMAIL_OUTBOX_POLL_SECONDS) claims due
+  messages with a lease, sends them EMAIL_BATCH_SIZE at a time (one Resend batch
+  call each) at most EMAIL_RATE_PER_SECOND calls per second, and records the outcome
+- Failures: 429/5xx/network errors are retried with exponential backoff (honouring
+  Retry-After) up to EMAIL_MAX_ATTEMPTS; a message the provider rejects fails at
+  once without holding back the rest of its batch
+- A batch is sent with an idempotency key derived from its message ids, so a batch
+  resent after a lost response is not delivered twice
+
+Outboxes:
+- DatabaseEmailOutbox: email_outbox table (migration_015)
+- InMemoryEmailOutbox: EMAIL_OUTBOX=memory; queued mail is lost on restart and delivery
+  must run in the same process (RUN_SCHEDULER_IN_API)
+
+Providers:
+- ResendProvider: Resend batch API; RESEND_API_URL can point at the local stand-in
+  server (python scripts/resend_standin.py)
+- LocalEmailProvider: records messages in memory instead of sending them
+"""
+
+import hashlib
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import resend
+from app.core.config import get_settings
+from app.services.resilience import RateLimiter, RetryPolicy
+
+
+STATUS_QUEUED = "QUEUED"
+STATUS_SENDING = "SENDING"
+STATUS_SENT = "SENT"
+STATUS_FAILED = "FAILED"
+
+# Message fields a writer provides
+MESSAGE_FIELDS = ("kind", "dedupe_key", "sender", "recipients", "subject", "html")
+
+# Provider errors that will not succeed on retry (malformed request or message)
+NON_RETRYABLE_CODES = (400, 413, 422)
+
+
+class EmailOutbox(ABC):
+    """
+    Abstract email outbox.
+
+    Messages are dicts with: id, kind, dedupe_key, sender, recipients, subject, html,
+    status, attempts, provider_id, error.
+    """
+
+    def __init__(self, max_attempts: int = 5):
+        self.max_attempts = max_attempts
+
+    @abstractmethod
+    def enqueue(self, messages: List[Dict[str, Any]], db=None) -> int:
+        """
+        Append messages (sync, for request handlers; `db` is the request's client).
+        Messages whose dedupe_key is already queued or sent are dropped. Returns the number added.
+        """
+        pass
+
+    @abstractmethod
+    async def claim(self, owner: str, limit: int, lease_seconds: int) -> List[Dict[str, Any]]:
+        """Claim up to `limit` due (or lease-expired) messages, oldest first."""
+        pass
+
+    @abstractmethod
+    async def complete(self, messages: List[Dict[str, Any]], owner: str, provider_ids: List[str]) -> None:
+        """Mark claimed messages SENT with the provider's ids."""
+        pass
+
+    @abstractmethod
+    async def fail(self, message: Dict[str, Any], owner: str, error: str, retry_in: Optional[float] = None) -> None:
+        """Requeue a claimed message after `retry_in` seconds, or mark it FAILED (None)."""
+        pass
+
+
+class DatabaseEmailOutbox(EmailOutbox):
+    """
+    Outbox backed by the email_outbox table.
+    Claims use FOR UPDATE SKIP LOCKED, so several workers never send the same message.
+    """
+
+    def __init__(self, repository, max_attempts: int = 5):
+        super().__init__(max_attempts)
+        self.repository = repository
+
+    def enqueue(self, messages: List[Dict[str, Any]], db=None) -> int:
+        if not messages:
+            return 0
+        if db is None:
+            from app.db.session import get_db
+            db = get_db()
+        rows = [{key: message.get(key) for key in MESSAGE_FIELDS} for message in messages]
+        response = db.table("email_outbox")\
+            .upsert(rows, on_conflict="dedupe_key", ignore_duplicates=True)\
+            .execute()
+        return len(response.data or [])
+
+    async def claim(self, owner: str, limit: int, lease_seconds: int) -> List[Dict[str, Any]]:
+        return await self.repository.claim_email_outbox(owner, limit, lease_seconds, self.max_attempts)
+
+    async def complete(self, messages: List[Dict[str, Any]], owner: str, provider_ids: List[str]) -> None:
+        if messages:
+            await self.repository.complete_email_outbox([m["id"] for m in messages], provider_ids, owner)
+
+    async def fail(self, message: Dict[str, Any], owner: str, error: str, retry_in: Optional[float] = None) -> None:
+        status = STATUS_QUEUED if retry_in is not None else STATUS_FAILED
+        await self.repository.release_email_outbox(message["id"], owner, status, error[:500], retry_in or 0)
+
+
+class InMemoryEmailOutbox(EmailOutbox):
+    """
+    In-process outbox with the same semantics as the email_outbox table.
+    Thread-safe: request handlers enqueue from the threadpool.
+
+    Args:
+        clock: Time source in seconds (injectable so tests can fast-forward backoff and leases)
+    """
+
+    def __init__(self, max_attempts: int = 5, clock: Callable[[], float] = time.monotonic):
+        super().__init__(max_attempts)
+        self.clock = clock
+        self._messages: Dict[int, Dict[str, Any]] = {}
+        self._dedupe_keys: Dict[str, int] = {}
+        self._next_id = 1
+        self._lock = threading.Lock()
+
+    def enqueue(self, messages: List[Dict[str, Any]], db=None) -> int:
+        added = 0
+        with self._lock:
+            for message in messages:
+                key = message.get("dedupe_key")
+                if key is not None and key in self._dedupe_keys:
+                    continue
+                message_id = self._next_id
+                self._next_id += 1
+                if key is not None:
+                    self._dedupe_keys[key] = message_id
+                self._messages[message_id] = {
+                    **{field: message.get(field) for field in MESSAGE_FIELDS},
+                    "id": message_id,
+                    "status": STATUS_QUEUED,
+                    "attempts": 0,
+                    "next_attempt_at": self.clock(),
+                    "lease_owner": None,
+                    "lease_expires_at": None,
+                    "provider_id": None,
+                    "error": None
+                }
+                added += 1
+        return added
+
+    async def claim(self, owner: str, limit: int, lease_seconds: int) -> List[Dict[str, Any]]:
+        now = self.clock()
+        claimed = []
+        with self._lock:
+            for message in sorted(self._messages.values(), key=lambda m: (m["next_attempt_at"], m["id"])):
+                if len(claimed) >= limit:
+                    break
+                lease_expired = message["status"] == STATUS_SENDING and message["lease_expires_at"] < now
+                if lease_expired and message["attempts"] >= self.max_attempts:
+                    message.update(status=STATUS_FAILED, error="lease expired after max attempts")
+                    continue
+                due = message["status"] == STATUS_QUEUED and message["next_attempt_at"] <= now
+                if not due and not lease_expired:
+                    continue
+                message.update(
+                    status=STATUS_SENDING,
+                    attempts=message["attempts"] + 1,
+                    lease_owner=owner,
+                    lease_expires_at=now + lease_seconds
+                )
+                claimed.append(dict(message))
+        return claimed
+
+    async def complete(self, messages: List[Dict[str, Any]], owner: str, provider_ids: List[str]) -> None:
+        with self._lock:
+            for message, provider_id in zip(messages, provider_ids):
+                stored = self._messages.get(message["id"])
+                if stored and stored["lease_owner"] == owner:
+                    stored.update(status=STATUS_SENT, provider_id=provider_id, error=None,
+                                  lease_owner=None, lease_expires_at=None)
+
+    async def fail(self, message: Dict[str, Any], owner: str, error: str, retry_in: Optional[float] = None) -> None:
+        with self._lock:
+            stored = self._messages.get(message["id"])
+            if stored and stored["lease_owner"] == owner:
+                stored.update(
+                    status=STATUS_QUEUED if retry_in is not None else STATUS_FAILED,
+                    error=error[:500],
+                    next_attempt_at=self.clock() + (retry_in or 0),
+                    lease_owner=None,
+                    lease_expires_at=None
+                )
+
+    def list_messages(self, status: Optional[str] = None) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [dict(m) for m in self._messages.values() if status is None or m["status"] == status]
+
+
+class EmailSendError(Exception):
+    """A whole batch was not accepted by the provider."""
+
+    def __init__(self, message: str, retryable: bool = True, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retryable = retryable
+        self.retry_after = retry_after
+
+
+class EmailProvider(ABC):
+    @abstractmethod
+    async def send_batch(self, messages: List[Dict[str, Any]], idempotency_key: str) -> List[Tuple[Optional[str], Optional[str]]]:
+        """
+        Send messages in one call.
+
+        Returns:
+            Per message, (provider id, None) if accepted or (None, error) if rejected
+
+        Raises:
+            EmailSendError: Nothing was sent
+        """
+        pass
+
+
+class ResendProvider(EmailProvider):
+    """
+    Resend batch API (up to 100 messages per call), in permissive validation mode so
+    an invalid message is reported on its own instead of rejecting the batch.
+    """
+
+    def __init__(self, api_key: Optional[str], api_url: Optional[str] = None):
+        if not api_key:
+            print("Warning: RESEND_API_KEY is not set. Email sending will fail.")
+        resend.api_key = api_key
+        if api_url:
+            resend.api_url = api_url.rstrip("/")
+
+    async def send_batch(self, messages: List[Dict[str, Any]], idempotency_key: str) -> List[Tuple[Optional[str], Optional[str]]]:
+        params = [
+            {"from": m["sender"], "to": list(m["recipients"]), "subject": m["subject"], "html": m["html"]}
+            for m in messages
+        ]
+        try:
+            response = await resend.Batch.send_async(
+                params, {"idempotency_key": idempotency_key, "batch_validation": "permissive"}
+            )
+        except resend.exceptions.ResendError as e:
+            code = int(e.code) if str(e.code).isdigit() else 500
+            retry_after = e.headers.get("retry-after")
+            raise EmailSendError(
+                f"Resend {code}: {e.message}",
+                retryable=code not in NON_RETRYABLE_CODES,
+                retry_after=float(retry_after) if retry_after and retry_after.isdigit() else None
+            )
+        except Exception as e:
+            raise EmailSendError(f"Resend request failed: {e}")
+
+        # Accepted messages are listed in request order, rejected ones by index
+        errors = {error["index"]: error["message"] for error in response.get("errors") or []}
+        accepted = iter(response.get("data") or [])
+        results: List[Tuple[Optional[str], Optional[str]]] = []
+        for index in range(len(messages)):
+            if index in errors:
+                results.append((None, errors[index]))
+            else:
+                email = next(accepted, None)
+                results.append((email["id"], None) if email else (None, "Missing from provider response"))
+        return results
+
+
+class LocalEmailProvider(EmailProvider):
+    """
+    Records messages in memory instead of sending them.
+    """
+
+    def __init__(self):
+        self.sent: List[Dict[str, Any]] = []
+
+    async def send_batch(self, messages: List[Dict[str, Any]], idempotency_key: str) -> List[Tuple[Optional[str], Optional[str]]]:
+        self.sent.extend(messages)
+        print(f"Local email provider: recorded {len(messages)} message(s) ({idempotency_key})")
+        return [(f"local-{m['id']}", None) for m in messages]
+
+
+class EmailDeliveryWorker:
+    """
+    Drains the outbox in rate-limited batches.
+
+    Args:
+        outbox: Where messages are claimed from
+        provider: Where they are sent
+        owner: Lease owner id of this process
+        batch_size: Messages per provider call
+        rate: Max provider calls per second
+        lease_seconds: How long a claimed batch is reserved for this worker
+        retry: Backoff between attempts of one message
+    """
+
+    def __init__(
+        self,
+        outbox: EmailOutbox,
+        provider: EmailProvider,
+        owner: str,
+        batch_size: int = 100,
+        rate: float = 2.0,
+        lease_seconds: int = 60,
+        retry: Optional[RetryPolicy] = None
+    ):
+        self.outbox = outbox
+        self.provider = provider
+        self.owner = owner
+        self.batch_size = batch_size
+        self.lease_seconds = lease_seconds
+        self.rate_limiter = RateLimiter(rate)
+        self.retry = retry or RetryPolicy(max_attempts=outbox.max_attempts, base_delay=30.0, max_delay=3600.0)
+
+    @staticmethod
+    def idempotency_key(messages: List[Dict[str, Any]]) -> str:
+        ids = ",".join(str(m["id"]) for m in sorted(messages, key=lambda m: m["id"]))
+        return f"outbox-{hashlib.sha256(ids.encode()).hexdigest()[:32]}"
+
+    async def _fail(self, message: Dict[str, Any], error: str, retryable: bool, retry_after: Optional[float], counts: Dict[str, int]):
+        if retryable and message["attempts"] < self.outbox.max_attempts:
+            await self.outbox.fail(message, self.owner, error, retry_in=self.retry.backoff(message["attempts"], retry_after))
+            counts["retried"] += 1
+        else:
+            await self.outbox.fail(message, self.owner, error)
+            counts["failed"] += 1
+            print(f"Email {message['id']} ({message.get('kind')}) failed: {error}")
+
+    async def drain(self) -> Dict[str, int]:
+        """Send every due message. Stops early when the provider is failing."""
+        counts = {"sent": 0, "retried": 0, "failed": 0}
+        while True:
+            batch = await self.outbox.claim(self.owner, self.batch_size, self.lease_seconds)
+            if not batch:
+                return counts
+
+            await self.rate_limiter.wait()
+            try:
+                results = await self.provider.send_batch(batch, self.idempotency_key(batch))
+            except EmailSendError as e:
+                for message in batch:
+                    await self._fail(message, str(e), e.retryable, e.retry_after, counts)
+                if e.retryable:
+                    return counts  # Provider unhealthy: leave the rest for the next poll
+                continue
+
+            accepted = [(m, provider_id) for m, (provider_id, _) in zip(batch, results) if provider_id]
+            await self.outbox.complete([m for m, _ in accepted], self.owner, [p for _, p in accepted])
+            counts["sent"] += len(accepted)
+            for message, (provider_id, error) in zip(batch, results):
+                if not provider_id:
+                    await self._fail(message, error or "Rejected", False, None, counts)
+
+
+_in_memory_outbox: Optional[InMemoryEmailOutbox] = None
+_local_provider: Optional[LocalEmailProvider] = None
+
+
+def get_email_outbox() -> EmailOutbox:
+    """
+    Return the configured outbox.
+    EMAIL_OUTBOX=memory uses the in-process stand-in (delivery must run in this process).
+    """
+    global _in_memory_outbox
+    settings = get_settings()
+
+    if settings.EMAIL_OUTBOX == "memory":
+        if _in_memory_outbox is None:
+            _in_memory_outbox = InMemoryEmailOutbox(max_attempts=settings.EMAIL_MAX_ATTEMPTS)
+        return _in_memory_outbox
+
+    from app.db.repository import get_repository
+    return DatabaseEmailOutbox(get_repository(), max_attempts=settings.EMAIL_MAX_ATTEMPTS)
+
+
+def get_email_provider() -> EmailProvider:
+    global _local_provider
+    settings = get_settings()
+
+    if settings.EMAIL_PROVIDER == "local":
+        if _local_provider is None:
+            _local_provider = LocalEmailProvider()
+        return _local_provider
+    return ResendProvider(settings.RESEND_API_KEY, settings.RESEND_API_URL)
+
+
+def get_email_delivery_worker(owner: str) -> EmailDeliveryWorker:
+    settings = get_settings()
+    return EmailDeliveryWorker(
+        get_email_outbox(),
+        get_email_provider(),
+        owner,
+        batch_size=settings.EMAIL_BATCH_SIZE,
+        rate=settings.EMAIL_RATE_PER_SECOND,
+        lease_seconds=settings.EMAIL_LEASE_SECONDS
+    )
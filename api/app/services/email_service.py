@@ -1,59 +1,61 @@
-import os
-import resend
-from typing import List
-from app.core.config import get_settings
+from typing import List, Optional
+from app.services.email_outbox import get_email_outbox
+
+WELCOME_SENDER = "Alpha Calendar <onboarding@resend.dev>"
+ALERT_SENDER = "Alpha Calendar <alerts@resend.dev>"
+
 
 class EmailService:
-    def __init__(self):
-        settings = get_settings()
-        api_key = settings.RESEND_API_KEY
-        if not api_key:
-            print("Warning: RESEND_API_KEY is not set. Email sending will fail.")
-        resend.api_key = api_key
+    """
+    Builds the app's emails and queues them in the outbox; delivery happens in the
+    background (app/services/email_outbox.py), so callers never wait on Resend.
+    """
 
-    def send_welcome_email(self, to_email: str, user_name: str):
+    def queue_welcome_email(self, to_email: str, user_name: str, user_id: Optional[str] = None, db=None) -> bool:
         """
-        Send a welcome email when a user subscribes to their first alert.
+        Queue a welcome email when a user subscribes to their first alert.
+        Returns False if this user already got one or the outbox is unavailable
+        (the subscription itself must not fail because of its email).
         """
+        message = {
+            "kind": "welcome",
+            "dedupe_key": f"welcome:{user_id or to_email}",
+            "sender": WELCOME_SENDER,
+            "recipients": [to_email],
+            "subject": "Welcome to Alpha Calendar Alerts",
+            "html": f"""
+            <h1>Welcome, {user_name}!</h1>
+            <p>You have successfully subscribed to Alpha Calendar alerts.</p>
+            <p>We will notify you when the Hype Score of your interested events spikes!</p>
+            """
+        }
         try:
-            params = {
-                "from": "Alpha Calendar <onboarding@resend.dev>",
-                "to": [to_email],
-                "subject": "Welcome to Alpha Calendar Alerts",
-                "html": f"""
-                <h1>Welcome, {user_name}!</h1>
-                <p>You have successfully subscribed to Alpha Calendar alerts.</p>
-                <p>We will notify you when the Hype Score of your interested events spikes!</p>
-                """
-            }
-            email = resend.Emails.send(params)
-            print(f"Welcome email sent to {to_email}: {email}")
-            return email
+            return get_email_outbox().enqueue([message], db) > 0
         except Exception as e:
-            print(f"Failed to send welcome email: {e}")
-            return None
+            print(f"Failed to queue welcome email: {e}")
+            return False
 
-    def send_alert_email(self, to_emails: List[str], event_title: str, hype_score: int):
+    def queue_alert_email(self, to_emails: List[str], event_title: str, hype_score: int, db=None) -> bool:
         """
-        Send an alert email when Hype Score spikes.
+        Queue an alert email when Hype Score spikes.
         """
+        message = {
+            "kind": "alert",
+            "dedupe_key": None,
+            "sender": ALERT_SENDER,
+            "recipients": to_emails,
+            "subject": f"🔥 Hype Spike: {event_title} (Score: {hype_score})",
+            "html": f"""
+            <h1>Hype Alert!</h1>
+            <p>The event <strong>{event_title}</strong> is heating up!</p>
+            <p>Current Hype Score: <strong>{hype_score}</strong></p>
+            <p><a href="http://localhost:3000">Check it out on Alpha Calendar</a></p>
+            """
+        }
         try:
-            params = {
-                "from": "Alpha Calendar <alerts@resend.dev>",
-                "to": to_emails,
-                "subject": f"🔥 Hype Spike: {event_title} (Score: {hype_score})",
-                "html": f"""
-                <h1>Hype Alert!</h1>
-                <p>The event <strong>{event_title}</strong> is heating up!</p>
-                <p>Current Hype Score: <strong>{hype_score}</strong></p>
-                <p><a href="http://localhost:3000">Check it out on Alpha Calendar</a></p>
-                """
-            }
-            email = resend.Emails.send(params)
-            print(f"Alert email sent to {len(to_emails)} recipients: {email}")
-            return email
+            return get_email_outbox().enqueue([message], db) > 0
         except Exception as e:
-            print(f"Failed to send alert email: {e}")
-            return None
+            print(f"Failed to queue alert email: {e}")
+            return False
 
 email_service = EmailService()
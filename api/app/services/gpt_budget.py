@@ -0,0 +1,234 @@
+"""
+GPT Budget Manager
+
+Keeps OpenAI throughput at the account's real limit without bursts of failures,
+and bounds what one pipeline run may spend:
+
+- Token accounting: prompt/completion tokens from each response's `usage`, priced per 1M tokens
+- Adaptive concurrency (AIMD): +1 slot per window of successes, halved on 429
+- Rate-limit headers: when x-ratelimit-remaining-* runs out, new requests wait for the reset
+- Per-run ceiling: once the run's token or cost limit is reached, requests raise
+  GptBudgetExceeded instead of being sent
+
+Budgets are per process; with N workers a run can spend up to N x the ceiling.
+"""
+
+import asyncio
+import re
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Callable, Dict, Optional
+import httpx
+from app.core.config import get_settings
+
+
+class GptBudgetExceeded(Exception):
+    """Raised instead of calling GPT once the run's token/cost ceiling is reached."""
+    pass
+
+
+_DURATION_RE = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1, "m": 60, "h": 3600}
+
+
+def parse_reset_duration(value: Optional[str]) -> Optional[float]:
+    """Parse an x-ratelimit-reset-* value like "1s", "6m0s" or "20ms" into seconds."""
+    if not value:
+        return None
+    matches = _DURATION_RE.findall(value)
+    if not matches:
+        return None
+    return sum(float(amount) * _DURATION_UNITS[unit] for amount, unit in matches)
+
+
+class GptBudget:
+    """
+    Token accounting, AIMD concurrency and per-run ceilings for GPT calls.
+
+    Args:
+        max_concurrency: Upper bound for the adaptive limit
+        start_concurrency: Initial limit
+        run_token_limit: Max tokens per run (0 = unlimited)
+        run_cost_limit: Max USD per run (0 = unlimited)
+        input_cost_per_1m: USD per 1M prompt tokens
+        output_cost_per_1m: USD per 1M completion tokens
+        clock: Time source in seconds (injectable for tests)
+    """
+
+    # Minimum seconds between two multiplicative decreases (one burst of 429s = one halving)
+    DECREASE_COOLDOWN_SECONDS = 2.0
+    # Tokens assumed per request until usage has been observed
+    DEFAULT_TOKENS_PER_REQUEST = 1000
+
+    def __init__(
+        self,
+        max_concurrency: int = 8,
+        start_concurrency: int = 2,
+        run_token_limit: int = 0,
+        run_cost_limit: float = 0.0,
+        input_cost_per_1m: float = 0.15,
+        output_cost_per_1m: float = 0.60,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.max_concurrency = max(max_concurrency, 1)
+        self.limit = float(min(max(start_concurrency, 1), self.max_concurrency))
+        self.run_token_limit = run_token_limit
+        self.run_cost_limit = run_cost_limit
+        self.input_cost_per_1m = input_cost_per_1m
+        self.output_cost_per_1m = output_cost_per_1m
+        self.clock = clock
+
+        self.run_id: Optional[str] = None
+        self.requests = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.throttled = 0
+
+        self._active = 0
+        self._paused_until = 0.0
+        self._last_decrease = float("-inf")
+        self._cond: Optional[asyncio.Condition] = None
+
+    # --- Accounting -------------------------------------------------------
+
+    def begin_run(self, run_id: Optional[str]):
+        """Reset per-run counters when a new run starts (no-op for the current run)."""
+        if run_id != self.run_id:
+            self.run_id = run_id
+            self.requests = 0
+            self.prompt_tokens = 0
+            self.completion_tokens = 0
+            self.throttled = 0
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+    @property
+    def cost(self) -> float:
+        return (
+            self.prompt_tokens * self.input_cost_per_1m
+            + self.completion_tokens * self.output_cost_per_1m
+        ) / 1_000_000
+
+    @property
+    def tokens_per_request(self) -> float:
+        if not self.requests:
+            return self.DEFAULT_TOKENS_PER_REQUEST
+        return self.total_tokens / self.requests
+
+    def exhausted(self) -> bool:
+        """Whether the next request would likely cross the run ceiling (counting requests in flight)."""
+        pending = self._active + 1
+        if self.run_token_limit:
+            if self.total_tokens + pending * self.tokens_per_request > self.run_token_limit:
+                return True
+        if self.run_cost_limit and self.requests:
+            if self.cost + pending * (self.cost / self.requests) > self.run_cost_limit:
+                return True
+        return False
+
+    def check(self):
+        if self.exhausted():
+            raise GptBudgetExceeded(
+                f"GPT run budget reached ({self.total_tokens} tokens, ${self.cost:.4f})"
+            )
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "cost_usd": round(self.cost, 6),
+            "throttled": self.throttled,
+            "concurrency": int(self.limit)
+        }
+
+    # --- Concurrency ------------------------------------------------------
+
+    @asynccontextmanager
+    async def slot(self):
+        """Hold one of the adaptive concurrency slots for the duration of a request."""
+        await self._acquire()
+        try:
+            yield
+        finally:
+            await self._release()
+
+    async def _acquire(self):
+        if self._cond is None:
+            self._cond = asyncio.Condition()
+        while True:
+            self.check()
+            wait = self._paused_until - self.clock()
+            if wait > 0:
+                await asyncio.sleep(wait)
+                continue
+            async with self._cond:
+                if self._active < int(self.limit):
+                    self._active += 1
+                    return
+                await self._cond.wait()
+
+    async def _release(self):
+        async with self._cond:
+            self._active -= 1
+            self._cond.notify_all()
+
+    def observe(self, response: httpx.Response):
+        """Feed one HTTP response (every attempt, including retried 429s) into the controller."""
+        if response.status_code == 429:
+            self.throttled += 1
+            self._decrease()
+        elif response.status_code == 200:
+            # Additive increase: about +1 slot per window of `limit` successes
+            self.limit = min(self.limit + 1 / self.limit, float(self.max_concurrency))
+
+        self._apply_rate_limit_headers(response.headers)
+
+    def record_usage(self, usage: Optional[Dict[str, Any]]):
+        """Account the `usage` block of a chat completion."""
+        self.requests += 1
+        if usage:
+            self.prompt_tokens += int(usage.get("prompt_tokens", 0))
+            self.completion_tokens += int(usage.get("completion_tokens", 0))
+
+    def _decrease(self):
+        now = self.clock()
+        if now - self._last_decrease >= self.DECREASE_COOLDOWN_SECONDS:
+            self.limit = max(self.limit / 2, 1.0)
+            self._last_decrease = now
+
+    def _apply_rate_limit_headers(self, headers: httpx.Headers):
+        """Pause new requests until the window resets when requests or tokens have run out."""
+        pause = 0.0
+        remaining_requests = headers.get("x-ratelimit-remaining-requests")
+        if remaining_requests is not None and remaining_requests.isdigit() and int(remaining_requests) <= 0:
+            pause = max(pause, parse_reset_duration(headers.get("x-ratelimit-reset-requests")) or 1.0)
+
+        remaining_tokens = headers.get("x-ratelimit-remaining-tokens")
+        if remaining_tokens is not None and remaining_tokens.isdigit() \
+                and int(remaining_tokens) < self.tokens_per_request:
+            pause = max(pause, parse_reset_duration(headers.get("x-ratelimit-reset-tokens")) or 1.0)
+
+        if pause:
+            self._paused_until = max(self._paused_until, self.clock() + pause)
+
+
+_gpt_budget: Optional[GptBudget] = None
+
+
+def get_gpt_budget() -> GptBudget:
+    """Return the process-wide GPT budget."""
+    global _gpt_budget
+    if _gpt_budget is None:
+        settings = get_settings()
+        _gpt_budget = GptBudget(
+            max_concurrency=settings.PIPELINE_GPT_CONCURRENCY,
+            start_concurrency=settings.GPT_START_CONCURRENCY,
+            run_token_limit=settings.GPT_RUN_TOKEN_LIMIT,
+            run_cost_limit=settings.GPT_RUN_COST_LIMIT_USD,
+            input_cost_per_1m=settings.GPT_INPUT_COST_PER_1M,
+            output_cost_per_1m=settings.GPT_OUTPUT_COST_PER_1M
+        )
+    return _gpt_budget
@@ -8,7 +8,7 @@ Calculates a 0-100 hype score based on multiple data sources:
 - Trend analysis (growth rate / slope)
 """
 
-from typing import Dict, Optional
+from typing import Dict, Iterable, Optional
 
 
 class HypeCalculator:
@@ -41,7 +41,8 @@ class HypeCalculator:
     def calculate(
         cls, 
         metrics: Dict[str, int], 
-        previous_metrics: Optional[Dict[str, int]] = None
+        previous_metrics: Optional[Dict[str, int]] = None,
+        unavailable: Optional[Iterable[str]] = None
     ) -> int:
         """
         Calculate weighted Hype Score (0-100).
@@ -49,13 +50,22 @@ class HypeCalculator:
         Args:
             metrics: Current metrics dictionary with keys matching WEIGHTS
             previous_metrics: Previous day's metrics for trend calculation
+            unavailable: Metric keys whose source was skipped this run; their weight is
+                redistributed over the remaining metrics and they are left out of the trend
             
         Returns:
             Integer score from 0 to 100
         """
+        skipped = set(unavailable or ())
+        weights = {k: w for k, w in cls.WEIGHTS.items() if k not in skipped}
+        if skipped:
+            metrics = {k: v for k, v in metrics.items() if k not in skipped}
+            if previous_metrics:
+                previous_metrics = {k: v for k, v in previous_metrics.items() if k not in skipped}
+        
         score = 0.0
         
-        for metric_key, weight in cls.WEIGHTS.items():
+        for metric_key, weight in weights.items():
             if metric_key == "trend_slope":
                 # Calculate trend score based on growth
                 metric_score = cls._calculate_trend_score(metrics, previous_metrics)
@@ -68,6 +78,9 @@ class HypeCalculator:
             
             score += metric_score * weight
         
+        if skipped:
+            score /= sum(weights.values())
+        
         return int(min(max(score, 0), 100))
     
     @classmethod
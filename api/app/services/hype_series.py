@@ -0,0 +1,97 @@
+"""
+Hype Time Series
+
+Bounded views of an event's hype_metrics history, so responses stay the same size
+however long an event lives:
+
+- Buckets: the database averages raw rows per day or per week
+  (hype_metric_buckets, migration_013; live and archived rows alike)
+- Downsampling: a bucketed series longer than max_points is reduced with LTTB
+  (Largest-Triangle-Three-Buckets), which keeps peaks and turns that plain
+  averaging would flatten
+- Summary: latest day, 7-day delta and a 30-day sparkline for event detail
+"""
+
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional
+
+
+METRIC_KEYS = ("search_volume", "community_buzz", "youtube_count")
+
+# Bucket unit passed to hype_metric_buckets per resolution
+BUCKET_UNITS = {"daily": "day", "weekly": "week"}
+
+SPARKLINE_DAYS = 30
+DELTA_DAYS = 7
+# Daily buckets the summary reads: sparkline window + delta lookback
+SUMMARY_BUCKETS = SPARKLINE_DAYS + DELTA_DAYS + 1
+
+
+def to_point(row: Dict[str, Any]) -> Dict[str, Any]:
+    """hype_metric_buckets row -> HypeSeriesPoint dict."""
+    point = {"recorded_at": str(row["bucket"])[:10]}
+    for key in METRIC_KEYS:
+        point[key] = round(float(row.get(key) or 0), 2)
+    return point
+
+
+def total(point: Dict[str, Any]) -> float:
+    return sum(point[key] for key in METRIC_KEYS)
+
+
+def lttb(points: List[Dict[str, Any]], threshold: int) -> List[Dict[str, Any]]:
+    """
+    Largest-Triangle-Three-Buckets on the total of all metrics (x = day ordinal).
+    Keeps the first and last point; returns `points` unchanged when short enough
+    (or when threshold < 3).
+    """
+    if threshold < 3 or len(points) <= threshold:
+        return points
+
+    xs = [date.fromisoformat(p["recorded_at"]).toordinal() for p in points]
+    ys = [total(p) for p in points]
+    sampled = [points[0]]
+    every = (len(points) - 2) / (threshold - 2)
+    a = 0
+
+    for i in range(threshold - 2):
+        # Average of the next bucket is the third triangle vertex
+        next_start = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, len(points))
+        avg_x = sum(xs[next_start:next_end]) / (next_end - next_start)
+        avg_y = sum(ys[next_start:next_end]) / (next_end - next_start)
+
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        best, best_area = start, -1.0
+        for j in range(start, end):
+            area = abs((xs[a] - avg_x) * (ys[j] - ys[a]) - (xs[a] - xs[j]) * (avg_y - ys[a]))
+            if area > best_area:
+                best, best_area = j, area
+        sampled.append(points[best])
+        a = best
+
+    sampled.append(points[-1])
+    return sampled
+
+
+def summarize(daily: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    HypeMetricsSummary dict from daily points (oldest first, at most SUMMARY_BUCKETS).
+    """
+    if not daily:
+        return {"latest": None, "delta_7d": None, "sparkline": []}
+
+    latest = daily[-1]
+    latest_day = date.fromisoformat(latest["recorded_at"])
+
+    delta: Optional[Dict[str, float]] = None
+    cutoff = (latest_day - timedelta(days=DELTA_DAYS)).isoformat()
+    earlier = [p for p in daily if p["recorded_at"] <= cutoff]
+    if earlier:
+        delta = {key: round(latest[key] - earlier[-1][key], 2) for key in METRIC_KEYS}
+
+    window_start = (latest_day - timedelta(days=SPARKLINE_DAYS - 1)).isoformat()
+    sparkline = [round(total(p), 2) for p in daily if p["recorded_at"] >= window_start]
+
+    return {"latest": latest, "delta_7d": delta, "sparkline": sparkline}
@@ -0,0 +1,217 @@
+"""
+Leader Lock
+
+Lease-based single-leader lock so that only one instance runs a given job at a time,
+even across replicas or when a cron run overlaps a manual trigger on another instance.
+
+- A lease has an owner and an expiry; the holder renews it with a heartbeat.
+- If the holder crashes, the heartbeat stops and the lease expires.
+  The next instance that tries to acquire it takes it over automatically.
+- If renewals keep failing (store outage), the holder stops considering itself the
+  leader before the lease can expire, so two instances never both act as leader.
+
+Stores:
+- DatabaseLeaseStore: job_leases table via the repository (migration_003)
+- InMemoryLeaseStore: LEASE_STORE=memory; only excludes jobs within one process
+"""
+
+import asyncio
+import os
+import socket
+import time
+import uuid
+from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
+from typing import Callable, Dict, Optional, Tuple
+from app.core.config import get_settings
+
+
+class LeaseStore(ABC):
+    """
+    Abstract backing store for job leases.
+    """
+
+    @abstractmethod
+    async def acquire(self, name: str, owner: str, ttl_seconds: int) -> bool:
+        pass
+
+    @abstractmethod
+    async def renew(self, name: str, owner: str, ttl_seconds: int) -> bool:
+        pass
+
+    @abstractmethod
+    async def release(self, name: str, owner: str) -> None:
+        pass
+
+
+class DatabaseLeaseStore(LeaseStore):
+    """
+    Lease store backed by the job_leases table (atomic SQL functions).
+    """
+
+    def __init__(self, repository):
+        self.repository = repository
+
+    async def acquire(self, name: str, owner: str, ttl_seconds: int) -> bool:
+        return await self.repository.acquire_lease(name, owner, ttl_seconds)
+
+    async def renew(self, name: str, owner: str, ttl_seconds: int) -> bool:
+        return await self.repository.renew_lease(name, owner, ttl_seconds)
+
+    async def release(self, name: str, owner: str) -> None:
+        await self.repository.release_lease(name, owner)
+
+
+class InMemoryLeaseStore(LeaseStore):
+    """
+    In-process lease store with the same semantics as the job_leases table.
+
+    Args:
+        clock: Time source in seconds (injectable so tests can fast-forward expiry)
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self.clock = clock
+        self._leases: Dict[str, Tuple[str, float]] = {}  # name -> (owner, expires_at)
+
+    async def acquire(self, name: str, owner: str, ttl_seconds: int) -> bool:
+        now = self.clock()
+        current = self._leases.get(name)
+        if current and current[0] != owner and current[1] >= now:
+            return False
+        self._leases[name] = (owner, now + ttl_seconds)
+        return True
+
+    async def renew(self, name: str, owner: str, ttl_seconds: int) -> bool:
+        current = self._leases.get(name)
+        if not current or current[0] != owner:
+            return False
+        self._leases[name] = (owner, self.clock() + ttl_seconds)
+        return True
+
+    async def release(self, name: str, owner: str) -> None:
+        current = self._leases.get(name)
+        if current and current[0] == owner:
+            del self._leases[name]
+
+
+def default_owner_id() -> str:
+    """Identify this instance: host, pid and a random suffix."""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+class LeaderLock:
+    """
+    Lease-based leader lock with a background heartbeat.
+
+    Usage:
+        async with lock.hold() as acquired:
+            if not acquired:
+                return  # another instance is the leader
+            ...
+
+    Args:
+        store: Lease backing store
+        name: Job name (one lease per job)
+        ttl_seconds: Lease lifetime without a heartbeat
+        owner: Instance identifier (defaults to host:pid:random)
+    """
+
+    def __init__(
+        self,
+        store: LeaseStore,
+        name: str,
+        ttl_seconds: int = 300,
+        owner: Optional[str] = None
+    ):
+        self.store = store
+        self.name = name
+        self.ttl_seconds = ttl_seconds
+        self.owner = owner or default_owner_id()
+        self.heartbeat_interval = max(ttl_seconds / 3, 1)
+        self._held = False
+        self.lost = asyncio.Event()  # Set when the lease is lost while held; work under it must stop
+        self._renewed_at = 0.0  # Monotonic time the last successful acquire/renew was sent
+        self._heartbeat_task: Optional[asyncio.Task] = None
+
+    @property
+    def is_held(self) -> bool:
+        """True while we own the lease (False once a heartbeat fails)."""
+        return self._held
+
+    async def acquire(self) -> bool:
+        """Try to become the leader. Starts the heartbeat on success."""
+        self._renewed_at = time.monotonic()
+        try:
+            self._held = await self.store.acquire(self.name, self.owner, self.ttl_seconds)
+        except Exception as e:
+            print(f"Lease acquire error ({self.name}): {e}")
+            self._held = False
+
+        if self._held:
+            self.lost = asyncio.Event()
+            self._heartbeat_task = asyncio.create_task(self._heartbeat())
+        return self._held
+
+    async def release(self):
+        """Stop the heartbeat and give up the lease."""
+        if self._heartbeat_task:
+            self._heartbeat_task.cancel()
+            try:
+                await self._heartbeat_task
+            except asyncio.CancelledError:
+                pass
+            self._heartbeat_task = None
+
+        if self._held:
+            try:
+                await self.store.release(self.name, self.owner)
+            except Exception as e:
+                # The lease will simply expire
+                print(f"Lease release error ({self.name}): {e}")
+            self._held = False
+
+    async def _heartbeat(self):
+        """Renew the lease periodically until released or lost."""
+        while self._held:
+            await asyncio.sleep(self.heartbeat_interval)
+            sent_at = time.monotonic()
+            try:
+                renewed = await self.store.renew(self.name, self.owner, self.ttl_seconds)
+            except Exception as e:
+                # Transient store error - keep trying while the lease is still ours for sure
+                print(f"Lease heartbeat error ({self.name}): {e}")
+                if time.monotonic() - self._renewed_at + self.heartbeat_interval >= self.ttl_seconds:
+                    # The lease may expire before the next attempt; another instance can take it then
+                    print(f"Lease given up ({self.name}), renewals failing for too long")
+                    self._held = False
+                    self.lost.set()
+                continue
+            if renewed:
+                self._renewed_at = sent_at
+            else:
+                print(f"Lease lost ({self.name}), another instance took over")
+                self._held = False
+                self.lost.set()
+
+    @asynccontextmanager
+    async def hold(self):
+        """Acquire for the duration of the block. Yields whether we are the leader."""
+        acquired = await self.acquire()
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                await self.release()
+
+
+def get_lease_store() -> LeaseStore:
+    """
+    Return the configured lease store.
+    LEASE_STORE=memory uses the in-process stand-in (no cross-replica protection).
+    """
+    if get_settings().LEASE_STORE == "memory":
+        return InMemoryLeaseStore()
+
+    from app.db.repository import get_repository
+    return DatabaseLeaseStore(get_repository())
@@ -0,0 +1,293 @@
+"""
+Hype Leaderboard
+
+In-memory ranking of upcoming ACTIVE events by hype_score, overall and per ticker,
+for "top N hottest" and "rank of this event" queries without scanning events:
+
+- ScoreBoard: scores are integers 0..100, so a scope is a Fenwick tree of counts per
+  score plus an id-sorted bucket per score. Order is (hype_score desc, id asc);
+  rank and update are O(log n), top-N is O(N + 101)
+- Leaderboard: one overall ScoreBoard and one per related ticker; an event is a
+  member while it is ACTIVE and its target_date has not passed
+- LeaderboardService (per process): rebuilt from the database on first use and at
+  each day change, then kept current incrementally:
+  - API processes read the events change feed (app/services/change_feed.py) at most
+    every LEADERBOARD_POLL_SECONDS; applying a row is idempotent
+  - Phase 2 applies each new hype_score directly when the leaderboard is loaded in
+    the same process (RUN_SCHEDULER_IN_API)
+"""
+
+import threading
+import time
+from bisect import bisect_left, insort
+from datetime import date
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from app.core.config import get_settings
+from app.services.change_feed import ChangeFeedCursor, PAGE_ROWS, iter_pages
+
+
+MAX_SCORE = 100
+
+# Columns a leaderboard entry needs
+LEADERBOARD_COLUMNS = ("id", "title", "target_date", "hype_score", "related_tickers", "status", "updated_at")
+
+
+def _clamp_score(score: Any) -> int:
+    return min(max(int(score or 0), 0), MAX_SCORE)
+
+
+class ScoreBoard:
+    """
+    Ranking of event ids within one scope, by (score desc, id asc).
+    """
+
+    def __init__(self):
+        self._tree = [0] * (MAX_SCORE + 2)  # Fenwick tree; position 1 = score 100
+        self._buckets: Dict[int, List[int]] = {}  # score -> sorted ids
+        self._scores: Dict[int, int] = {}  # id -> score
+
+    def __len__(self) -> int:
+        return len(self._scores)
+
+    def __contains__(self, event_id: int) -> bool:
+        return event_id in self._scores
+
+    def _add(self, score: int, delta: int):
+        position = MAX_SCORE - score + 1
+        while position < len(self._tree):
+            self._tree[position] += delta
+            position += position & -position
+
+    def _higher(self, score: int) -> int:
+        """Number of events with a score above `score`."""
+        position, count = MAX_SCORE - score, 0
+        while position > 0:
+            count += self._tree[position]
+            position -= position & -position
+        return count
+
+    def upsert(self, event_id: int, score: int):
+        score = _clamp_score(score)
+        previous = self._scores.get(event_id)
+        if previous == score:
+            return
+        if previous is not None:
+            self.remove(event_id)
+        self._scores[event_id] = score
+        insort(self._buckets.setdefault(score, []), event_id)
+        self._add(score, 1)
+
+    def remove(self, event_id: int):
+        score = self._scores.pop(event_id, None)
+        if score is None:
+            return
+        bucket = self._buckets[score]
+        del bucket[bisect_left(bucket, event_id)]
+        if not bucket:
+            del self._buckets[score]
+        self._add(score, -1)
+
+    def rank(self, event_id: int) -> Optional[int]:
+        """1-based rank, or None when the event is not on this board."""
+        score = self._scores.get(event_id)
+        if score is None:
+            return None
+        return self._higher(score) + bisect_left(self._buckets[score], event_id) + 1
+
+    def top(self, n: int) -> List[Tuple[int, int]]:
+        """[(event_id, score)] of the n highest."""
+        result: List[Tuple[int, int]] = []
+        for score in range(MAX_SCORE, -1, -1):
+            for event_id in self._buckets.get(score, ()):
+                if len(result) == n:
+                    return result
+                result.append((event_id, score))
+        return result
+
+
+class Leaderboard:
+    """
+    Overall and per-ticker ScoreBoards of upcoming ACTIVE events.
+    """
+
+    def __init__(self, today: Optional[date] = None):
+        self.today = today or date.today()
+        self.overall = ScoreBoard()
+        self.tickers: Dict[str, ScoreBoard] = {}
+        self.events: Dict[int, Dict[str, Any]] = {}  # id -> entry (title, date, score, tickers)
+
+    def _eligible(self, row: Dict[str, Any]) -> bool:
+        if row.get("status") != "ACTIVE":
+            return False
+        try:
+            return date.fromisoformat(str(row.get("target_date"))[:10]) >= self.today
+        except ValueError:
+            return False
+
+    def remove(self, event_id: int):
+        entry = self.events.pop(event_id, None)
+        if entry is None:
+            return
+        self.overall.remove(event_id)
+        for ticker in entry["related_tickers"]:
+            board = self.tickers.get(ticker)
+            if board is not None:
+                board.remove(event_id)
+                if not len(board):
+                    del self.tickers[ticker]
+
+    def apply(self, row: Dict[str, Any]):
+        """Insert, move or drop one event (idempotent)."""
+        event_id = row["id"]
+        if not self._eligible(row):
+            self.remove(event_id)
+            return
+
+        score = _clamp_score(row.get("hype_score"))
+        tickers = sorted({str(t).upper() for t in row.get("related_tickers") or []})
+        previous = self.events.get(event_id)
+        if previous is not None:
+            for ticker in set(previous["related_tickers"]) - set(tickers):
+                board = self.tickers.get(ticker)
+                if board is not None:
+                    board.remove(event_id)
+                    if not len(board):
+                        del self.tickers[ticker]
+
+        self.events[event_id] = {
+            "id": event_id,
+            "title": row.get("title") or (previous or {}).get("title"),
+            "target_date": str(row.get("target_date"))[:10],
+            "hype_score": score,
+            "related_tickers": tickers
+        }
+        self.overall.upsert(event_id, score)
+        for ticker in tickers:
+            self.tickers.setdefault(ticker, ScoreBoard()).upsert(event_id, score)
+
+    def board(self, ticker: Optional[str] = None) -> Optional[ScoreBoard]:
+        return self.overall if ticker is None else self.tickers.get(ticker.upper())
+
+    def top(self, n: int, ticker: Optional[str] = None) -> List[Dict[str, Any]]:
+        board = self.board(ticker)
+        if board is None:
+            return []
+        return [{"rank": i, **self.events[event_id]} for i, (event_id, _) in enumerate(board.top(n), start=1)]
+
+    def rank(self, event_id: int, ticker: Optional[str] = None) -> Tuple[Optional[int], int]:
+        """(1-based rank or None, size of the scope)."""
+        board = self.board(ticker)
+        if board is None:
+            return None, 0
+        return board.rank(event_id), len(board)
+
+
+class LeaderboardService:
+    """
+    Process-wide leaderboard kept in sync with the events table.
+
+    Args:
+        poll_seconds: Min seconds between two change polls
+        overlap_seconds: Re-read window before the last seen updated_at
+        clock: Time source in seconds (injectable for tests)
+    """
+
+    def __init__(self, poll_seconds: float = 5.0, overlap_seconds: int = 120, clock: Callable[[], float] = time.monotonic):
+        self.poll_seconds = poll_seconds
+        self.overlap_seconds = overlap_seconds
+        self.clock = clock
+        self.leaderboard: Optional[Leaderboard] = None
+        self._cursor: Optional[ChangeFeedCursor] = None
+        self._polled_at: Optional[float] = None
+        self._lock = threading.RLock()
+
+    @property
+    def loaded(self) -> bool:
+        return self.leaderboard is not None
+
+    def rebuild(self, db):
+        """Load every upcoming ACTIVE event (startup and day change)."""
+        today = date.today()
+
+        def page(last):
+            query = db.table("events")\
+                .select(",".join(LEADERBOARD_COLUMNS))\
+                .eq("status", "ACTIVE")\
+                .gte("target_date", today.isoformat())
+            if last is not None:
+                query = query.gt("id", last["id"])
+            return query.order("id").limit(PAGE_ROWS).execute().data
+
+        leaderboard = Leaderboard(today)
+        cursor = ChangeFeedCursor(self.overlap_seconds)  # Changes after this are read by sync()
+        for row in iter_pages(page):
+            leaderboard.apply(row)
+        self._cursor = cursor
+        self.leaderboard = leaderboard
+        self._polled_at = self.clock()
+        print(f"Leaderboard rebuilt: {len(leaderboard.overall)} events, {len(leaderboard.tickers)} tickers")
+
+    def sync(self, db) -> int:
+        """Apply events changed since the watermark (minus the overlap). Returns rows applied."""
+        applied = 0
+        for row in self._cursor.read(db, LEADERBOARD_COLUMNS):
+            self.leaderboard.apply(row)
+            applied += 1
+        self._polled_at = self.clock()
+        return applied
+
+    def current(self, db) -> Leaderboard:
+        """The leaderboard, rebuilt or synced first when due."""
+        with self._lock:
+            try:
+                if self.leaderboard is None or self.leaderboard.today != date.today():
+                    self.rebuild(db)
+                elif self.clock() - self._polled_at >= self.poll_seconds:
+                    self.sync(db)
+            except Exception as e:
+                if self.leaderboard is None:
+                    raise
+                # Serve the last known state; the next request retries
+                print(f"Leaderboard sync error: {e}")
+                self._polled_at = self.clock()
+            return self.leaderboard
+
+    def top(self, db, n: int, ticker: Optional[str] = None) -> Tuple[int, List[Dict[str, Any]]]:
+        """(size of the scope, its n highest entries)."""
+        with self._lock:
+            leaderboard = self.current(db)
+            board = leaderboard.board(ticker)
+            return (len(board) if board is not None else 0), leaderboard.top(n, ticker)
+
+    def rank(self, db, event_id: int, ticker: Optional[str] = None) -> Tuple[Optional[int], int, Optional[int]]:
+        """(1-based rank or None, size of the scope, hype_score or None)."""
+        with self._lock:
+            leaderboard = self.current(db)
+            rank, total = leaderboard.rank(event_id, ticker)
+            score = leaderboard.events[event_id]["hype_score"] if rank is not None else None
+            return rank, total, score
+
+    def apply(self, rows: List[Dict[str, Any]]):
+        """In-process update from Phase 2 (ignored until the leaderboard is loaded)."""
+        with self._lock:
+            if self.leaderboard is None:
+                return
+            for row in rows:
+                self.leaderboard.apply(row)
+
+
+_leaderboard_service: Optional[LeaderboardService] = None
+_leaderboard_service_lock = threading.Lock()
+
+
+def get_leaderboard() -> LeaderboardService:
+    global _leaderboard_service
+    if _leaderboard_service is None:
+        with _leaderboard_service_lock:
+            if _leaderboard_service is None:
+                settings = get_settings()
+                _leaderboard_service = LeaderboardService(
+                    poll_seconds=settings.LEADERBOARD_POLL_SECONDS,
+                    overlap_seconds=settings.CHANGE_FEED_OVERLAP_SECONDS
+                )
+    return _leaderboard_service
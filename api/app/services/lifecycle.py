@@ -0,0 +1,82 @@
+"""
+Event Lifecycle Sweeper
+
+Keeps the Phase 2 working set to live, upcoming events. Runs before Phase 2 is
+enqueued:
+
+1. Finish: events whose target_date is more than LIFECYCLE_FINISH_GRACE_DAYS in
+   the past become FINISHED
+2. Archive: hype_metrics rows of FINISHED events move to hype_metrics_archive
+   (one SQL function, idempotent, so a failed night is caught up the next)
+3. Freeze: PENDING events older than LIFECYCLE_PENDING_STALE_DAYS that never
+   auto-published stop being scored (scoring_frozen_at); they keep their status
+
+Phase 2 only scores events that are neither FINISHED nor frozen, so its cost tracks
+the number of live upcoming events instead of every event ever discovered.
+"""
+
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Optional
+from app.core.config import get_settings
+from app.services.read_cache import publish_events_changed
+
+
+class EventLifecycleSweeper:
+    """
+    Args:
+        repository: Data access layer
+        finish_grace_days: Days after target_date an event stays live
+        pending_stale_days: Days a PENDING event is scored before it is frozen
+    """
+
+    def __init__(self, repository, finish_grace_days: int = 1, pending_stale_days: int = 14):
+        self.repository = repository
+        self.finish_grace_days = finish_grace_days
+        self.pending_stale_days = pending_stale_days
+
+    async def sweep(self, today: Optional[date] = None) -> Dict[str, int]:
+        """
+        Run all lifecycle steps. Each step is independent: a failing step is logged
+        and the others still run.
+
+        Returns:
+            {"finished": ..., "archived_metrics": ..., "frozen": ...}
+        """
+        today = today or date.today()
+        result = {"finished": 0, "archived_metrics": 0, "frozen": 0}
+
+        try:
+            cutoff = today - timedelta(days=self.finish_grace_days)
+            finished = await self.repository.finish_events_before(cutoff.isoformat())
+            result["finished"] = len(finished)
+        except Exception as e:
+            print(f"  Lifecycle finish error: {e}")
+
+        try:
+            result["archived_metrics"] = await self.repository.archive_finished_event_metrics()
+        except Exception as e:
+            print(f"  Lifecycle archive error: {e}")
+
+        try:
+            created_before = datetime.now(timezone.utc) - timedelta(days=self.pending_stale_days)
+            result["frozen"] = await self.repository.freeze_stale_pending_events(created_before.isoformat())
+        except Exception as e:
+            print(f"  Lifecycle freeze error: {e}")
+
+        if result["finished"] or result["frozen"]:
+            await publish_events_changed(self.repository)
+
+        print(
+            f"  Lifecycle: {result['finished']} finished, "
+            f"{result['archived_metrics']} metric rows archived, {result['frozen']} stale PENDING frozen"
+        )
+        return result
+
+
+def get_lifecycle_sweeper(repository) -> EventLifecycleSweeper:
+    settings = get_settings()
+    return EventLifecycleSweeper(
+        repository,
+        finish_grace_days=settings.LIFECYCLE_FINISH_GRACE_DAYS,
+        pending_stale_days=settings.LIFECYCLE_PENDING_STALE_DAYS
+    )
@@ -0,0 +1,252 @@
+"""
+Live Updates Hub
+
+In-process broadcast of event deltas (new events, hype score and status changes)
+to Server-Sent Events clients (/api/v1/stream/events), instead of clients polling
+/api/v1/events:
+
+- Sources: Phase 2 publishes each new score directly when the scheduler runs in
+  this process; with STREAM_CHANNEL=database a feed task also reads the events
+  change feed (app/services/change_feed.py) every STREAM_POLL_SECONDS while clients
+  are connected, which covers the worker process, the lifecycle sweep and admin edits
+- Dedup: the hub remembers the last (hype_score, status) per event, so a change seen
+  by both sources, re-read in the feed overlap or touching other columns (refresh
+  claims) is not sent twice
+- Messages are encoded once and shared by every subscriber; ids are
+  "<hub epoch>-<sequence>" so Last-Event-ID resume replays from a bounded ring
+  buffer, and an id from another process or restart gets a "reset" (refetch)
+- Each subscriber has a bounded queue and its own filter (tickers, event ids); a
+  subscriber that falls behind is reset instead of slowing the hub down
+- Clients connect first, then fetch /events: the stream only carries changes made
+  after the connection
+
+The hub lives on the API event loop; publish() from another thread is handed over
+to the loop.
+"""
+
+import asyncio
+import threading
+import uuid
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Deque, Dict, FrozenSet, List, Optional, Set, Tuple
+import orjson
+from app.api.fieldsets import EVENT_FIELD_PRESETS
+from app.core.config import get_settings
+from app.services.change_feed import ChangeFeedCursor, parse_timestamp
+
+
+# A delta carries the card fieldset (app/api/fieldsets.py), so a new event renders as-is
+PAYLOAD_FIELDS = EVENT_FIELD_PRESETS["card"]
+STREAM_COLUMNS = (*PAYLOAD_FIELDS, "created_at", "updated_at")
+
+KIND_CREATED = "created"
+KIND_SCORE = "score"
+KIND_STATUS = "status"
+KIND_UPDATED = "updated"  # Event not seen by this hub before; apply as an upsert
+KIND_RESET = "reset"  # Refetch: the stream cannot tell what was missed
+
+RESET_FRAME = b"event: reset\ndata: {}\n\n"
+HEARTBEAT_FRAME = b": ping\n\n"
+
+
+@dataclass(frozen=True)
+class Message:
+    seq: int
+    event_id: int
+    tickers: FrozenSet[str]
+    frame: bytes  # Encoded SSE frame (id, event, data)
+
+
+@dataclass(frozen=True)
+class StreamFilter:
+    """No tickers and no event ids = everything."""
+    tickers: FrozenSet[str] = frozenset()
+    event_ids: FrozenSet[int] = frozenset()
+
+    def matches(self, message: Message) -> bool:
+        if not self.tickers and not self.event_ids:
+            return True
+        return message.event_id in self.event_ids or not self.tickers.isdisjoint(message.tickers)
+
+
+@dataclass(eq=False)
+class Subscriber:
+    filter: StreamFilter
+    queue: asyncio.Queue = field(default_factory=asyncio.Queue)
+
+    def offer(self, message: Message):
+        if not self.filter.matches(message):
+            return
+        try:
+            self.queue.put_nowait(message.frame)
+        except asyncio.QueueFull:
+            # Too slow: drop its backlog and tell it to refetch
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESET_FRAME)
+
+
+def _payload(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Card fields present in the row (clients merge it into what they have)."""
+    payload = {key: row[key] for key in PAYLOAD_FIELDS if key in row}
+    if payload.get("target_date"):
+        payload["target_date"] = str(payload["target_date"])[:10]
+    if "related_tickers" in payload:
+        payload["related_tickers"] = [str(t).upper() for t in payload["related_tickers"] or []]
+    return payload
+
+
+class LiveUpdateHub:
+    """
+    Args:
+        replay_size: Recent messages kept for Last-Event-ID resume
+        subscriber_buffer: Max queued frames per subscriber
+        max_subscribers: Connections beyond this are refused
+    """
+
+    def __init__(self, replay_size: int = 1024, subscriber_buffer: int = 256, max_subscribers: int = 1000):
+        self.epoch = uuid.uuid4().hex[:8]
+        self.subscriber_buffer = subscriber_buffer
+        self.max_subscribers = max_subscribers
+        self.started_at = datetime.now(timezone.utc)
+        self._seq = 0
+        self._replay: Deque[Message] = deque(maxlen=replay_size)
+        self._subscribers: Set[Subscriber] = set()
+        self._known: Dict[int, Tuple[int, str]] = {}  # id -> (hype_score, status) last sent
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._feed_task: Optional[asyncio.Task] = None
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    @property
+    def full(self) -> bool:
+        return len(self._subscribers) >= self.max_subscribers
+
+    def message_id(self, seq: int) -> str:
+        return f"{self.epoch}-{seq}"
+
+    def _resume_seq(self, last_event_id: Optional[str]) -> Optional[int]:
+        """Sequence to resume after, or None when the id is not from this hub's replay window."""
+        epoch, _, seq = (last_event_id or "").partition("-")
+        if epoch != self.epoch or not seq.isdigit():
+            return None
+        seq = int(seq)
+        oldest = self._replay[0].seq if self._replay else self._seq + 1
+        return seq if seq >= oldest - 1 else None
+
+    def subscribe(self, stream_filter: StreamFilter, last_event_id: Optional[str] = None) -> Tuple[Subscriber, List[bytes]]:
+        """
+        Register a subscriber (on the event loop). Returns it with the frames to send
+        first: the missed messages when resuming, a reset when they are gone.
+        """
+        self._loop = asyncio.get_running_loop()
+        subscriber = Subscriber(stream_filter, asyncio.Queue(maxsize=self.subscriber_buffer))
+        self._subscribers.add(subscriber)
+        self._ensure_feed()
+
+        backlog: List[bytes] = []
+        if last_event_id:
+            after = self._resume_seq(last_event_id)
+            if after is None:
+                backlog.append(RESET_FRAME)
+            else:
+                backlog.extend(m.frame for m in self._replay if m.seq > after and stream_filter.matches(m))
+        return subscriber, backlog
+
+    def unsubscribe(self, subscriber: Subscriber):
+        self._subscribers.discard(subscriber)
+
+    def _kind(self, row: Dict[str, Any]) -> Optional[str]:
+        previous = self._known.get(row["id"])
+        if previous is None:
+            created_at = row.get("created_at")
+            return KIND_CREATED if created_at and parse_timestamp(created_at) >= self.started_at else KIND_UPDATED
+        score, status = previous
+        if row.get("status") != status:
+            return KIND_STATUS
+        if row.get("hype_score") != score:
+            return KIND_SCORE
+        return None
+
+    def publish(self, row: Dict[str, Any]) -> Optional[Message]:
+        """
+        Send one event's current state if its score or status changed (or it is new).
+        A no-op until the first client connected in this process.
+        """
+        loop = self._loop
+        if loop is None:
+            return None
+        try:
+            on_loop = asyncio.get_running_loop() is loop
+        except RuntimeError:
+            on_loop = False
+        if not on_loop:
+            loop.call_soon_threadsafe(self.publish, dict(row))
+            return None
+
+        kind = self._kind(row)
+        self._known[row["id"]] = (row.get("hype_score"), row.get("status"))
+        if kind is None:
+            return None
+
+        self._seq += 1
+        payload = _payload(row)
+        frame = b"id: %s\nevent: %s\ndata: %s\n\n" % (
+            self.message_id(self._seq).encode(), kind.encode(), orjson.dumps(payload)
+        )
+        message = Message(self._seq, row["id"], frozenset(payload.get("related_tickers") or ()), frame)
+        self._replay.append(message)
+        for subscriber in self._subscribers:
+            subscriber.offer(message)
+        return message
+
+    def _ensure_feed(self):
+        settings = get_settings()
+        if settings.STREAM_CHANNEL != "database":
+            return
+        if self._feed_task is None or self._feed_task.done():
+            self._feed_task = asyncio.get_running_loop().create_task(self._run_feed(settings.STREAM_POLL_SECONDS))
+
+    async def _run_feed(self, poll_seconds: float):
+        """Publish the change feed while clients are connected; stops when the last one leaves."""
+        from app.db.session import get_db
+        cursor = ChangeFeedCursor(get_settings().CHANGE_FEED_OVERLAP_SECONDS)
+        db = get_db()
+        primed = False
+        while self._subscribers:
+            try:
+                rows = await asyncio.to_thread(lambda: list(cursor.read(db, STREAM_COLUMNS)))
+                for row in rows:
+                    if primed:
+                        self.publish(row)
+                    else:
+                        # First read is the overlap window: state clients already fetched
+                        self._known.setdefault(row["id"], (row.get("hype_score"), row.get("status")))
+                primed = True
+            except Exception as e:
+                print(f"Live update feed error: {e}")
+            await asyncio.sleep(poll_seconds)
+        # Nobody listening: what was sent no longer matters to the next clients
+        self._known.clear()
+
+
+_hub: Optional[LiveUpdateHub] = None
+_hub_lock = threading.Lock()
+
+
+def get_live_update_hub() -> LiveUpdateHub:
+    global _hub
+    if _hub is None:
+        with _hub_lock:
+            if _hub is None:
+                settings = get_settings()
+                _hub = LiveUpdateHub(
+                    replay_size=settings.STREAM_REPLAY_SIZE,
+                    subscriber_buffer=settings.STREAM_SUBSCRIBER_BUFFER,
+                    max_subscribers=settings.STREAM_MAX_SUBSCRIBERS
+                )
+    return _hub
@@ -15,6 +15,12 @@ import httpx
 from datetime import date, timedelta
 from typing import Optional, Dict, Any, List
 from app.core.config import get_settings
+from app.services.crawler.fetch import SOURCE_OPENAI, fetch
+from app.services.gpt_budget import GptBudgetExceeded, get_gpt_budget
+from app.services.resilience import SourceUnavailable
+
+# Errors that are not about the article: rate limits and auth. 5xx also propagates.
+PROPAGATED_STATUSES = {401, 403, 429}
 
 
 class OpenAIService:
@@ -41,6 +47,12 @@ class OpenAIService:
         - Event must have an explicit future date (at least month/quarter)
         - Already occurred events return None
         - No date = return None
+        
+        Raises:
+            GptBudgetExceeded: The run's token/cost ceiling is reached
+            SourceUnavailable: OpenAI's circuit is open or its run deadline is spent
+            httpx.HTTPStatusError: OpenAI rate-limited (429), failed (5xx) or refused the key
+                (401/403) after retries (not "no event"); other 4xx return None
         """
         if not self.api_key:
             print("OpenAI API key not configured, skipping GPT extraction")
@@ -99,10 +111,16 @@ JSON 응답 (미래 이벤트 발견 시):
 
 JSON만 응답하세요:"""
 
+        budget = get_gpt_budget()
+        
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
+            async with budget.slot(), httpx.AsyncClient() as client:
+                response = await fetch(
+                    client,
+                    SOURCE_OPENAI,
                     self.api_url,
+                    method="POST",
+                    observe=budget.observe,
                     headers={
                         "Authorization": f"Bearer {self.api_key}",
                         "Content-Type": "application/json"
@@ -121,15 +139,18 @@ JSON만 응답하세요:"""
                         ],
                         "temperature": 0.1,  # Very low for consistent, strict extraction
                         "max_tokens": 250
-                    },
-                    timeout=30.0
+                    }
                 )
                 
                 if response.status_code != 200:
                     print(f"OpenAI API error: {response.status_code} - {response.text}")
+                    if response.status_code in PROPAGATED_STATUSES or response.status_code >= 500:
+                        response.raise_for_status()
+                    # Any other 4xx rejects this article's request; retrying it would fail the same way
                     return None
                 
                 result = response.json()
+                budget.record_usage(result.get("usage"))
                 content = result["choices"][0]["message"]["content"].strip()
                 
                 # Clean up response - remove markdown code blocks if present
@@ -185,6 +206,9 @@ JSON만 응답하세요:"""
                     "date_source": event_data.get("date_source", "")
                 }
                 
+        except (SourceUnavailable, GptBudgetExceeded, httpx.HTTPStatusError):
+            # Not "no event": let the caller retry or skip the unit
+            raise
         except json.JSONDecodeError as e:
             print(f"  Failed to parse GPT response as JSON: {e}")
             return None
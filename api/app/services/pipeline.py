@@ -0,0 +1,479 @@
+"""
+Streaming Pipeline
+
+Runs the daily job as stages connected by bounded asyncio.Queues:
+
+    claim → feed fetch → parse → triage → GPT extract → dedup → persist → score → write
+
+- Bounded queues give backpressure: a slow stage blocks its upstream instead of
+  piling items up in memory.
+- Newly persisted events are enqueued as hype units and flow straight into scoring.
+- Hype units for existing events are claimed alongside tickers, so Phase 2 scoring
+  overlaps Phase 1 network and GPT waits.
+- Google News redirect links are swapped for canonical publisher URLs (cached
+  resolutions right after parsing, network resolution for triage candidates), so
+  the seen-article filter, dedup and the duplicate check key on stable URLs.
+- Headlines already processed on earlier runs are dropped right after parsing
+  (seen-article filter), before any triage or GPT work.
+- Triage ranks each ticker's headlines by expected yield (crawler/ranking.py) and the
+  GPT stage takes the most relevant pending headline first (priority queue), so the
+  run's GPT budget is spent where events are likeliest.
+- End-to-end time approaches the slowest stage instead of the sum of all stages.
+
+Work units come from the work queue and are acked only once every item they produced
+has left the pipeline, so run checkpoints and resume keep working. While a unit is in
+flight its lease is renewed every third of WORK_LEASE_SECONDS, so a unit waiting in a
+full queue is not reclaimed by another worker.
+"""
+
+import asyncio
+import itertools
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set, Tuple
+from app.core.config import get_settings
+from app.core.constants import TICKER_NAME_MAP
+from app.services.crawler.fetch import begin_run as begin_source_run
+from app.services.crawler.ranking import rank_candidates
+from app.services.cpu_pool import run_cpu
+from app.services.gpt_budget import GptBudgetExceeded, get_gpt_budget
+from app.services.read_cache import publish_events_changed
+from app.services.seen_filter import get_seen_filter
+from app.services.url_resolver import get_url_resolver, is_google_news_url
+from app.services.work_queue import PHASE_DISCOVERY, PHASE_HYPE
+
+
+@dataclass
+class TickerJob:
+    """A claimed discovery unit and the bookkeeping for the items it fans out into."""
+    unit: Dict[str, Any]
+    ticker: str
+    crawler: Any
+    result: Dict[str, int] = field(default_factory=lambda: {
+        "created": 0, "skipped_no_date": 0, "skipped_exists": 0, "skipped_budget": 0, "skipped_seen": 0,
+        "gpt_calls": 0
+    })
+    outstanding: int = 1  # Items of this unit still inside the pipeline
+    error: Optional[str] = None
+
+
+class StreamingPipeline:
+    """
+    One drain session of the work queue as a streaming stage graph.
+
+    Args:
+        service: SchedulerService providing the repository, work queue and scoring helpers
+        run_id: Only claim units of this run (None = any open run)
+        stop: Set when the session must end at once (the leader lost its lease): in-flight
+            units are dropped unacked and their leases left to expire
+    """
+
+    # Max seconds the metrics writer waits to fill a batch before flushing
+    WRITE_LINGER_SECONDS = 0.5
+
+    def __init__(self, service, run_id: Optional[str] = None, stop: Optional[asyncio.Event] = None):
+        settings = get_settings()
+        self.service = service
+        self.run_id = run_id
+        self.stop = stop
+        self.claim_batch = settings.WORK_CLAIM_BATCH
+        self.lease_seconds = settings.WORK_LEASE_SECONDS
+        self.fetch_concurrency = settings.PIPELINE_FETCH_CONCURRENCY
+        self.gpt_concurrency = settings.PIPELINE_GPT_CONCURRENCY
+        self.score_concurrency = settings.PIPELINE_SCORE_CONCURRENCY
+        self.write_batch = settings.PIPELINE_WRITE_BATCH
+        self.top_k = settings.DISCOVERY_TOP_K
+        self.seen_filter = get_seen_filter()
+        self.url_resolver = get_url_resolver()
+
+        size = settings.PIPELINE_QUEUE_SIZE
+        self.fetch_q: asyncio.Queue = asyncio.Queue(maxsize=size)
+        self.parse_q: asyncio.Queue = asyncio.Queue(maxsize=size)
+        self.triage_q: asyncio.Queue = asyncio.Queue(maxsize=size)
+        self.gpt_q: asyncio.PriorityQueue = asyncio.PriorityQueue(maxsize=size)
+        self.dedup_q: asyncio.Queue = asyncio.Queue(maxsize=size)
+        self.persist_q: asyncio.Queue = asyncio.Queue(maxsize=size)
+        self.score_q: asyncio.Queue = asyncio.Queue(maxsize=size)
+        self.write_q: asyncio.Queue = asyncio.Queue(maxsize=size)
+
+        self._inflight: Dict[int, Dict[str, Any]] = {}  # Claimed units not yet acked/failed, by id
+        self._discovery_seen = False  # Discovery units claimed in this session
+        self._claimed = 0
+        self._progress = asyncio.Event()
+        self._seen_titles: Set[str] = set()
+        self._seen_urls: Set[str] = set()
+        self._gpt_order = itertools.count()  # Tie-breaker: FIFO within a priority
+
+    @property
+    def owner(self) -> str:
+        return self.service.worker_id
+
+    @property
+    def work_queue(self):
+        return self.service.work_queue
+
+    async def run(self) -> int:
+        """
+        Claim and process units until the queue is empty and nothing is in flight.
+
+        Returns:
+            Number of units claimed
+        """
+        workers = (
+            [self._fetch_worker() for _ in range(self.fetch_concurrency)]
+            + [self._parse_worker(), self._triage_worker()]
+            + [self._gpt_worker() for _ in range(self.gpt_concurrency)]
+            + [self._dedup_worker(), self._persist_worker()]
+            + [self._score_worker() for _ in range(self.score_concurrency)]
+            + [self._write_worker()]
+        )
+        tasks = [asyncio.create_task(w) for w in [*workers, self._lease_renewer()]]
+
+        source = asyncio.ensure_future(self._source())
+        try:
+            if self.stop is not None:
+                stopped = asyncio.ensure_future(self.stop.wait())
+                try:
+                    await asyncio.wait({source, stopped}, return_when=asyncio.FIRST_COMPLETED)
+                finally:
+                    stopped.cancel()
+                if not source.done():
+                    print(f"  Stopping: {len(self._inflight)} units left in flight (their leases will expire)")
+                    return self._claimed
+            return await source
+        finally:
+            source.cancel()
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await self.seen_filter.flush()
+
+    # --- Source -----------------------------------------------------------
+
+    async def _source(self) -> int:
+        """Feed claimed units into the graph; blocks on full queues (backpressure)."""
+        from app.services.crawler.discovery import EventDiscoveryCrawler
+
+        while True:
+            units = await self.work_queue.claim(
+                owner=self.owner,
+                limit=self.claim_batch,
+                lease_seconds=self.lease_seconds,
+                run_id=self.run_id
+            )
+
+            if not units:
+                if not self._inflight:
+                    return self._claimed
+                # Persist may still enqueue hype units for new events
+                await self._wait_for_progress()
+                continue
+
+            self._claimed += len(units)
+            for unit in units:
+                self._inflight[unit['id']] = unit
+                if unit['phase'] == PHASE_DISCOVERY:
+                    # Only discovery runs reset source deadlines and GPT/seen state
+                    # (refresh units interleave with them and would restart them at every switch)
+                    self._discovery_seen = True
+                    begin_source_run(unit['run_id'])
+                    get_gpt_budget().begin_run(unit['run_id'])
+                    await self.seen_filter.begin_run(unit['run_id'])
+                    ticker = unit['payload']['ticker']
+                    await self.fetch_q.put(TickerJob(unit, ticker, EventDiscoveryCrawler(ticker=ticker)))
+                else:
+                    if not self._discovery_seen:
+                        # Refresh-only session: the refresh run gets its own source deadlines
+                        begin_source_run(unit['run_id'])
+                    await self.score_q.put(unit)
+
+    async def _lease_renewer(self):
+        """Keep the leases of in-flight units from expiring while they wait in queues."""
+        interval = max(self.lease_seconds / 3, 1)
+        while True:
+            await asyncio.sleep(interval)
+            unit_ids = list(self._inflight)
+            if not unit_ids:
+                continue
+            try:
+                renewed = set(await self.work_queue.renew(unit_ids, self.owner, self.lease_seconds))
+            except Exception as e:
+                print(f"  Lease renewal error: {e}")
+                continue
+            lost = [i for i in unit_ids if i not in renewed and i in self._inflight]
+            if lost:
+                # Reclaimed elsewhere; our ack/fail for these will be ignored
+                print(f"  Lost the lease of {len(lost)} in-flight units")
+
+    async def _wait_for_progress(self, timeout: float = 1.0):
+        self._progress.clear()
+        try:
+            await asyncio.wait_for(self._progress.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    # --- Unit completion --------------------------------------------------
+
+    async def _finish_unit(self, unit: Dict[str, Any], result: Optional[Dict[str, Any]], error: Optional[str] = None):
+        try:
+            if error is None:
+                await self.work_queue.ack(unit, self.owner, result or {})
+            else:
+                await self.work_queue.fail(unit, self.owner, error)
+        except Exception as e:
+            # The lease will expire and the unit will be retried
+            print(f"  Work queue update error ({unit['unit_key']}): {e}")
+        finally:
+            self._inflight.pop(unit['id'], None)
+            self._progress.set()
+
+    async def _fan_out(self, job: TickerJob, count: int):
+        """One item of `job` became `count` items."""
+        job.outstanding += count - 1
+        if count == 0:
+            await self._maybe_finish_job(job)
+
+    async def _release(self, job: TickerJob, error: Optional[str] = None):
+        """One item of `job` left the pipeline."""
+        if error:
+            job.error = error
+        job.outstanding -= 1
+        await self._maybe_finish_job(job)
+
+    async def _maybe_finish_job(self, job: TickerJob):
+        if job.outstanding == 0:
+            # Persist seen marks before the ack, so a resumed run sees them
+            await self.seen_filter.flush()
+            await self._finish_unit(job.unit, job.result, job.error)
+
+    # --- Discovery stages -------------------------------------------------
+
+    async def _fetch_worker(self):
+        """Feed fetch: raw RSS payloads for a ticker."""
+        while True:
+            job = await self.fetch_q.get()
+            print(f"\nProcessing {job.ticker}...")
+            try:
+                feeds = await job.crawler.fetch_feeds()
+                await self.parse_q.put((job, feeds))
+            except Exception as e:
+                print(f"  Error fetching {job.ticker}: {e}")
+                await self._release(job, str(e))
+
+    async def _parse_worker(self):
+        """Parse: RSS XML → news items (in the CPU pool when configured)."""
+        while True:
+            job, feeds = await self.parse_q.get()
+            try:
+                news_items = []
+                for lang, content in feeds:
+                    news_items.extend(await job.crawler.parse_feed(content, lang))
+
+                # Links resolved on earlier runs: no request, just the cache
+                await self.url_resolver.apply_cached(news_items)
+                news_items, seen = await self.seen_filter.filter_new(news_items)
+                if seen:
+                    job.result["skipped_seen"] += seen
+                    print(f"  Skipped {seen} already processed news items for {job.ticker}")
+                await self.triage_q.put((job, news_items))
+            except Exception as e:
+                print(f"  Error parsing {job.ticker}: {e}")
+                await self._release(job, str(e))
+
+    async def _triage_worker(self):
+        """Triage: pick GPT candidates and drop headlines that already became events."""
+        while True:
+            job, news_items = await self.triage_q.get()
+            try:
+                candidates = await self._triage(job, news_items)
+                await self._fan_out(job, len(candidates))
+                for news in candidates:
+                    await self.gpt_q.put((-news['relevance'], next(self._gpt_order), job, news))
+            except Exception as e:
+                print(f"  Error triaging {job.ticker}: {e}")
+                await self._release(job, str(e))
+
+    async def _triage(self, job: TickerJob, news_items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        if not news_items:
+            print(f"  No news found for {job.ticker}")
+            return []
+
+        # Rank by expected yield (one headline per story), then keep the top K new ones
+        names = [job.ticker, TICKER_NAME_MAP.get(job.ticker, job.ticker)]
+        ranked = await run_cpu(rank_candidates, news_items, names)
+        print(f"  Found {len(news_items)} news items ({len(ranked)} stories) for {job.ticker}, sending to GPT...")
+
+        # Publisher URLs for the shortlist (rate-limited, each link resolved once ever)
+        await self.url_resolver.resolve_items(ranked[:self.top_k * 2])
+
+        candidates = []
+        for news in ranked:
+            if len(candidates) >= self.top_k:
+                break
+            title = news['title']
+            source_url = news.get('source_url', '')
+
+            # Same article already became an event (exact, indexed)
+            if source_url and not is_google_news_url(source_url):
+                try:
+                    if await self.service.repository.find_event_ids_by_source_url(source_url):
+                        job.result["skipped_exists"] += 1
+                        self.seen_filter.mark(news)
+                        continue
+                except Exception:
+                    pass
+
+            # Check if event with similar title exists (same story from another outlet)
+            try:
+                if await self.service.repository.find_event_ids_by_title(title[:40]):
+                    job.result["skipped_exists"] += 1
+                    self.seen_filter.mark(news)
+                    continue
+            except Exception:
+                pass
+
+            candidates.append(news)
+        return candidates
+
+    async def _gpt_worker(self):
+        """
+        GPT extract: the ONLY way to create events.
+        Concurrency and pacing come from the GPT budget (AIMD on 429s / rate-limit headers).
+        """
+        from app.services.openai_service import openai_service
+
+        while True:
+            _, _, job, news = await self.gpt_q.get()
+            try:
+                job.result["gpt_calls"] += 1
+                gpt_event = await openai_service.extract_event_from_news(
+                    ticker=job.ticker,
+                    news_title=news.get('title', ''),
+                    news_summary=news.get('description', '')
+                )
+
+                self.seen_filter.mark(news)
+
+                # STRICT: Only continue if GPT found a valid future event with date
+                if not gpt_event or not gpt_event.get('event_title') or not gpt_event.get('event_date'):
+                    job.result["skipped_no_date"] += 1
+                    await self._release(job)
+                else:
+                    await self.dedup_q.put((job, news, gpt_event))
+            except GptBudgetExceeded:
+                job.result["gpt_calls"] -= 1
+                job.result["skipped_budget"] += 1
+                await self._release(job)
+            except Exception as e:
+                print(f"  GPT error ({job.ticker}): {e}")
+                await self._release(job, str(e))
+
+    async def _dedup_worker(self):
+        """Dedup: the same event extracted from several headlines/feeds is saved once."""
+        while True:
+            job, news, gpt_event = await self.dedup_q.get()
+            try:
+                title_key = gpt_event['event_title'].lower()[:30]
+                source_url = news.get('source_url', '')
+                duplicate = title_key in self._seen_titles or source_url in self._seen_urls
+                if source_url and not is_google_news_url(source_url):
+                    self._seen_urls.add(source_url)
+                if not duplicate:
+                    self._seen_titles.add(title_key)
+                    duplicate = bool(await self.service.repository.find_event_ids_by_title(gpt_event['event_title'][:40]))
+
+                if duplicate:
+                    job.result["skipped_exists"] += 1
+                    await self._release(job)
+                else:
+                    await self.persist_q.put((job, news, gpt_event))
+            except Exception as e:
+                print(f"  Dedup error ({job.ticker}): {e}")
+                await self._release(job, str(e))
+
+    async def _persist_worker(self):
+        """Persist: insert the event and enqueue it for scoring in the same run."""
+        while True:
+            job, news, gpt_event = await self.persist_q.get()
+            try:
+                event_data = self.service._create_event_from_gpt(
+                    ticker=job.ticker,
+                    news=news,
+                    gpt_event=gpt_event
+                )
+
+                if event_data:
+                    try:
+                        created = await self.service.repository.insert_event(event_data)
+                        job.result["created"] += 1
+                        print(f"  ✓ Created: {event_data['title'][:40]}... @ {event_data['target_date']}")
+                    except Exception as e:
+                        created = None
+                        print(f"  ✗ Error inserting: {e}")
+
+                    if created:
+                        await publish_events_changed(self.service.repository)
+                        await self.work_queue.enqueue(
+                            job.unit['run_id'],
+                            PHASE_HYPE,
+                            [(str(created['id']), self.service._hype_unit_payload(created))]
+                        )
+                        self._progress.set()
+
+                await self._release(job)
+            except Exception as e:
+                print(f"  Persist error ({job.ticker}): {e}")
+                await self._release(job, str(e))
+
+    # --- Scoring stages ---------------------------------------------------
+
+    async def _score_worker(self):
+        """Score: multi-source metrics + hype score for one event."""
+        while True:
+            unit = await self.score_q.get()
+            try:
+                metrics, result = await self.service._score_event(unit['payload'])
+                if metrics is None:
+                    # No source answered: nothing to record
+                    await self._finish_unit(unit, result)
+                else:
+                    await self.write_q.put((unit, metrics, result))
+            except Exception as e:
+                print(f"    Error: {e}")
+                await self._finish_unit(unit, None, str(e))
+
+            await asyncio.sleep(0.3)
+
+    async def _write_worker(self):
+        """
+        Write: bulk insert metrics rows (COPY on the Postgres backend), then ack the units.
+        An acked unit is therefore always persisted.
+        """
+        loop = asyncio.get_running_loop()
+
+        while True:
+            batch: List[Tuple[Dict[str, Any], Dict[str, int], Dict[str, Any]]] = [await self.write_q.get()]
+            deadline = loop.time() + self.WRITE_LINGER_SECONDS
+            while len(batch) < self.write_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.write_q.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            try:
+                await self.service._save_metrics([
+                    self.service._build_metrics_row(unit['payload']['id'], metrics)
+                    for unit, metrics, _ in batch
+                ])
+            except Exception as e:
+                print(f"      Save metrics error: {e}")
+                for unit, _, _ in batch:
+                    await self._finish_unit(unit, None, f"save metrics: {e}")
+                continue
+
+            # Scores/statuses of the batch were updated before its metrics: one invalidation per batch
+            await publish_events_changed(self.service.repository)
+            for unit, _, result in batch:
+                await self._finish_unit(unit, result)
@@ -0,0 +1,214 @@
+"""
+Read Cache
+
+In-process TTL + LRU cache for API read endpoints (events listing and detail,
+calendar snapshots).
+Entries hold the serialized response body, so a hit costs a dict lookup.
+
+- Keys: endpoint + normalized query parameters
+- Invalidation: every entry remembers the data version it was built at. Writers bump
+  the version (create_event, pipeline persist/metrics writes, lifecycle sweep), which
+  invalidates every entry at once
+- Cross-process channel (READ_CACHE_CHANNEL=database): the scheduler usually runs in
+  its own worker process, so writers also bump a row in cache_versions (migration_011)
+  and API processes poll it at most every READ_CACHE_VERSION_POLL_SECONDS
+- Coalescing: concurrent misses for the same key wait for one load instead of each
+  querying the database
+- TTL bounds staleness if a bump is ever missed
+
+Endpoints are sync (threadpool), so the cache is thread-safe.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+from app.core.config import get_settings
+
+
+EVENTS_VERSION = "events"
+
+
+class ReadCache:
+    """
+    Args:
+        ttl_seconds: Max age of an entry
+        max_entries: LRU capacity
+        remote_version: Reads the shared data version (None = in-process only)
+        poll_seconds: Min seconds between two remote version reads
+        clock: Time source in seconds (injectable for tests)
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = 30.0,
+        max_entries: int = 512,
+        remote_version: Optional[Callable[[], int]] = None,
+        poll_seconds: float = 2.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.remote_version = remote_version
+        self.poll_seconds = poll_seconds
+        self.clock = clock
+
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, Tuple[Tuple[int, int], float, Any]]" = OrderedDict()
+        self._loading: Dict[Hashable, Future] = {}
+        self._local_version = 0
+        self._remote = 0
+        self._polled_at: Optional[float] = None
+        self._polling = False
+
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    # --- Versions ---------------------------------------------------------
+
+    def bump(self):
+        """Invalidate every entry of this process."""
+        with self._lock:
+            self._local_version += 1
+
+    def _version(self) -> Tuple[int, int]:
+        """Current (local, remote) version; the remote one is re-read at most every poll_seconds."""
+        if self.remote_version is not None:
+            with self._lock:
+                now = self.clock()
+                due = not self._polling and (
+                    self._polled_at is None or now - self._polled_at >= self.poll_seconds
+                )
+                if due:
+                    self._polling = True
+            if due:
+                # One thread polls; the others use the last known version meanwhile
+                try:
+                    remote = self.remote_version()
+                except Exception as e:
+                    print(f"Read cache version poll error: {e}")
+                    remote = None
+                with self._lock:
+                    if remote is not None:
+                        self._remote = remote
+                    self._polled_at = self.clock()
+                    self._polling = False
+        with self._lock:
+            return self._local_version, self._remote
+
+    # --- Entries ----------------------------------------------------------
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """
+        Cached value for `key`, or the result of `loader()` (one load per key at a time).
+        Exceptions from the loader propagate to every waiting caller and are not cached.
+        """
+        version = self._version()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry_version, stored_at, value = entry
+                if entry_version == version and self.clock() - stored_at < self.ttl_seconds:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+
+            future = self._loading.get(key)
+            if future is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                future = Future()
+                self._loading[key] = future
+                self.misses += 1
+                leader = True
+
+        if not leader:
+            return future.result()
+
+        try:
+            value = loader()
+        except BaseException as e:
+            with self._lock:
+                del self._loading[key]
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            del self._loading[key]
+            # A write during the load makes the value stale: serve it, but do not keep it
+            if self._local_version == version[0] and self._remote == version[1]:
+                self._entries[key] = (version, self.clock(), value)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        future.set_result(value)
+        return value
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced
+            }
+
+
+_read_cache: Optional[ReadCache] = None
+_read_cache_lock = threading.Lock()
+
+
+def _read_remote_version() -> int:
+    from app.db.session import get_db
+    response = get_db().table("cache_versions").select("version").eq("name", EVENTS_VERSION).execute()
+    return int(response.data[0]["version"]) if response.data else 0
+
+
+def get_read_cache() -> ReadCache:
+    """Return the process-wide read cache."""
+    global _read_cache
+    if _read_cache is None:
+        with _read_cache_lock:
+            if _read_cache is None:
+                settings = get_settings()
+                _read_cache = ReadCache(
+                    ttl_seconds=settings.READ_CACHE_TTL_SECONDS,
+                    max_entries=settings.READ_CACHE_MAX_ENTRIES,
+                    remote_version=_read_remote_version if settings.READ_CACHE_CHANNEL == "database" else None,
+                    poll_seconds=settings.READ_CACHE_VERSION_POLL_SECONDS
+                )
+    return _read_cache
+
+
+def cached_read(key: Hashable, loader: Callable[[], Any]) -> Any:
+    """`loader()` through the process-wide read cache, or directly when it is disabled."""
+    if not get_settings().READ_CACHE_ENABLED:
+        return loader()
+    return get_read_cache().get_or_load(key, loader)
+
+
+def invalidate_events(db=None):
+    """
+    Sync writers (API endpoints): invalidate this process and, with the database
+    channel, every other API process.
+    """
+    get_read_cache().bump()
+    if db is not None and get_settings().READ_CACHE_CHANNEL == "database":
+        try:
+            db.rpc("bump_cache_version", {"p_name": EVENTS_VERSION}).execute()
+        except Exception as e:
+            print(f"Read cache invalidation error: {e}")
+
+
+async def publish_events_changed(repository):
+    """Async writers (pipeline, lifecycle): same as invalidate_events, via the repository."""
+    get_read_cache().bump()
+    if get_settings().READ_CACHE_CHANNEL == "database":
+        try:
+            await repository.bump_cache_version(EVENTS_VERSION)
+        except Exception as e:
+            print(f"Read cache invalidation error: {e}")
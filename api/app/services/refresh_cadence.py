@@ -0,0 +1,209 @@
+"""
+Adaptive Refresh Cadence
+
+Replaces "re-score every event once a night" with a per-event next_refresh_at:
+
+- Interval between REFRESH_MIN_HOURS (hot, imminent, moving events) and
+  REFRESH_MAX_HOURS (cold, far-out, flat events), interpolated on a log scale from
+  an urgency built of hype score, days until target_date and score volatility
+  (EWMA of score changes between refreshes)
+- A leader-only tick (every REFRESH_TICK_SECONDS) claims the most overdue events from
+  the events table (next_refresh_at index = the priority queue; claiming pushes
+  next_refresh_at out by CLAIM_RETRY_HOURS) and enqueues them as hype work units,
+  which every worker drains through the streaming pipeline
+- A global token bucket caps refreshes per day. By default it equals the number of
+  live events, i.e. the same upstream traffic as one nightly pass, spent where it matters
+
+Scoring writes the next next_refresh_at (see SchedulerService._score_event). The tick
+also re-renders the calendar snapshots every SNAPSHOT_REPUBLISH_MINUTES, so rescored
+and newly published events do not wait for the nightly run to reach them.
+"""
+
+import math
+import random
+import time
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Callable, Optional
+from app.core.config import get_settings
+from app.services.leader_lock import LeaderLock, get_lease_store
+from app.services.work_queue import PHASE_HYPE
+
+
+# Days before target_date from which an event counts as imminent
+IMMINENT_DAYS = 7
+# Days before target_date at which proximity stops adding urgency
+FAR_DAYS = 90
+# Score change per refresh that counts as fully volatile
+VOLATILE_SCORE_DELTA = 10
+# EWMA weight of the latest score change
+VOLATILITY_ALPHA = 0.3
+# Spread of next_refresh_at so refreshes scheduled together do not burst together
+INTERVAL_JITTER = 0.1
+# A claimed event is due again after this long if its refresh never completes
+CLAIM_RETRY_HOURS = 6
+
+
+def _clamp(value: float) -> float:
+    return min(max(value, 0.0), 1.0)
+
+
+def update_volatility(previous: Optional[float], score_delta: int) -> float:
+    """EWMA of absolute score changes between refreshes."""
+    if previous is None:
+        return float(abs(score_delta))
+    return (1 - VOLATILITY_ALPHA) * previous + VOLATILITY_ALPHA * abs(score_delta)
+
+
+def refresh_urgency(hype_score: int, volatility: float, days_until: int) -> float:
+    """0 (cold, far out, flat) to 1 (hot, imminent, moving)."""
+    heat = _clamp(hype_score / 100)
+    if days_until <= IMMINENT_DAYS:
+        proximity = 1.0
+    else:
+        proximity = _clamp(1 - (days_until - IMMINENT_DAYS) / (FAR_DAYS - IMMINENT_DAYS))
+    motion = _clamp(volatility / VOLATILE_SCORE_DELTA)
+    return _clamp(0.5 * proximity + 0.5 * heat + 0.25 * motion)
+
+
+def refresh_interval(
+    hype_score: int,
+    volatility: float,
+    days_until: int,
+    min_hours: float = 1,
+    max_hours: float = 168
+) -> timedelta:
+    """Time until the next refresh: max_hours at urgency 0, min_hours at urgency 1."""
+    urgency = refresh_urgency(hype_score, volatility, days_until)
+    hours = max_hours * math.pow(min_hours / max_hours, urgency)
+    return timedelta(hours=hours)
+
+
+def days_until(target_date: Any, today: Optional[date] = None) -> int:
+    today = today or date.today()
+    try:
+        return (date.fromisoformat(str(target_date)[:10]) - today).days
+    except ValueError:
+        return FAR_DAYS
+
+
+def next_refresh_at(hype_score: int, volatility: float, target_date: Any) -> str:
+    """ISO timestamp of the next refresh (with jitter)."""
+    settings = get_settings()
+    interval = refresh_interval(
+        hype_score,
+        volatility,
+        days_until(target_date),
+        min_hours=settings.REFRESH_MIN_HOURS,
+        max_hours=settings.REFRESH_MAX_HOURS
+    )
+    interval *= 1 + random.uniform(-INTERVAL_JITTER, INTERVAL_JITTER)
+    return (datetime.now(timezone.utc) + interval).isoformat()
+
+
+class RefreshBudget:
+    """
+    Token bucket of event refreshes: `per_day` tokens a day, at most `burst` saved up.
+
+    Args:
+        clock: Time source in seconds (injectable for tests)
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self.clock = clock
+        self.per_day = 0.0
+        self.tokens = 0.0
+        self._last: Optional[float] = None
+
+    def refill(self, per_day: float, burst: float):
+        """Accrue tokens since the last refill (the bucket starts full)."""
+        now = self.clock()
+        self.per_day = per_day
+        if self._last is None:
+            self.tokens = burst
+        else:
+            self.tokens = min(self.tokens + (now - self._last) * per_day / 86400, burst)
+        self._last = now
+
+    def take(self, wanted: int) -> int:
+        granted = min(int(self.tokens), wanted)
+        self.tokens -= granted
+        return granted
+
+    def give_back(self, count: int):
+        self.tokens += count
+
+
+class RefreshScheduler:
+    """
+    Enqueues due events as hype units, most overdue first, within the refresh budget.
+
+    Args:
+        service: SchedulerService providing the repository, work queue and unit payloads
+    """
+
+    def __init__(self, service):
+        settings = get_settings()
+        self.service = service
+        self.tick_seconds = settings.REFRESH_TICK_SECONDS
+        self.budget_per_day = settings.REFRESH_BUDGET_PER_DAY
+        self.budget = RefreshBudget()
+        self.republish_seconds = settings.SNAPSHOT_REPUBLISH_MINUTES * 60
+        self.lock = LeaderLock(
+            get_lease_store(),
+            name="refresh_tick",
+            ttl_seconds=max(self.tick_seconds * 2, 30),
+            owner=service.worker_id
+        )
+
+    async def tick(self) -> int:
+        """
+        One scheduling pass (leader only).
+
+        Returns:
+            Number of events enqueued
+        """
+        async with self.lock.hold() as acquired:
+            if not acquired:
+                return 0
+
+            await self._republish_snapshots()
+
+            repository = self.service.repository
+            per_day = self.budget_per_day or await repository.count_live_events()
+            # At most an hour of budget is saved up, so an idle spell cannot turn into a burst
+            self.budget.refill(per_day, burst=max(per_day / 24, 1))
+
+            granted = self.budget.take(max(int(per_day / 24), 1))
+            if not granted:
+                return 0
+
+            now = datetime.now(timezone.utc)
+            retry_at = now + timedelta(hours=CLAIM_RETRY_HOURS)
+            try:
+                events = await repository.claim_due_events(now.isoformat(), granted, retry_at.isoformat())
+            except Exception:
+                self.budget.give_back(granted)
+                raise
+            self.budget.give_back(granted - len(events))
+            if not events:
+                return 0
+
+            # One unit per claim (an event can be refreshed several times a day)
+            run_id = f"refresh-{now.strftime('%Y%m%d')}"
+            await self.service.work_queue.enqueue(
+                run_id,
+                PHASE_HYPE,
+                [
+                    (f"{event['id']}@{now.strftime('%H%M%S')}", self.service._hype_unit_payload(event))
+                    for event in events
+                ]
+            )
+            print(f"[Refresh] Enqueued {len(events)} due events ({run_id}, budget {per_day:.0f}/day)")
+            return len(events)
+
+    async def _republish_snapshots(self):
+        """Re-render the calendar snapshots when the last render is older than the republish interval."""
+        published_at = self.service.snapshot_publisher.published_at
+        if published_at is not None and time.monotonic() - published_at < self.republish_seconds:
+            return
+        await self.service.publish_snapshots()
@@ -0,0 +1,271 @@
+"""
+Upstream Resilience
+
+Per-source guards for the external services the pipeline depends on
+(Google News, Reddit, OpenAI), so a degraded host costs seconds instead of a
+full timeout on every call:
+
+- Retry: exponential backoff with full jitter on 429/5xx and network errors
+- Circuit breaker: opens after consecutive failures and fails fast until a
+  cool-down has passed, then lets one trial call through (half-open)
+- Per-run deadline: each source may spend at most N seconds failing during one
+  pipeline run; after that it is skipped for the rest of the run
+
+RateLimiter spaces out request starts for hosts with a request budget (article
+pages, email batches).
+
+Hedging (optional, per source): if a request has not answered by the observed p90
+latency, a second copy is sent and the first answer wins. A global hedge budget
+keeps the extra load to a fixed fraction of requests.
+
+Callers catch SourceUnavailable and degrade (e.g. score without that source).
+HTTP wiring lives in app/services/crawler/fetch.py.
+"""
+
+import asyncio
+import math
+import random
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Deque, Optional
+
+
+BREAKER_CLOSED = "CLOSED"
+BREAKER_OPEN = "OPEN"
+BREAKER_HALF_OPEN = "HALF_OPEN"
+
+
+class SourceUnavailable(Exception):
+    """Raised instead of calling a source whose breaker is open or whose run deadline is spent."""
+
+    def __init__(self, source: str, reason: str):
+        super().__init__(f"{source} unavailable: {reason}")
+        self.source = source
+        self.reason = reason
+
+
+@dataclass
+class RetryPolicy:
+    """Backoff settings for one source."""
+    max_attempts: int = 3
+    base_delay: float = 0.5
+    max_delay: float = 8.0
+
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """
+        Delay before retry number `attempt` (1-based): full jitter over an exponential cap.
+        A server-provided Retry-After is honoured but still capped at max_delay.
+        """
+        if retry_after is not None:
+            return min(max(retry_after, 0.0), self.max_delay)
+        cap = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        return random.uniform(0, cap)
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    Args:
+        failure_threshold: Consecutive failures that open the breaker
+        reset_seconds: How long the breaker stays open before a trial call
+        clock: Time source in seconds (injectable for tests)
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_seconds: float = 60.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.clock = clock
+        self.state = BREAKER_CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+
+    def allow(self) -> bool:
+        """Whether a call may go out now."""
+        if self.state == BREAKER_CLOSED:
+            return True
+        if self.state == BREAKER_OPEN and self.clock() - self._opened_at >= self.reset_seconds:
+            self.state = BREAKER_HALF_OPEN
+        if self.state == BREAKER_HALF_OPEN and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        return False
+
+    def record_success(self):
+        self.state = BREAKER_CLOSED
+        self.failures = 0
+        self._trial_in_flight = False
+
+    def release_trial(self):
+        """The half-open trial ended without a verdict (cancelled, local error): allow another."""
+        self._trial_in_flight = False
+
+    def record_failure(self):
+        self.failures += 1
+        self._trial_in_flight = False
+        if self.state == BREAKER_HALF_OPEN or self.failures >= self.failure_threshold:
+            self.state = BREAKER_OPEN
+            self._opened_at = self.clock()
+
+
+class SourceGuard:
+    """
+    Retry policy, circuit breaker and per-run failure deadline for one upstream source.
+
+    Args:
+        name: Source name used in logs and errors
+        retry: Backoff settings
+        breaker: Circuit breaker for the source
+        timeout: Per-attempt timeout in seconds
+        run_deadline_seconds: Seconds the source may spend failing during one run
+        clock: Time source in seconds (injectable for tests)
+    """
+
+    def __init__(
+        self,
+        name: str,
+        retry: RetryPolicy,
+        breaker: CircuitBreaker,
+        timeout: float,
+        run_deadline_seconds: float,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.name = name
+        self.retry = retry
+        self.breaker = breaker
+        self.timeout = timeout
+        self.run_deadline_seconds = run_deadline_seconds
+        self.clock = clock
+        self.run_id: Optional[str] = None
+        self.failure_seconds = 0.0  # Time lost to failed attempts and backoff in the current run
+
+    def begin_run(self, run_id: Optional[str]):
+        """Reset the run deadline when a new run starts (no-op for the current run)."""
+        if run_id != self.run_id:
+            self.run_id = run_id
+            self.failure_seconds = 0.0
+
+    @property
+    def remaining_seconds(self) -> float:
+        return self.run_deadline_seconds - self.failure_seconds
+
+    def check(self) -> bool:
+        """
+        Raise SourceUnavailable if the source should be skipped right now.
+        Returns True when the call is the breaker's half-open trial.
+        """
+        if self.remaining_seconds <= 0:
+            raise SourceUnavailable(self.name, "run deadline exceeded")
+        if not self.breaker.allow():
+            raise SourceUnavailable(self.name, "circuit open")
+        return self.breaker.state == BREAKER_HALF_OPEN
+
+    def attempt_timeout(self) -> float:
+        """Per-attempt timeout, never longer than what is left of the run deadline."""
+        return max(min(self.timeout, self.remaining_seconds), 0.1)
+
+    def record_success(self):
+        self.breaker.record_success()
+
+    def record_failure(self, elapsed: float):
+        self.failure_seconds += elapsed
+        self.breaker.record_failure()
+
+    async def sleep_before_retry(self, attempt: int, retry_after: Optional[float] = None) -> bool:
+        """
+        Back off before the next attempt. Returns False when there is no attempt left
+        (attempts exhausted, or the backoff would overrun the run deadline).
+        """
+        if attempt >= self.retry.max_attempts:
+            return False
+        delay = self.retry.backoff(attempt, retry_after)
+        if delay >= self.remaining_seconds:
+            return False
+        self.failure_seconds += delay
+        await asyncio.sleep(delay)
+        return True
+
+
+class RateLimiter:
+    """
+    Spaces out request starts to at most `rate` per second (0 = unlimited).
+    """
+
+    def __init__(self, rate: float):
+        self.interval = 1 / rate if rate > 0 else 0.0
+        self._next = 0.0
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def wait(self):
+        if not self.interval:
+            return
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        loop = asyncio.get_running_loop()
+        async with self._lock:
+            now = loop.time()
+            start = max(now, self._next)
+            self._next = start + self.interval
+        if start > now:
+            await asyncio.sleep(start - now)
+
+
+class LatencyWindow:
+    """
+    Recent request latencies for one source, for percentile-based hedge delays.
+
+    Args:
+        size: Number of most recent samples kept
+        min_samples: Samples needed before a percentile is reported
+    """
+
+    def __init__(self, size: int = 200, min_samples: int = 20):
+        self.min_samples = min_samples
+        self._samples: Deque[float] = deque(maxlen=size)
+
+    def record(self, seconds: float):
+        self._samples.append(seconds)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Nearest-rank percentile (q in 0-1), or None while warming up."""
+        if len(self._samples) < self.min_samples:
+            return None
+        ordered = sorted(self._samples)
+        index = min(max(math.ceil(q * len(ordered)) - 1, 0), len(ordered) - 1)
+        return ordered[index]
+
+
+class HedgeBudget:
+    """
+    Token bucket shared by all sources: every request earns `ratio` tokens and every
+    hedge spends one, so hedges stay at most ~ratio of requests (plus a small burst).
+
+    Args:
+        ratio: Hedges allowed per request (0 disables hedging)
+        burst: Maximum tokens saved up
+    """
+
+    def __init__(self, ratio: float = 0.1, burst: float = 10.0):
+        self.ratio = ratio
+        self.burst = burst
+        self.tokens = 0.0
+        self.requests = 0
+        self.hedges = 0
+
+    def record_request(self):
+        self.requests += 1
+        self.tokens = min(self.tokens + self.ratio, self.burst)
+
+    def try_spend(self) -> bool:
+        if self.ratio <= 0 or self.tokens < 1:
+            return False
+        self.tokens -= 1
+        self.hedges += 1
+        return True
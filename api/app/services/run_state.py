@@ -0,0 +1,233 @@
+"""
+Pipeline Run State
+
+Persists daily runs under a run id so that a restarted (deploy) or manually triggered
+job resumes the incomplete run instead of starting again from ticker #1.
+
+- The run row records status, the current phase checkpoint and the leader that owns it.
+- A run without a leader is a request (admin "manual crawl"): the API only inserts
+  the row, and the worker's leader picks it up and runs it like any other run.
+- Per-unit checkpoints (ticker discovered, event scored) are the DONE rows in the
+  work queue; re-enqueueing a resumed run skips them automatically.
+
+Stores:
+- DatabaseRunStore: pipeline_runs table via the repository (migration_005)
+- InMemoryRunStore: used with WORK_QUEUE=memory, whose claims it releases
+"""
+
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+from app.core.config import get_settings
+
+
+RUN_RUNNING = "RUNNING"
+RUN_COMPLETED = "COMPLETED"
+RUN_ABANDONED = "ABANDONED"
+
+
+def new_run_id() -> str:
+    return f"run-{datetime.now().strftime('%Y%m%d-%H%M%S')}"
+
+
+def run_started_at(run: Dict[str, Any]) -> datetime:
+    """
+    Parse a run's started_at (datetime from asyncpg, ISO string from PostgREST) as UTC.
+    """
+    value = run.get("started_at")
+    if isinstance(value, str):
+        value = value.replace("Z", "+00:00")
+        try:
+            value = datetime.fromisoformat(value)
+        except ValueError:
+            # Python 3.10 rejects non-6-digit fractions; seconds precision is enough here
+            value = datetime.fromisoformat(value[:19])
+    if value is None:
+        return datetime.now(timezone.utc)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value
+
+
+class RunStore(ABC):
+    """
+    Abstract store for pipeline run records.
+    """
+
+    @abstractmethod
+    async def get_incomplete_run(self) -> Optional[Dict[str, Any]]:
+        pass
+
+    @abstractmethod
+    async def create_run(self, run_id: str, leader: str) -> Dict[str, Any]:
+        pass
+
+    @abstractmethod
+    async def update_run(self, run_id: str, data: Dict[str, Any]) -> None:
+        pass
+
+    @abstractmethod
+    def request_run(self, db=None) -> Dict[str, Any]:
+        """
+        Ask the worker for a run (sync, for request handlers; `db` is the request's client).
+        Returns the incomplete run instead when there is one.
+        """
+        pass
+
+    @abstractmethod
+    async def release_claims(self, run_id: str, owner: str) -> int:
+        """Requeue expired units still claimed by a previous leader (FAILED once out of attempts)."""
+        pass
+
+    @abstractmethod
+    async def fail_open_units(self, run_id: str, error: str) -> int:
+        """Mark the run's QUEUED and CLAIMED units FAILED so no worker picks them up."""
+        pass
+
+    async def set_phase(self, run_id: str, phase: str) -> None:
+        await self.update_run(run_id, {"phase": phase})
+
+    async def complete_run(self, run_id: str, summary: Dict[str, Any]) -> None:
+        await self.update_run(run_id, {
+            "status": RUN_COMPLETED,
+            "summary": summary,
+            "finished_at": datetime.now(timezone.utc).isoformat()
+        })
+
+    async def abandon_run(self, run_id: str) -> None:
+        # Otherwise drain_work_queue would keep claiming the units of a run nobody finishes
+        await self.fail_open_units(run_id, "run abandoned")
+        await self.update_run(run_id, {
+            "status": RUN_ABANDONED,
+            "finished_at": datetime.now(timezone.utc).isoformat()
+        })
+
+
+class DatabaseRunStore(RunStore):
+    """
+    Run store backed by the pipeline_runs table.
+    """
+
+    def __init__(self, repository, max_attempts: int = 3):
+        self.repository = repository
+        self.max_attempts = max_attempts
+
+    async def get_incomplete_run(self) -> Optional[Dict[str, Any]]:
+        return await self.repository.get_incomplete_run()
+
+    async def create_run(self, run_id: str, leader: str) -> Dict[str, Any]:
+        run = {
+            "run_id": run_id,
+            "status": RUN_RUNNING,
+            "leader": leader,
+            "started_at": datetime.now(timezone.utc).isoformat()
+        }
+        await self.repository.insert_pipeline_run(run)
+        return run
+
+    async def update_run(self, run_id: str, data: Dict[str, Any]) -> None:
+        await self.repository.update_pipeline_run(run_id, data)
+
+    def request_run(self, db=None) -> Dict[str, Any]:
+        if db is None:
+            from app.db.session import get_db
+            db = get_db()
+        running = db.table("pipeline_runs")\
+            .select("run_id, leader, phase, started_at")\
+            .eq("status", RUN_RUNNING)\
+            .order("started_at", desc=True)\
+            .limit(1)\
+            .execute()
+        if running.data:
+            return running.data[0]
+        run = {
+            "run_id": new_run_id(),
+            "status": RUN_RUNNING,
+            "leader": None,
+            "started_at": datetime.now(timezone.utc).isoformat()
+        }
+        db.table("pipeline_runs").insert(run).execute()
+        return run
+
+    async def release_claims(self, run_id: str, owner: str) -> int:
+        return await self.repository.release_work_unit_claims(run_id, owner, self.max_attempts)
+
+    async def fail_open_units(self, run_id: str, error: str) -> int:
+        return await self.repository.fail_open_work_units(run_id, error)
+
+
+class InMemoryRunStore(RunStore):
+    """
+    In-process run store. Pair it with InMemoryWorkQueue so claims can be released.
+    """
+
+    def __init__(self, work_queue=None):
+        self.work_queue = work_queue
+        self._runs: List[Dict[str, Any]] = []
+
+    async def get_incomplete_run(self) -> Optional[Dict[str, Any]]:
+        running = [r for r in self._runs if r["status"] == RUN_RUNNING]
+        return dict(running[-1]) if running else None
+
+    async def create_run(self, run_id: str, leader: str) -> Dict[str, Any]:
+        run = {
+            "run_id": run_id,
+            "status": RUN_RUNNING,
+            "phase": None,
+            "leader": leader,
+            "summary": None,
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "finished_at": None
+        }
+        self._runs.append(run)
+        return dict(run)
+
+    async def update_run(self, run_id: str, data: Dict[str, Any]) -> None:
+        for run in self._runs:
+            if run["run_id"] == run_id:
+                run.update(data)
+
+    def request_run(self, db=None) -> Dict[str, Any]:
+        running = [r for r in self._runs if r["status"] == RUN_RUNNING]
+        if running:
+            return dict(running[-1])
+        run = {
+            "run_id": new_run_id(),
+            "status": RUN_RUNNING,
+            "phase": None,
+            "leader": None,
+            "summary": None,
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "finished_at": None
+        }
+        self._runs.append(run)
+        return dict(run)
+
+    async def release_claims(self, run_id: str, owner: str) -> int:
+        if self.work_queue is None:
+            return 0
+        return await self.work_queue.release_claims(run_id, owner)
+
+    async def fail_open_units(self, run_id: str, error: str) -> int:
+        if self.work_queue is None:
+            return 0
+        return await self.work_queue.fail_open_units(run_id, error)
+
+
+_in_memory_store: Optional[InMemoryRunStore] = None
+
+
+def get_run_store() -> RunStore:
+    """
+    Return the run store matching the configured work queue backend.
+    """
+    global _in_memory_store
+
+    if get_settings().WORK_QUEUE == "memory":
+        if _in_memory_store is None:
+            from app.services.work_queue import get_work_queue
+            _in_memory_store = InMemoryRunStore(get_work_queue())
+        return _in_memory_store
+
+    from app.db.repository import get_repository
+    return DatabaseRunStore(get_repository(), max_attempts=get_settings().WORK_MAX_ATTEMPTS)
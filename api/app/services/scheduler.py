@@ -4,20 +4,47 @@ Scheduler Service
 Main daily job pipeline:
 1. Discovery: Crawl news for each target ticker
 2. GPT Extraction: Extract ONLY future events (2-6 months) with explicit dates
-3. Multi-source Hype: Collect data from News, Reddit, Naver
-4. Score Calculation: Weighted hype score
-5. Auto-publish: ACTIVE if score >= 50 AND confidence >= 0.7
+3. Lifecycle: Finish past events, archive their metrics, freeze stale PENDING events
+   (see app/services/lifecycle.py)
+4. Multi-source Hype: Collect data from News, Reddit, Naver
+5. Score Calculation: Weighted hype score
+6. Auto-publish: ACTIVE if score >= 50 AND confidence >= 0.7
+7. Calendar snapshots: pre-compressed ACTIVE calendar for /api/v1/calendar
+   (see app/services/calendar_snapshots.py)
+
+Sharding: the daily job is split into work units (tickers for Phase 1, events for
+Phase 2) in a durable work queue. Every worker process drains the queue, so the
+ticker universe scales by adding workers.
+
+Streaming: each worker drains the queue through a staged pipeline with bounded
+queues (see app/services/pipeline.py), so scoring overlaps discovery.
 
 STRICT RULE: Events WITHOUT explicit future dates are NOT saved.
 """
 
 import asyncio
 import os
-from datetime import datetime, date, timedelta
-from typing import List, Dict, Any, Optional
+from datetime import datetime, date, timedelta, timezone
+from typing import List, Dict, Any, Optional, Tuple
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
-from app.db.session import get_db
+from app.core.config import get_settings
+from app.db.repository import get_repository
 from app.services.hype_calculator import HypeCalculator
+from app.services.leader_lock import LeaderLock, default_owner_id, get_lease_store
+from app.services.work_queue import PHASE_DISCOVERY, PHASE_HYPE, get_work_queue
+from app.services.run_state import get_run_store, new_run_id, run_started_at
+from app.services.pipeline import StreamingPipeline
+from app.services.gpt_budget import get_gpt_budget
+from app.services.lifecycle import get_lifecycle_sweeper
+from app.services.refresh_cadence import CLAIM_RETRY_HOURS, RefreshScheduler, next_refresh_at, update_volatility
+from app.services.calendar_snapshots import get_snapshot_publisher
+from app.services.leaderboard import get_leaderboard
+from app.services.live_updates import get_live_update_hub
+from app.services.email_outbox import get_email_delivery_worker
+
+
+# Metrics that come from an upstream source (news_ranking is not collected yet)
+SOURCE_METRIC_KEYS = ("news_count", "reddit_posts", "reddit_engagement", "naver_buzz")
 
 
 class SchedulerService:
@@ -27,12 +54,70 @@ class SchedulerService:
     
     def __init__(self):
         self.scheduler = AsyncIOScheduler()
-        self.supabase = get_db()
-        self._is_running = False
+        self.repository = get_repository()
+        self._is_running = False  # Local guard; the leader lock covers other instances
+        self.worker_id = default_owner_id()
+        self.leader_lock = LeaderLock(
+            get_lease_store(),
+            name="daily_update",
+            ttl_seconds=get_settings().JOB_LEASE_TTL_SECONDS,
+            owner=self.worker_id
+        )
+        self.work_queue = get_work_queue()
+        self.run_store = get_run_store()
+        self._is_draining = False
+        self._lifecycle: Optional[Dict[str, int]] = None  # Last sweep of this leader's run
+        self.snapshot_publisher = get_snapshot_publisher(self.repository)
+        self.refresh_scheduler = RefreshScheduler(self)
+        self.email_worker = get_email_delivery_worker(self.worker_id)
 
     def start(self, run_immediately: bool = False):
         """Start the scheduler."""
+        settings = get_settings()
         self.scheduler.add_job(self.daily_update_job, 'cron', hour=0, minute=0, id='daily_update')
+        if settings.REFRESH_SCHEDULER_ENABLED:
+            # Phase 2 scoring: due events enqueued continuously by the refresh cadence
+            self.scheduler.add_job(
+                self.refresh_tick,
+                'interval',
+                seconds=settings.REFRESH_TICK_SECONDS,
+                id='refresh_tick',
+                max_instances=1,
+                coalesce=True
+            )
+        self.scheduler.add_job(
+            self.drain_work_queue,
+            'interval',
+            seconds=settings.WORK_POLL_SECONDS,
+            id='work_queue_drain',
+            max_instances=1,
+            coalesce=True
+        )
+        # Email outbox: alert emails are queued by the API and delivered here
+        self.scheduler.add_job(
+            self.deliver_emails,
+            'interval',
+            seconds=settings.EMAIL_OUTBOX_POLL_SECONDS,
+            id='email_outbox_drain',
+            max_instances=1,
+            coalesce=True
+        )
+        # Runs requested through the API (admin manual crawl)
+        self.scheduler.add_job(
+            self.pick_up_requested_run,
+            'interval',
+            seconds=settings.WORK_POLL_SECONDS,
+            id='run_requests',
+            max_instances=1,
+            coalesce=True
+        )
+        # Pick up a run interrupted by a restart/deploy
+        self.scheduler.add_job(
+            self.resume_incomplete_run,
+            'date',
+            run_date=datetime.now() + timedelta(seconds=5),
+            id='resume_incomplete_run'
+        )
         self.scheduler.start()
         print("Scheduler started...")
         
@@ -52,122 +137,248 @@ class SchedulerService:
         print("Scheduler shut down...")
 
     async def daily_update_job(self):
-        """Main daily pipeline."""
+        """
+        Main daily pipeline (leader only).
+        
+        The leader splits the run into work units and enqueues them; every worker
+        (including the leader) drains the queue through the streaming pipeline, and
+        the leader aggregates the summary.
+        An incomplete run is resumed: units already DONE are not repeated.
+        """
         if self._is_running:
             print("Job already running, skipping...")
             return
             
         self._is_running = True
-        print(f"\n{'='*60}")
-        print(f"[{datetime.now()}] Starting daily update job...")
-        print(f"{'='*60}\n")
         
         try:
-            await self._phase_discovery()
-            await self._phase_hype_calculation()
-            
-            print(f"\n{'='*60}")
-            print(f"[{datetime.now()}] Daily update job completed.")
-            print(f"{'='*60}\n")
+            async with self.leader_lock.hold() as acquired:
+                if not acquired:
+                    print("Another instance holds the daily_update lease, skipping...")
+                    return
+                
+                run = await self._resume_or_create_run()
+                run_id = run['run_id']
+                self._lifecycle = None
+                
+                print(f"\n{'='*60}")
+                print(f"[{datetime.now()}] Starting daily update job ({run_id})...")
+                print(f"{'='*60}\n")
+                
+                # Checkpoint: once both phases are enqueued, a resumed run only drains
+                if run.get('phase') != PHASE_HYPE:
+                    await self.run_store.set_phase(run_id, PHASE_DISCOVERY)
+                    await self._phase_discovery(run_id)
+                    await self._phase_hype_calculation(run_id)
+                    await self.run_store.set_phase(run_id, PHASE_HYPE)
+                
+                # Tickers and existing events are drained together, so Phase 2
+                # scoring overlaps Phase 1 network and GPT waits
+                await self._drain_until_complete(run_id)
+                
+                if not self.leader_lock.is_held:
+                    return
+                
+                summary = await self.work_queue.summarize(run_id)
+                summary["gpt"] = get_gpt_budget().snapshot()  # This worker's GPT usage
+                if self._lifecycle is not None:
+                    summary["lifecycle"] = self._lifecycle
+                snapshots = await self.publish_snapshots()
+                if snapshots is not None:
+                    summary["snapshots"] = snapshots
+                await self.run_store.complete_run(run_id, summary)
+                self._print_run_summary(summary)
+                
+                print(f"\n{'='*60}")
+                print(f"[{datetime.now()}] Daily update job completed.")
+                print(f"{'='*60}\n")
             
         except Exception as e:
             print(f"Critical error in daily job: {e}")
         finally:
             self._is_running = False
 
-    async def _phase_discovery(self):
+    async def resume_incomplete_run(self):
+        """Startup job: resume a run left incomplete by a restart, if any."""
+        try:
+            if await self.run_store.get_incomplete_run():
+                print("Found incomplete pipeline run, resuming...")
+                await self.daily_update_job()
+        except Exception as e:
+            print(f"Resume check error: {e}")
+
+    async def pick_up_requested_run(self):
+        """Worker job: start a run requested through the API (a RUNNING run without a leader)."""
+        if self._is_running:
+            return
+        try:
+            run = await self.run_store.get_incomplete_run()
+            if run and not run.get('leader'):
+                print(f"Run {run['run_id']} was requested, starting...")
+                await self.daily_update_job()
+        except Exception as e:
+            print(f"Run request check error: {e}")
+
+    async def _resume_or_create_run(self) -> Dict[str, Any]:
+        """
+        Return the incomplete run to resume, or start a new one.
+        Runs older than RUN_RESUME_MAX_AGE_HOURS are abandoned instead of resumed.
+        """
+        settings = get_settings()
+        run = await self.run_store.get_incomplete_run()
+        
+        if run:
+            age = datetime.now(timezone.utc) - run_started_at(run)
+            if age <= timedelta(hours=settings.RUN_RESUME_MAX_AGE_HOURS):
+                print(f"Resuming incomplete run {run['run_id']} (phase: {run.get('phase')})")
+                previous_leader = run.get('leader')
+                if previous_leader != self.worker_id:
+                    if previous_leader:
+                        # The previous leader is gone (we hold the lease). Claims whose lease already
+                        # expired are reissued now; the rest are reclaimed by claim once they expire,
+                        # so a leader that is still finishing a unit never races a second copy
+                        released = await self.run_store.release_claims(run['run_id'], previous_leader)
+                        if released:
+                            print(f"  Requeued {released} units claimed by {previous_leader}")
+                    # A requested run (no leader yet) is taken over the same way
+                    await self.run_store.update_run(run['run_id'], {"leader": self.worker_id})
+                return run
+            
+            print(f"Abandoning stale run {run['run_id']} (started {age} ago)")
+            await self.run_store.abandon_run(run['run_id'])
+        
+        return await self.run_store.create_run(new_run_id(), self.worker_id)
+
+    async def _phase_discovery(self, run_id: str):
         """
         Phase 1: Discover new FUTURE events using news + GPT.
+        Enqueues one work unit per ticker.
         
         STRICT: Only saves events where GPT successfully extracts a future date.
         No fallback to default dates.
         """
         from app.core.constants import TARGET_TICKERS
-        from app.services.crawler.discovery import EventDiscoveryCrawler
-        from app.services.openai_service import openai_service
         
         print(f"\n[Phase 1] Event Discovery for {len(TARGET_TICKERS)} tickers...")
         print("STRICT MODE: Only events with GPT-extracted future dates will be saved.\n")
         
-        events_created = 0
-        events_skipped_no_date = 0
-        events_skipped_exists = 0
+        await self.work_queue.enqueue(
+            run_id,
+            PHASE_DISCOVERY,
+            [(ticker, {"ticker": ticker}) for ticker in TARGET_TICKERS]
+        )
+
+    async def _phase_hype_calculation(self, run_id: str):
+        """
+        Phase 2: Calculate multi-source hype scores for existing events.
+        The lifecycle sweep runs first, so only live upcoming events are enqueued
+        (one work unit per event); events created during Phase 1 are enqueued by
+        the pipeline as they are persisted.
+        """
+        print(f"\n[Phase 2] Hype Score Calculation...")
+        
+        self._lifecycle = await get_lifecycle_sweeper(self.repository).sweep()
+        
+        if get_settings().REFRESH_SCHEDULER_ENABLED:
+            print("Existing events are refreshed on their own cadence (refresh scheduler).")
+            return
+        
+        try:
+            events = await self.repository.list_unfinished_events()
+        except Exception as e:
+            print(f"Error fetching events: {e}")
+            return
+        
+        if not events:
+            print("No existing events to process.")
+            return
+        
+        print(f"Enqueuing {len(events)} events...")
         
-        for i, ticker in enumerate(TARGET_TICKERS):
-            print(f"\n[{i+1}/{len(TARGET_TICKERS)}] Processing {ticker}...")
+        await self.work_queue.enqueue(
+            run_id,
+            PHASE_HYPE,
+            [(str(event['id']), self._hype_unit_payload(event)) for event in events]
+        )
+
+    def _hype_unit_payload(self, event: Dict[str, Any]) -> Dict[str, Any]:
+        """The event fields a hype work unit needs."""
+        return {
+            "id": event['id'],
+            "title": event['title'],
+            "related_tickers": event.get('related_tickers') or [],
+            "gpt_confidence": event.get('gpt_confidence', 0.5),
+            "status": event.get('status', 'PENDING'),
+            "hype_score": event.get('hype_score', 0),
+            "score_volatility": event.get('score_volatility'),
+            "target_date": str(event.get('target_date') or ''),
+            # Card fields, so the scored row is a complete live update
+            "is_date_confirmed": event.get('is_date_confirmed', False),
+            "event_type": event.get('event_type')
+        }
+
+    async def publish_snapshots(self) -> Optional[Dict[str, int]]:
+        """Render the calendar snapshots (leader only). Failures never fail the run."""
+        if not get_settings().SNAPSHOTS_ENABLED:
+            return None
+        try:
+            return await self.snapshot_publisher.publish()
+        except Exception as e:
+            print(f"  Calendar snapshot error: {e}")
+            return None
+
+    async def refresh_tick(self):
+        """Refresh cadence job: enqueue events that are due for re-scoring."""
+        try:
+            await self.refresh_scheduler.tick()
+        except Exception as e:
+            print(f"Refresh tick error: {e}")
+
+    async def deliver_emails(self):
+        """Outbox job: send queued emails in rate-limited batches."""
+        try:
+            result = await self.email_worker.drain()
+            if any(result.values()):
+                print(f"Emails: {result}")
+        except Exception as e:
+            print(f"Email delivery error: {e}")
+
+    async def _drain_until_complete(self, run_id: str):
+        """
+        Drain a run, waiting for units claimed by other workers to finish.
+        """
+        settings = get_settings()
+        
+        while True:
+            if not self.leader_lock.is_held:
+                print(f"Lease lost, no longer coordinating {run_id}")
+                return
             
-            try:
-                # Step 1: Crawl news
-                discovery_crawler = EventDiscoveryCrawler(ticker=ticker)
-                news_items = await discovery_crawler.run()
-                
-                if not news_items:
-                    print(f"  No news found for {ticker}")
-                    continue
-                
-                print(f"  Found {len(news_items)} news items, sending to GPT...")
-                
-                # Step 2: Extract events using GPT (limit to top 5 news)
-                for news in news_items[:5]:
-                    title = news.get('title', '')
-                    if not title or len(title) < 10:
-                        continue
-                    
-                    # Check if event with similar title exists
-                    try:
-                        existing = self.supabase.table("events")\
-                            .select("id")\
-                            .ilike("title", f"%{title[:40]}%")\
-                            .execute()
-                        
-                        if existing.data:
-                            events_skipped_exists += 1
-                            continue
-                    except Exception:
-                        pass
-                    
-                    # GPT extraction - the ONLY way to create events
-                    gpt_event = await openai_service.extract_event_from_news(
-                        ticker=ticker,
-                        news_title=title,
-                        news_summary=news.get('description', '')
-                    )
-                    
-                    # STRICT: Only save if GPT found a valid future event with date
-                    if not gpt_event:
-                        events_skipped_no_date += 1
-                        continue
-                    
-                    if not gpt_event.get('event_title') or not gpt_event.get('event_date'):
-                        events_skipped_no_date += 1
-                        continue
-                    
-                    # Create event from GPT data
-                    event_data = self._create_event_from_gpt(
-                        ticker=ticker,
-                        news=news,
-                        gpt_event=gpt_event
-                    )
-                    
-                    if event_data:
-                        try:
-                            self.supabase.table("events").insert(event_data).execute()
-                            events_created += 1
-                            print(f"  ✓ Created: {event_data['title'][:40]}... @ {event_data['target_date']}")
-                        except Exception as e:
-                            print(f"  ✗ Error inserting: {e}")
-                    
-                    await asyncio.sleep(0.5)  # Rate limit for GPT API
-                    
-            except Exception as e:
-                print(f"  Error processing {ticker}: {e}")
+            processed = await StreamingPipeline(self, run_id=run_id, stop=self.leader_lock.lost).run()
+            if processed:
+                continue
             
-            await asyncio.sleep(0.3)
+            if await self.work_queue.pending_count(run_id) == 0:
+                return
+            
+            # Remaining units are held by other workers (or waiting for lease expiry)
+            await asyncio.sleep(settings.WORK_POLL_SECONDS)
+
+    async def drain_work_queue(self):
+        """
+        Worker job: stream units from any open run until the queue is empty.
+        Runs on every worker process, so adding workers adds throughput.
+        """
+        if self._is_draining:
+            return
         
-        print(f"\n[Phase 1 Complete]")
-        print(f"  ✓ Created: {events_created}")
-        print(f"  ✗ Skipped (no future date): {events_skipped_no_date}")
-        print(f"  ✗ Skipped (already exists): {events_skipped_exists}")
+        self._is_draining = True
+        try:
+            await StreamingPipeline(self).run()
+        except Exception as e:
+            print(f"Work queue drain error: {e}")
+        finally:
+            self._is_draining = False
 
     def _create_event_from_gpt(
         self, 
@@ -213,91 +424,129 @@ class SchedulerService:
             "related_tickers": [ticker],
             "source_url": news.get('source_url', ''),
             "hype_score": initial_score,
-            "gpt_confidence": confidence
+            "gpt_confidence": confidence,
+            # Scored right away by its own hype unit, which sets the real next refresh;
+            # until then the refresh tick leaves it alone (as if claimed)
+            "next_refresh_at": (datetime.now(timezone.utc) + timedelta(hours=CLAIM_RETRY_HOURS)).isoformat()
         }
 
-    async def _phase_hype_calculation(self):
-        """Phase 2: Calculate multi-source hype scores for all events."""
-        from app.services.crawler.type_b_hype import TypeBHypeCrawler
-        from app.services.crawler.reddit import RedditCrawler, NaverDiscussionCrawler
+    async def _score_event(self, event: Dict[str, Any]) -> Tuple[Optional[Dict[str, int]], Dict[str, int]]:
+        """
+        Score one event: collect multi-source metrics, compute the hype score,
+        auto-publish if eligible and update the event.
         
-        print(f"\n[Phase 2] Hype Score Calculation...")
+        Sources that were unavailable are scored on the remaining weights and their
+        last recorded values are carried into today's metrics row. If no source
+        answered, the event keeps its current score and no row is recorded.
         
-        try:
-            response = self.supabase.table("events")\
-                .select("*")\
-                .neq("status", "FINISHED")\
-                .execute()
-            events = response.data
-        except Exception as e:
-            print(f"Error fetching events: {e}")
-            return
+        Returns:
+            (metrics to record or None, unit result)
+        """
+        event_id = event['id']
+        title = event['title']
+        tickers = event.get('related_tickers', [])
         
-        if not events:
-            print("No events to process.")
-            return
+        print(f"\n  Processing: {title[:35]}... (ID: {event_id})")
         
-        print(f"Processing {len(events)} events...")
+        metrics = await self._collect_multi_source_metrics(title, tickers)
+        unavailable = [key for key in SOURCE_METRIC_KEYS if key not in metrics]
+        if len(unavailable) == len(SOURCE_METRIC_KEYS):
+            print("    All sources unavailable, keeping current score")
+            return None, {"scored": 0, "published": 0, "degraded": 1}
         
-        for event in events:
-            event_id = event['id']
-            title = event['title']
-            tickers = event.get('related_tickers', [])
-            
-            print(f"\n  Processing: {title[:35]}... (ID: {event_id})")
-            
-            try:
-                metrics = await self._collect_multi_source_metrics(title, tickers)
-                prev_metrics = await self._get_previous_metrics(event_id)
-                new_score = HypeCalculator.calculate(metrics, prev_metrics)
-                
-                confidence = event.get('gpt_confidence', 0.5)
-                current_status = event.get('status', 'PENDING')
-                
-                new_status = current_status
-                if current_status == "PENDING":
-                    if HypeCalculator.should_auto_publish(new_score, confidence):
-                        new_status = "ACTIVE"
-                        print(f"    -> Auto-publishing (score: {new_score})")
-                
-                await self._save_metrics(event_id, metrics)
-                
-                self.supabase.table("events").update({
-                    "hype_score": new_score,
-                    "status": new_status,
-                    "updated_at": datetime.now().isoformat()
-                }).eq("id", event_id).execute()
-                
-                print(f"    Score: {new_score} | Status: {new_status}")
-                
-            except Exception as e:
-                print(f"    Error: {e}")
-            
-            await asyncio.sleep(0.3)
+        prev_metrics = await self._get_previous_metrics(event_id)
+        new_score = HypeCalculator.calculate(metrics, prev_metrics, unavailable=unavailable)
+        if unavailable:
+            print(f"    Degraded: scored without {', '.join(unavailable)}")
+            metrics = {**{key: (prev_metrics or {}).get(key, 0) for key in unavailable}, **metrics}
+        
+        confidence = event.get('gpt_confidence', 0.5)
+        current_status = event.get('status', 'PENDING')
+        
+        new_status = current_status
+        if current_status == "PENDING":
+            if HypeCalculator.should_auto_publish(new_score, confidence):
+                new_status = "ACTIVE"
+                print(f"    -> Auto-publishing (score: {new_score})")
+        
+        # Next refresh from the new score, its volatility and the days left
+        previous_score = event.get('hype_score')
+        volatility = update_volatility(
+            event.get('score_volatility'),
+            new_score - previous_score if previous_score is not None else 0
+        )
+        await self.repository.update_event(event_id, {
+            "hype_score": new_score,
+            "status": new_status,
+            "score_volatility": round(volatility, 2),
+            "next_refresh_at": next_refresh_at(new_score, volatility, event.get('target_date')),
+            "updated_at": datetime.now().isoformat()
+        })
+        # Same-process leaderboard and stream (RUN_SCHEDULER_IN_API); other processes read the change feed
+        scored = {**event, "hype_score": new_score, "status": new_status}
+        get_leaderboard().apply([scored])
+        get_live_update_hub().publish(scored)
         
-        print(f"\n[Phase 2 Complete]")
+        print(f"    Score: {new_score} | Status: {new_status}")
+        return metrics, {
+            "scored": 1,
+            "published": int(new_status != current_status),
+            "degraded": int(bool(unavailable))
+        }
+
+    def _print_run_summary(self, summary: Dict[str, Any]):
+        """Print the aggregated run summary."""
+        discovery = summary.get(PHASE_DISCOVERY, {})
+        hype = summary.get(PHASE_HYPE, {})
+        
+        print(f"\n[Run Summary] {summary['run_id']}")
+        print(f"  Tickers: {discovery.get('done', 0)}/{discovery.get('units', 0)} done, {discovery.get('failed', 0)} failed")
+        print(f"  ✓ Created: {discovery.get('created', 0)}")
+        print(f"  ✗ Skipped (no future date): {discovery.get('skipped_no_date', 0)}")
+        print(f"  ✗ Skipped (already exists): {discovery.get('skipped_exists', 0)}")
+        print(f"  ✗ Skipped (GPT budget): {discovery.get('skipped_budget', 0)}")
+        print(f"  ✗ Skipped (seen on earlier runs): {discovery.get('skipped_seen', 0)}")
+        gpt_calls = discovery.get('gpt_calls', 0)
+        if gpt_calls:
+            print(f"  GPT yield: {discovery.get('created', 0) / gpt_calls:.2f} events per call ({gpt_calls} calls)")
+        print(f"  Events: {hype.get('done', 0)}/{hype.get('units', 0)} scored, {hype.get('failed', 0)} failed")
+        print(f"  Auto-published: {hype.get('published', 0)}")
+        print(f"  Degraded (sources unavailable): {hype.get('degraded', 0)}")
+        
+        lifecycle = summary.get("lifecycle")
+        if lifecycle:
+            print(f"  Lifecycle: {lifecycle['finished']} finished, {lifecycle['archived_metrics']} metric rows archived, "
+                  f"{lifecycle['frozen']} stale PENDING frozen")
+        
+        snapshots = summary.get("snapshots")
+        if snapshots:
+            print(f"  Calendar snapshots: {snapshots['written']} written, {snapshots['unchanged']} unchanged, "
+                  f"{snapshots['removed']} removed")
+        
+        gpt = summary.get("gpt")
+        if gpt:
+            print(f"  GPT: {gpt['requests']} requests, {gpt['prompt_tokens']}+{gpt['completion_tokens']} tokens, "
+                  f"${gpt['cost_usd']:.4f}, {gpt['throttled']} throttled")
 
     async def _collect_multi_source_metrics(
         self, 
         keyword: str, 
         tickers: List[str]
     ) -> Dict[str, int]:
-        """Collect hype metrics from multiple sources."""
+        """
+        Collect hype metrics from multiple sources.
+        A source that failed or was skipped (open circuit, run deadline spent) leaves
+        its keys out of the result, so scoring can tell "unavailable" from "zero buzz".
+        """
         from app.services.crawler.type_b_hype import TypeBHypeCrawler
         from app.services.crawler.reddit import RedditCrawler, NaverDiscussionCrawler
         
-        metrics = {
-            "news_count": 0,
-            "news_ranking": 0,
-            "reddit_posts": 0,
-            "reddit_engagement": 0,
-            "naver_buzz": 0
-        }
+        metrics = {"news_ranking": 0}
         
         try:
             news_crawler = TypeBHypeCrawler(keyword=keyword)
             news_result = await news_crawler.run()
-            if news_result:
+            if news_result and not news_result[0].get("error"):
                 metrics["news_count"] = news_result[0].get("hype_score_proxy", 0)
         except Exception as e:
             print(f"      News error: {e}")
@@ -306,15 +555,17 @@ class SchedulerService:
         try:
             reddit_crawler = RedditCrawler(keyword=search_term)
             reddit_result = await reddit_crawler.run()
-            metrics["reddit_posts"] = reddit_result.get("post_count", 0)
-            metrics["reddit_engagement"] = reddit_result.get("engagement", 0)
+            if reddit_result.get("errors", 0) < len(RedditCrawler.SUBREDDITS):
+                metrics["reddit_posts"] = reddit_result.get("post_count", 0)
+                metrics["reddit_engagement"] = reddit_result.get("engagement", 0)
         except Exception as e:
             print(f"      Reddit error: {e}")
         
         try:
             naver_crawler = NaverDiscussionCrawler(keyword=keyword)
             naver_result = await naver_crawler.run()
-            metrics["naver_buzz"] = naver_result.get("post_count", 0)
+            if not naver_result.get("error"):
+                metrics["naver_buzz"] = naver_result.get("post_count", 0)
         except Exception as e:
             print(f"      Naver error: {e}")
         
@@ -323,15 +574,9 @@ class SchedulerService:
     async def _get_previous_metrics(self, event_id: int) -> Optional[Dict[str, int]]:
         """Get previous day's metrics for trend calculation."""
         try:
-            result = self.supabase.table("hype_metrics")\
-                .select("*")\
-                .eq("event_id", event_id)\
-                .order("recorded_at", desc=True)\
-                .limit(1)\
-                .execute()
+            prev = await self.repository.get_latest_metrics(event_id)
             
-            if result.data:
-                prev = result.data[0]
+            if prev:
                 return {
                     "news_count": prev.get("search_volume", 0),
                     "naver_buzz": prev.get("community_buzz", 0),
@@ -344,22 +589,21 @@ class SchedulerService:
         
         return None
 
-    async def _save_metrics(self, event_id: int, metrics: Dict[str, int]):
-        """Save current metrics to hype_metrics table."""
-        try:
-            self.supabase.table("hype_metrics").insert({
-                "event_id": event_id,
-                "recorded_at": date.today().isoformat(),
-                "search_volume": metrics.get("news_count", 0),
-                "community_buzz": metrics.get("naver_buzz", 0),
-                "youtube_count": metrics.get("reddit_posts", 0)
-            }).execute()
-        except Exception as e:
-            print(f"      Save metrics error: {e}")
+    def _build_metrics_row(self, event_id: int, metrics: Dict[str, int]) -> Dict[str, Any]:
+        """Map collected metrics onto a hype_metrics row."""
+        return {
+            "event_id": event_id,
+            "recorded_at": date.today().isoformat(),
+            "search_volume": metrics.get("news_count", 0),
+            "community_buzz": metrics.get("naver_buzz", 0),
+            "youtube_count": metrics.get("reddit_posts", 0)
+        }
 
-    async def trigger_manual_update(self):
-        """Manually trigger the update job."""
-        await self.daily_update_job()
+    async def _save_metrics(self, rows: List[Dict[str, Any]]):
+        """Bulk save metrics rows to hype_metrics table."""
+        if not rows:
+            return
+        await self.repository.insert_hype_metrics(rows)
 
 
 scheduler_service = SchedulerService()
@@ -0,0 +1,273 @@
+"""
+Seen-Article Filter
+
+Remembers which articles discovery already processed, so the same stories are not
+re-triaged and re-sent to GPT every night.
+
+- Fingerprints: hash of the canonical URL and hash of the normalized title
+  (an article is seen if either matches)
+- Front: in-process Bloom filter, warmed from the store once per run. A Bloom miss is
+  definitive, so new articles never cost a lookup
+- Back: exact store with time-based expiry (SEEN_ARTICLE_TTL_DAYS); Bloom hits are
+  confirmed there, so false positives never drop a new article
+
+Stores:
+- DatabaseSeenStore: seen_articles table via the repository (migration_006)
+- InMemorySeenStore: dict with the same expiry (SEEN_STORE=memory); forgotten on restart
+"""
+
+import asyncio
+import hashlib
+import math
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+from app.core.config import get_settings
+from app.services.crawler.parsing import canonical_url, normalize_title
+
+
+def article_fingerprints(item: Dict[str, Any]) -> List[str]:
+    """URL and title fingerprints of a discovery item."""
+    fingerprints = []
+    url = canonical_url(item.get("source_url") or item.get("link") or "")
+    if url.startswith(("http://", "https://")):
+        fingerprints.append("u:" + hashlib.sha1(url.encode()).hexdigest())
+    title = normalize_title(item.get("title") or "")
+    if title:
+        fingerprints.append("t:" + hashlib.sha1(title.encode()).hexdigest())
+    return fingerprints
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter (double hashing over one blake2b digest).
+
+    Args:
+        capacity: Expected number of keys
+        error_rate: Target false-positive rate at capacity
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        capacity = max(capacity, 1)
+        self.size = max(int(math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))), 8)
+        self.hashes = max(int(round(self.size / capacity * math.log(2))), 1)
+        self._bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "big")
+        h2 = int.from_bytes(digest[8:], "big") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, key: str):
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+
+class SeenStore(ABC):
+    """
+    Abstract exact store of seen fingerprints with expiry.
+    """
+
+    @abstractmethod
+    async def find(self, fingerprints: List[str]) -> Set[str]:
+        """Return the fingerprints that are stored and not expired."""
+        pass
+
+    @abstractmethod
+    async def add(self, fingerprints: List[str], ttl_days: int) -> None:
+        pass
+
+    @abstractmethod
+    async def list_page(self, after: Optional[str], limit: int) -> List[str]:
+        """Unexpired fingerprints in key order, for warming the Bloom filter."""
+        pass
+
+    @abstractmethod
+    async def purge_expired(self) -> int:
+        pass
+
+
+class DatabaseSeenStore(SeenStore):
+    """
+    Seen store backed by the seen_articles table.
+    """
+
+    def __init__(self, repository):
+        self.repository = repository
+
+    async def find(self, fingerprints: List[str]) -> Set[str]:
+        return set(await self.repository.find_seen_articles(fingerprints))
+
+    async def add(self, fingerprints: List[str], ttl_days: int) -> None:
+        expires_at = (datetime.now(timezone.utc) + timedelta(days=ttl_days)).isoformat()
+        await self.repository.upsert_seen_articles(fingerprints, expires_at)
+
+    async def list_page(self, after: Optional[str], limit: int) -> List[str]:
+        return await self.repository.list_seen_articles(after, limit)
+
+    async def purge_expired(self) -> int:
+        return await self.repository.delete_expired_seen_articles()
+
+
+class InMemorySeenStore(SeenStore):
+    """
+    In-process seen store with the same expiry semantics.
+
+    Args:
+        clock: Time source in seconds (injectable so tests can fast-forward expiry)
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.time):
+        self.clock = clock
+        self._expires: Dict[str, float] = {}
+
+    async def find(self, fingerprints: List[str]) -> Set[str]:
+        now = self.clock()
+        return {fp for fp in fingerprints if self._expires.get(fp, 0) > now}
+
+    async def add(self, fingerprints: List[str], ttl_days: int) -> None:
+        expires = self.clock() + ttl_days * 86400
+        for fp in fingerprints:
+            self._expires[fp] = expires
+
+    async def list_page(self, after: Optional[str], limit: int) -> List[str]:
+        now = self.clock()
+        keys = sorted(fp for fp, expires in self._expires.items() if expires > now and (after is None or fp > after))
+        return keys[:limit]
+
+    async def purge_expired(self) -> int:
+        now = self.clock()
+        expired = [fp for fp, expires in self._expires.items() if expires <= now]
+        for fp in expired:
+            del self._expires[fp]
+        return len(expired)
+
+
+class SeenArticleFilter:
+    """
+    Bloom front + exact store. Marks are buffered and written with flush().
+
+    Args:
+        store: Exact backing store
+        ttl_days: How long a fingerprint is remembered
+        capacity: Expected fingerprints per TTL window (sizes the Bloom filter)
+    """
+
+    WARM_UP_PAGE_SIZE = 1000
+
+    def __init__(self, store: SeenStore, ttl_days: int = 30, capacity: int = 200_000):
+        self.store = store
+        self.ttl_days = ttl_days
+        self.capacity = capacity
+        self.bloom = BloomFilter(capacity)
+        self.run_id: Optional[str] = None
+        self._run_started = False
+        self._warm = False
+        self._warm_lock: Optional[asyncio.Lock] = None
+        self._pending: Set[str] = set()
+
+    async def begin_run(self, run_id: Optional[str]):
+        """Once per run: purge expired fingerprints and rebuild the Bloom filter."""
+        if self._run_started and run_id == self.run_id:
+            return
+        if self._warm_lock is None:
+            self._warm_lock = asyncio.Lock()
+        async with self._warm_lock:
+            if self._run_started and run_id == self.run_id:
+                return
+            self.run_id = run_id
+            self._run_started = True
+            try:
+                purged = await self.store.purge_expired()
+                if purged:
+                    print(f"  Purged {purged} expired seen-article fingerprints")
+
+                bloom = BloomFilter(self.capacity)
+                after = None
+                while True:
+                    page = await self.store.list_page(after, self.WARM_UP_PAGE_SIZE)
+                    for fp in page:
+                        bloom.add(fp)
+                    if len(page) < self.WARM_UP_PAGE_SIZE:
+                        break
+                    after = page[-1]
+                for fp in self._pending:
+                    bloom.add(fp)
+                self.bloom = bloom
+                self._warm = True
+            except Exception as e:
+                # Without a warm filter every item is confirmed against the store instead
+                print(f"  Seen filter warm-up error: {e}")
+
+    async def filter_new(self, items: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Drop items whose URL or title was already processed.
+
+        Returns:
+            (new items, number of items dropped as seen)
+        """
+        keyed = [(item, article_fingerprints(item)) for item in items]
+        maybe_seen = [
+            fp for _, fps in keyed for fp in fps
+            if not self._warm or fp in self.bloom
+        ]
+        if not maybe_seen:
+            return items, 0
+
+        try:
+            seen = await self.store.find(maybe_seen)
+        except Exception as e:
+            print(f"  Seen filter lookup error: {e}")
+            return items, 0
+        seen |= self._pending & set(maybe_seen)
+
+        new_items = [item for item, fps in keyed if not any(fp in seen for fp in fps)]
+        return new_items, len(items) - len(new_items)
+
+    def mark(self, item: Dict[str, Any]):
+        """Remember an item as processed (written on the next flush)."""
+        for fp in article_fingerprints(item):
+            self._pending.add(fp)
+            self.bloom.add(fp)
+
+    async def flush(self):
+        if not self._pending:
+            return
+        fingerprints = list(self._pending)
+        try:
+            await self.store.add(fingerprints, self.ttl_days)
+            self._pending.difference_update(fingerprints)
+        except Exception as e:
+            # Kept pending; retried on the next flush
+            print(f"  Seen filter flush error: {e}")
+
+
+_seen_filter: Optional[SeenArticleFilter] = None
+
+
+def get_seen_filter() -> SeenArticleFilter:
+    """
+    Return the process-wide seen-article filter.
+    SEEN_STORE=memory uses the in-process stand-in (forgotten on restart).
+    """
+    global _seen_filter
+    if _seen_filter is None:
+        settings = get_settings()
+        if settings.SEEN_STORE == "memory":
+            store: SeenStore = InMemorySeenStore()
+        else:
+            from app.db.repository import get_repository
+            store = DatabaseSeenStore(get_repository())
+        _seen_filter = SeenArticleFilter(
+            store,
+            ttl_days=settings.SEEN_ARTICLE_TTL_DAYS,
+            capacity=settings.SEEN_FILTER_CAPACITY
+        )
+    return _seen_filter
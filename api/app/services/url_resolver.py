@@ -0,0 +1,335 @@
+"""
+Google News URL Resolver
+
+Google News RSS `link` values are opaque news.google.com redirect links, so the same
+article gets a different URL per feed, language and run. The resolver maps them to the
+canonical publisher URL, so dedup, seen-article fingerprints and the duplicate check
+key on stable URLs.
+
+- Offline first: older article ids embed the publisher URL (base64 protobuf) and are
+  decoded without a request
+- Otherwise the article page is fetched (own resilience source, rate-limited, bounded
+  concurrency) and the publisher URL is taken from the redirect or from the page's
+  publisher markers (data-n-au, rel=canonical); other links on the page (footer,
+  YouTube, consent interstitial) are never used, so no guess is ever stored
+- Concurrent requests for the same link share one resolution
+- Results are cached in process and in the resolved_urls table (migration_007), so each
+  link is resolved once, ever; failures are only remembered for the process
+
+Stores:
+- DatabaseResolvedUrlStore: resolved_urls table via the repository
+- InMemoryResolvedUrlStore: RESOLVED_URL_STORE=memory; every link is resolved again
+  after a restart
+"""
+
+import asyncio
+import base64
+import html
+import re
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Set
+from urllib.parse import urlsplit
+import httpx
+from app.core.config import get_settings
+from app.services.crawler.fetch import SOURCE_GOOGLE_NEWS_REDIRECT, fetch
+from app.services.crawler.parsing import canonical_url
+from app.services.resilience import RateLimiter, SourceUnavailable
+
+
+GOOGLE_NEWS_HOST = "news.google.com"
+
+# Markers of the publisher URL in a Google News article page, most reliable first
+_PAGE_URL_PATTERNS = [
+    re.compile(r'data-n-au="([^"]+)"'),
+    re.compile(r'<link[^>]+rel="canonical"[^>]+href="([^"]+)"'),
+]
+
+# Hosts that are never the publisher (Google itself, its consent and video pages)
+_GOOGLE_HOST_SUFFIXES = ("youtube.com", "youtu.be", "gstatic.com", "googleusercontent.com")
+
+
+def is_google_news_url(url: str) -> bool:
+    return urlsplit(url or "").netloc.lower() == GOOGLE_NEWS_HOST
+
+
+def _read_varint(data: bytes, pos: int):
+    value, shift = 0, 0
+    while pos < len(data):
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return value, pos
+        shift += 7
+    return None, pos
+
+
+def decode_google_news_url(url: str) -> Optional[str]:
+    """
+    Decode the publisher URL embedded in a legacy article id
+    (news.google.com/rss/articles/CBMi...). Returns None for opaque ids.
+    """
+    parts = urlsplit(url or "")
+    if parts.netloc.lower() != GOOGLE_NEWS_HOST:
+        return None
+    segments = [s for s in parts.path.split("/") if s]
+    if "articles" not in segments[:-1]:
+        return None
+    token = segments[segments.index("articles") + 1]
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+    except (ValueError, TypeError):
+        return None
+
+    # Field 1 (varint 19) then field 4 (length-delimited URL)
+    if not raw.startswith(b"\x08\x13\x22"):
+        return None
+    length, pos = _read_varint(raw, 3)
+    if length is None:
+        return None
+    try:
+        decoded = raw[pos:pos + length].decode("ascii")
+    except UnicodeDecodeError:
+        return None
+    return decoded if decoded.startswith(("http://", "https://")) else None
+
+
+def is_google_host(host: str) -> bool:
+    host = (host or "").lower()
+    return "google." in host or host.endswith(_GOOGLE_HOST_SUFFIXES)
+
+
+def publisher_url_from_page(page: str) -> Optional[str]:
+    """Non-Google absolute URL the article page marks as the publisher's, or None."""
+    for pattern in _PAGE_URL_PATTERNS:
+        for match in pattern.finditer(page):
+            candidate = html.unescape(match.group(1))
+            if candidate.startswith(("http://", "https://")) and not is_google_host(urlsplit(candidate).netloc):
+                return candidate
+    return None
+
+
+class ResolvedUrlStore(ABC):
+    """
+    Abstract persistent map of redirect link → canonical publisher URL.
+    """
+
+    @abstractmethod
+    async def find(self, redirect_urls: List[str]) -> Dict[str, str]:
+        pass
+
+    @abstractmethod
+    async def add(self, resolved: Dict[str, str]) -> None:
+        pass
+
+
+class DatabaseResolvedUrlStore(ResolvedUrlStore):
+    """
+    Resolver cache backed by the resolved_urls table.
+    """
+
+    def __init__(self, repository):
+        self.repository = repository
+
+    async def find(self, redirect_urls: List[str]) -> Dict[str, str]:
+        return await self.repository.find_resolved_urls(redirect_urls)
+
+    async def add(self, resolved: Dict[str, str]) -> None:
+        await self.repository.upsert_resolved_urls(resolved)
+
+
+class InMemoryResolvedUrlStore(ResolvedUrlStore):
+    """
+    In-process resolver cache (forgotten on restart).
+    """
+
+    def __init__(self):
+        self._urls: Dict[str, str] = {}
+
+    async def find(self, redirect_urls: List[str]) -> Dict[str, str]:
+        return {url: self._urls[url] for url in redirect_urls if url in self._urls}
+
+    async def add(self, resolved: Dict[str, str]) -> None:
+        self._urls.update(resolved)
+
+
+class UrlResolver:
+    """
+    Resolves Google News redirect links to canonical publisher URLs.
+
+    Args:
+        store: Persistent resolution cache
+        concurrency: Max article pages fetched at once
+        rate: Max article page requests per second
+        cache_size: Resolutions kept in process (LRU)
+    """
+
+    def __init__(self, store: ResolvedUrlStore, concurrency: int = 4, rate: float = 5.0, cache_size: int = 50_000):
+        self.store = store
+        self.concurrency = max(concurrency, 1)
+        self.rate_limiter = RateLimiter(rate)
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, str]" = OrderedDict()
+        self._failed: Set[str] = set()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+        self.decoded = 0
+        self.fetched = 0
+        self.failed = 0
+
+    # --- Cache ------------------------------------------------------------
+
+    def _remember(self, key: str, url: str):
+        self._cache[key] = url
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    async def lookup(self, links: List[str]) -> Dict[str, str]:
+        """
+        Cached resolutions only (process cache, then store): never fetches.
+
+        Returns:
+            {redirect key: canonical URL} for the links resolved before
+        """
+        found: Dict[str, str] = {}
+        missing = []
+        for key in {canonical_url(link) for link in links if is_google_news_url(link)}:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                found[key] = self._cache[key]
+            else:
+                missing.append(key)
+
+        if missing:
+            try:
+                stored = await self.store.find(missing)
+            except Exception as e:
+                print(f"  URL cache lookup error: {e}")
+                stored = {}
+            for key, url in stored.items():
+                self._remember(key, url)
+            found.update(stored)
+        return found
+
+    async def apply_cached(self, items: List[Dict[str, Any]]) -> int:
+        """Swap in already-known canonical URLs (no network). Returns the count replaced."""
+        known = await self.lookup([item.get("source_url", "") for item in items])
+        replaced = 0
+        for item in items:
+            url = known.get(canonical_url(item.get("source_url", "")))
+            if url:
+                item["google_news_url"] = item["source_url"]
+                item["source_url"] = url
+                replaced += 1
+        return replaced
+
+    # --- Resolution -------------------------------------------------------
+
+    async def resolve_items(self, items: List[Dict[str, Any]]) -> int:
+        """
+        Resolve the redirect links of `items` in place (source_url becomes the publisher URL,
+        the original link is kept as google_news_url). Returns the count resolved.
+        """
+        pending = [item for item in items if is_google_news_url(item.get("source_url", ""))]
+        if not pending:
+            return 0
+
+        known = await self.lookup([item["source_url"] for item in pending])
+        keys = {canonical_url(item["source_url"]) for item in pending} - set(known)
+
+        async with httpx.AsyncClient(follow_redirects=True) as client:
+            urls = await asyncio.gather(*(self._resolve(client, key) for key in keys))
+        new = {key: url for key, url in zip(keys, urls) if url}
+        if new:
+            try:
+                await self.store.add(new)
+            except Exception as e:
+                # Still cached in process; stored again on the next resolution
+                print(f"  URL cache write error: {e}")
+        known.update(new)
+
+        resolved = 0
+        for item in pending:
+            url = known.get(canonical_url(item["source_url"]))
+            if url:
+                item["google_news_url"] = item["source_url"]
+                item["source_url"] = url
+                resolved += 1
+        return resolved
+
+    async def _resolve(self, client: httpx.AsyncClient, key: str) -> Optional[str]:
+        """Resolve one link; concurrent callers for the same link share the result."""
+        if key in self._failed:
+            return None
+        future = self._inflight.get(key)
+        if future is not None:
+            return await asyncio.shield(future)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        retryable = False
+        try:
+            url = await self._resolve_uncached(client, key)
+        except SourceUnavailable:
+            # Source skipped for now, not a bad link: try again on a later run
+            url, retryable = None, True
+        except Exception as e:
+            print(f"  URL resolve error ({key[:60]}...): {e}")
+            url = None
+        finally:
+            del self._inflight[key]
+
+        if url:
+            self._remember(key, url)
+        elif not retryable:
+            self.failed += 1
+            self._failed.add(key)
+        future.set_result(url)
+        return url
+
+    async def _resolve_uncached(self, client: httpx.AsyncClient, key: str) -> Optional[str]:
+        decoded = decode_google_news_url(key)
+        if decoded:
+            self.decoded += 1
+            return canonical_url(decoded)
+
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        async with self._semaphore:
+            await self.rate_limiter.wait()
+            response = await fetch(client, SOURCE_GOOGLE_NEWS_REDIRECT, key)
+        self.fetched += 1
+
+        if response.status_code != 200:
+            return None
+        if not is_google_host(response.url.host):
+            return canonical_url(str(response.url))
+        found = publisher_url_from_page(response.text)
+        return canonical_url(found) if found else None
+
+
+_url_resolver: Optional[UrlResolver] = None
+
+
+def get_url_resolver() -> UrlResolver:
+    """
+    Return the process-wide URL resolver.
+    RESOLVED_URL_STORE=memory uses the in-process stand-in (forgotten on restart).
+    """
+    global _url_resolver
+    if _url_resolver is None:
+        settings = get_settings()
+        if settings.RESOLVED_URL_STORE == "memory":
+            store: ResolvedUrlStore = InMemoryResolvedUrlStore()
+        else:
+            from app.db.repository import get_repository
+            store = DatabaseResolvedUrlStore(get_repository())
+        _url_resolver = UrlResolver(
+            store,
+            concurrency=settings.URL_RESOLVE_CONCURRENCY,
+            rate=settings.URL_RESOLVE_RATE_PER_SECOND
+        )
+    return _url_resolver
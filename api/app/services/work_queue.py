@@ -0,0 +1,301 @@
+"""
+Work Queue
+
+Durable queue of pipeline work units with claim/ack/lease semantics, so the daily job
+can be drained by any number of worker processes/nodes in parallel.
+
+- Phase 1 (discovery) units: one per ticker
+- Phase 2 (hype) units: one per event
+
+A claimed unit carries a lease. If the worker dies, the lease expires and the unit
+becomes claimable again (up to max_attempts, then it is marked FAILED). Workers renew
+the leases of units they still hold (e.g. waiting in a pipeline queue).
+
+Queues:
+- DatabaseWorkQueue: work_units table via the repository (migration_004)
+- InMemoryWorkQueue: WORK_QUEUE=memory; the same lease rules, but units are only
+  shared by the pipelines of one process
+"""
+
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from app.core.config import get_settings
+
+
+PHASE_DISCOVERY = "discovery"
+PHASE_HYPE = "hype"
+
+STATUS_QUEUED = "QUEUED"
+STATUS_CLAIMED = "CLAIMED"
+STATUS_DONE = "DONE"
+STATUS_FAILED = "FAILED"
+
+
+class WorkQueue(ABC):
+    """
+    Abstract durable work queue.
+
+    Units are dicts with: id, run_id, phase, unit_key, payload, status, attempts, result, error.
+    """
+
+    def __init__(self, max_attempts: int = 3):
+        self.max_attempts = max_attempts
+
+    @abstractmethod
+    async def enqueue(self, run_id: str, phase: str, units: List[Tuple[str, Dict[str, Any]]]) -> None:
+        """Add (unit_key, payload) pairs. Units already enqueued for the run are ignored."""
+        pass
+
+    @abstractmethod
+    async def claim(
+        self,
+        owner: str,
+        limit: int,
+        lease_seconds: int,
+        run_id: Optional[str] = None,
+        phase: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Claim up to `limit` queued (or lease-expired) units."""
+        pass
+
+    @abstractmethod
+    async def ack(self, unit: Dict[str, Any], owner: str, result: Dict[str, Any]) -> None:
+        """Mark a claimed unit DONE with its result."""
+        pass
+
+    @abstractmethod
+    async def fail(self, unit: Dict[str, Any], owner: str, error: str) -> None:
+        """Return a unit to the queue, or mark it FAILED once attempts are exhausted."""
+        pass
+
+    @abstractmethod
+    async def renew(self, unit_ids: List[int], owner: str, lease_seconds: int) -> List[int]:
+        """Extend the leases of claimed units still held by `owner`. Returns their ids."""
+        pass
+
+    @abstractmethod
+    async def list_units(self, run_id: str, phase: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Return all units of a run (optionally one phase)."""
+        pass
+
+    async def pending_count(self, run_id: str, phase: Optional[str] = None) -> int:
+        """Number of units that are neither DONE nor FAILED."""
+        units = await self.list_units(run_id, phase)
+        return sum(1 for u in units if u["status"] not in (STATUS_DONE, STATUS_FAILED))
+
+    async def summarize(self, run_id: str) -> Dict[str, Any]:
+        """
+        Aggregate unit results into one run summary.
+
+        Returns:
+            Dict keyed by phase with unit status counts and summed numeric results
+        """
+        summary: Dict[str, Any] = {"run_id": run_id}
+        for unit in await self.list_units(run_id):
+            phase_summary = summary.setdefault(unit["phase"], {"units": 0, "done": 0, "failed": 0})
+            phase_summary["units"] += 1
+            if unit["status"] == STATUS_DONE:
+                phase_summary["done"] += 1
+            elif unit["status"] == STATUS_FAILED:
+                phase_summary["failed"] += 1
+
+            for key, value in (unit.get("result") or {}).items():
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    phase_summary[key] = phase_summary.get(key, 0) + value
+        return summary
+
+    def _next_status_after_failure(self, unit: Dict[str, Any]) -> str:
+        return STATUS_FAILED if unit.get("attempts", 0) >= self.max_attempts else STATUS_QUEUED
+
+
+class DatabaseWorkQueue(WorkQueue):
+    """
+    Work queue backed by the work_units table.
+    Claims use FOR UPDATE SKIP LOCKED so concurrent workers never get the same unit.
+    """
+
+    def __init__(self, repository, max_attempts: int = 3):
+        super().__init__(max_attempts)
+        self.repository = repository
+
+    async def enqueue(self, run_id: str, phase: str, units: List[Tuple[str, Dict[str, Any]]]) -> None:
+        rows = [
+            {"run_id": run_id, "phase": phase, "unit_key": key, "payload": payload}
+            for key, payload in units
+        ]
+        await self.repository.enqueue_work_units(rows)
+
+    async def claim(
+        self,
+        owner: str,
+        limit: int,
+        lease_seconds: int,
+        run_id: Optional[str] = None,
+        phase: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        return await self.repository.claim_work_units(
+            owner, limit, lease_seconds, self.max_attempts, run_id, phase
+        )
+
+    async def ack(self, unit: Dict[str, Any], owner: str, result: Dict[str, Any]) -> None:
+        await self.repository.update_work_unit(unit["id"], owner, {
+            "status": STATUS_DONE,
+            "result": result,
+            "error": None
+        })
+
+    async def fail(self, unit: Dict[str, Any], owner: str, error: str) -> None:
+        await self.repository.update_work_unit(unit["id"], owner, {
+            "status": self._next_status_after_failure(unit),
+            "error": error[:500]
+        })
+
+    async def renew(self, unit_ids: List[int], owner: str, lease_seconds: int) -> List[int]:
+        return await self.repository.renew_work_unit_leases(unit_ids, owner, lease_seconds)
+
+    async def list_units(self, run_id: str, phase: Optional[str] = None) -> List[Dict[str, Any]]:
+        return await self.repository.list_work_units(run_id, phase)
+
+
+class InMemoryWorkQueue(WorkQueue):
+    """
+    In-process work queue with the same semantics as the work_units table.
+
+    Args:
+        clock: Time source in seconds (injectable so tests can fast-forward lease expiry)
+    """
+
+    def __init__(self, max_attempts: int = 3, clock: Callable[[], float] = time.monotonic):
+        super().__init__(max_attempts)
+        self.clock = clock
+        self._units: Dict[int, Dict[str, Any]] = {}
+        self._keys: Dict[Tuple[str, str, str], int] = {}
+        self._next_id = 1
+
+    async def enqueue(self, run_id: str, phase: str, units: List[Tuple[str, Dict[str, Any]]]) -> None:
+        for key, payload in units:
+            if (run_id, phase, key) in self._keys:
+                continue
+            unit_id = self._next_id
+            self._next_id += 1
+            self._keys[(run_id, phase, key)] = unit_id
+            self._units[unit_id] = {
+                "id": unit_id,
+                "run_id": run_id,
+                "phase": phase,
+                "unit_key": key,
+                "payload": payload,
+                "status": STATUS_QUEUED,
+                "attempts": 0,
+                "lease_owner": None,
+                "lease_expires_at": None,
+                "result": None,
+                "error": None
+            }
+
+    async def claim(
+        self,
+        owner: str,
+        limit: int,
+        lease_seconds: int,
+        run_id: Optional[str] = None,
+        phase: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        now = self.clock()
+        claimed = []
+        for unit in self._units.values():
+            if len(claimed) >= limit:
+                break
+            if run_id is not None and unit["run_id"] != run_id:
+                continue
+            if phase is not None and unit["phase"] != phase:
+                continue
+
+            lease_expired = unit["status"] == STATUS_CLAIMED and unit["lease_expires_at"] < now
+            if unit["status"] != STATUS_QUEUED and not lease_expired:
+                continue
+            if unit["attempts"] >= self.max_attempts:
+                # Out of attempts: fail it rather than leave it pending forever
+                unit["status"] = STATUS_FAILED
+                unit["error"] = unit["error"] or "lease expired after max attempts"
+                continue
+
+            unit["status"] = STATUS_CLAIMED
+            unit["attempts"] += 1
+            unit["lease_owner"] = owner
+            unit["lease_expires_at"] = now + lease_seconds
+            claimed.append(dict(unit))
+        return claimed
+
+    async def ack(self, unit: Dict[str, Any], owner: str, result: Dict[str, Any]) -> None:
+        stored = self._units.get(unit["id"])
+        if stored and stored["lease_owner"] == owner:
+            stored.update(status=STATUS_DONE, result=result, error=None,
+                          lease_owner=None, lease_expires_at=None)
+
+    async def fail(self, unit: Dict[str, Any], owner: str, error: str) -> None:
+        stored = self._units.get(unit["id"])
+        if stored and stored["lease_owner"] == owner:
+            stored.update(status=self._next_status_after_failure(stored), error=error[:500],
+                          lease_owner=None, lease_expires_at=None)
+
+    async def renew(self, unit_ids: List[int], owner: str, lease_seconds: int) -> List[int]:
+        now = self.clock()
+        renewed = []
+        for unit_id in unit_ids:
+            unit = self._units.get(unit_id)
+            if unit and unit["status"] == STATUS_CLAIMED and unit["lease_owner"] == owner:
+                unit["lease_expires_at"] = now + lease_seconds
+                renewed.append(unit_id)
+        return renewed
+
+    async def release_claims(self, run_id: str, owner: str) -> int:
+        """Requeue expired units of a run still claimed by `owner` (FAILED once out of attempts)."""
+        now = self.clock()
+        released = 0
+        for unit in self._units.values():
+            if (unit["run_id"] == run_id and unit["status"] == STATUS_CLAIMED
+                    and unit["lease_owner"] == owner and unit["lease_expires_at"] < now):
+                if unit["attempts"] >= self.max_attempts:
+                    unit.update(status=STATUS_FAILED, error="leader lost on the last attempt")
+                else:
+                    unit["status"] = STATUS_QUEUED
+                unit.update(lease_owner=None, lease_expires_at=None)
+                released += 1
+        return released
+
+    async def fail_open_units(self, run_id: str, error: str) -> int:
+        """Mark the QUEUED and CLAIMED units of a run FAILED."""
+        failed = 0
+        for unit in self._units.values():
+            if unit["run_id"] == run_id and unit["status"] in (STATUS_QUEUED, STATUS_CLAIMED):
+                unit.update(status=STATUS_FAILED, error=error, lease_owner=None, lease_expires_at=None)
+                failed += 1
+        return failed
+
+    async def list_units(self, run_id: str, phase: Optional[str] = None) -> List[Dict[str, Any]]:
+        return [
+            dict(u) for u in self._units.values()
+            if u["run_id"] == run_id and (phase is None or u["phase"] == phase)
+        ]
+
+
+_in_memory_queue: Optional[InMemoryWorkQueue] = None
+
+
+def get_work_queue() -> WorkQueue:
+    """
+    Return the configured work queue.
+    WORK_QUEUE=memory uses the in-process stand-in (no cross-process sharding).
+    """
+    global _in_memory_queue
+    settings = get_settings()
+
+    if settings.WORK_QUEUE == "memory":
+        if _in_memory_queue is None:
+            _in_memory_queue = InMemoryWorkQueue(max_attempts=settings.WORK_MAX_ATTEMPTS)
+        return _in_memory_queue
+
+    from app.db.repository import get_repository
+    return DatabaseWorkQueue(get_repository(), max_attempts=settings.WORK_MAX_ATTEMPTS)
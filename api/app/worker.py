@@ -0,0 +1,38 @@
+"""
+Pipeline Worker
+
+Dedicated process that owns the scheduler (daily discovery + hype pipeline),
+so crawl CPU and blocking I/O never compete with API request serving and
+the API can be scaled to N workers without running N copies of the nightly job.
+
+Usage:
+    python -m app.worker
+"""
+
+import asyncio
+import signal
+from app.services.scheduler import scheduler_service
+from app.services.cpu_pool import shutdown_cpu_pool
+
+
+async def main():
+    """Start the scheduler and block until SIGINT/SIGTERM."""
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop_event.set)
+
+    scheduler_service.start()
+    print("Worker started. Waiting for scheduled jobs...")
+
+    try:
+        await stop_event.wait()
+    finally:
+        scheduler_service.shutdown()
+        await scheduler_service.repository.close()
+        shutdown_cpu_pool()
+        print("Worker stopped.")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,105 @@
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import date, datetime, timedelta, timezone
+from typing import List
+
+# Add api directory to path to import app modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+# No database is used; settings only need to load
+os.environ.setdefault("SUPABASE_URL", "http://localhost:54321")
+os.environ.setdefault("SUPABASE_KEY", "bench")
+
+from pydantic import TypeAdapter
+from app.api.serialization import dump_events, iter_events
+from app.core.config import get_settings
+from app.schemas.event import EventResponse
+
+EVENT_LIST_ADAPTER = TypeAdapter(List[EventResponse])
+
+
+def make_rows(count: int):
+    """Event rows as PostgREST returns them (ISO strings, no nested relationships)."""
+    now = datetime.now(timezone.utc)
+    return [
+        {
+            "id": i,
+            "title": f"Benchmark event {i}: product launch and earnings preview",
+            "description": "Synthetic description " * 8,
+            "source_url": f"https://example.com/news/{i}",
+            "target_date": (date.today() + timedelta(days=30 + i % 150)).isoformat(),
+            "is_date_confirmed": bool(i % 2),
+            "event_type": "TYPE_A" if i % 3 else "TYPE_B",
+            "hype_score": i % 100,
+            "gpt_confidence": 0.85,
+            "related_tickers": ["NVDA", "AMD"] if i % 2 else ["TSLA"],
+            "status": "ACTIVE",
+            "scoring_frozen_at": None,
+            "next_refresh_at": now.isoformat(),
+            "score_volatility": 1.5,
+            "created_at": (now - timedelta(days=i % 60)).isoformat(),
+            "updated_at": now.isoformat()
+        }
+        for i in range(count)
+    ]
+
+
+def response_model_path(rows):
+    """Before: response_model validation, then JSONResponse (json.dumps)."""
+    validated = EVENT_LIST_ADAPTER.validate_python(rows)
+    content = EVENT_LIST_ADAPTER.dump_python(validated, mode="json")
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode()
+
+
+def type_adapter_path(rows):
+    """Precompiled TypeAdapter: validate + dump_json in Rust."""
+    return EVENT_LIST_ADAPTER.dump_json(EVENT_LIST_ADAPTER.validate_python(rows))
+
+
+def trusted_path(rows):
+    """Trusted construction + orjson (API_TRUSTED_SERIALIZATION=true)."""
+    return dump_events(rows)
+
+
+def streamed_path(rows):
+    """Trusted path in 100-row chunks, as a streamed listing sends it."""
+    return b"".join(iter_events(rows))
+
+
+def bench(fn, rows, repeat: int) -> float:
+    """Best-of-`repeat` milliseconds per call."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(rows)
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serialization time per 1,000 events")
+    parser.add_argument("--events", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    get_settings().API_TRUSTED_SERIALIZATION = True
+    rows = make_rows(args.events)
+    per = 1000 / args.events
+
+    baseline = None
+    for name, fn in [
+        ("response_model + json.dumps (before)", response_model_path),
+        ("TypeAdapter.dump_json", type_adapter_path),
+        ("trusted + orjson (after)", trusted_path),
+        ("trusted + orjson, streamed", streamed_path),
+    ]:
+        ms = bench(fn, rows, args.repeat) * per
+        baseline = baseline or ms
+        print(f"{name:40s} {ms:8.2f} ms / 1k events   {baseline / ms:5.1f}x   {len(fn(rows)) // 1024} KB")
+
+
+if __name__ == "__main__":
+    main()
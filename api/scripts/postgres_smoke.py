@@ -0,0 +1,64 @@
+import asyncio
+import os
+import sys
+from datetime import date, timedelta
+from dotenv import load_dotenv
+
+# Add api directory to path to import app modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+load_dotenv()
+
+from app.core.config import get_settings
+from app.db.postgres import PostgresRepository
+
+async def smoke_test():
+    """
+    Round-trip check of the direct Postgres backend against a local instance.
+    Requires DATABASE_URL and the events/hype_metrics tables from app/db/schema.sql.
+    """
+    settings = get_settings()
+    if not settings.DATABASE_URL:
+        print("DATABASE_URL is not set.")
+        return
+
+    repository = PostgresRepository(settings.DATABASE_URL)
+
+    try:
+        event = await repository.insert_event({
+            "title": "Postgres Smoke Test Event",
+            "target_date": (date.today() + timedelta(days=90)).isoformat(),
+            "event_type": "TYPE_A",
+            "related_tickers": ["TEST"],
+            "status": "PENDING"
+        })
+        event_id = event["id"]
+        print(f"Inserted event {event_id}")
+
+        ids = await repository.find_event_ids_by_title("Smoke Test")
+        print(f"Title lookup: {ids}")
+
+        rows = [
+            {
+                "event_id": event_id,
+                "recorded_at": (date.today() - timedelta(days=6 - i)).isoformat(),
+                "search_volume": i * 10,
+                "community_buzz": i * 2,
+                "youtube_count": i
+            }
+            for i in range(7)
+        ]
+        written = await repository.insert_hype_metrics(rows)
+        print(f"COPY wrote {written} hype_metrics rows")
+
+        latest = await repository.get_latest_metrics(event_id)
+        print(f"Latest metrics: {latest}")
+
+        pool = await repository.get_pool()
+        await pool.execute("DELETE FROM public.events WHERE id = $1", event_id)
+        print("Cleaned up.")
+    finally:
+        await repository.close()
+
+if __name__ == "__main__":
+    asyncio.run(smoke_test())
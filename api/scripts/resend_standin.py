@@ -0,0 +1,141 @@
+"""
+Local stand-in for the Resend API (POST /emails, POST /emails/batch).
+
+Accepts what the email outbox sends, keeps it in memory and can misbehave on
+purpose, so delivery, batching, retries and rate limiting can be exercised without
+a Resend account:
+
+    python scripts/resend_standin.py --port 8025 --rate-limit 2 --fail-rate 0.2
+    EMAIL_PROVIDER=resend RESEND_API_URL=http://localhost:8025 RESEND_API_KEY=re_local ...
+
+GET /emails lists what was received; DELETE /emails clears it.
+"""
+
+import argparse
+import asyncio
+import random
+import time
+import uuid
+from typing import Any, Dict, List
+import uvicorn
+from fastapi import FastAPI, Header, Request
+from fastapi.responses import JSONResponse
+
+app = FastAPI(title="Resend stand-in")
+
+options = argparse.Namespace(rate_limit=0.0, fail_rate=0.0, latency=0.0, reject_domain="invalid.test")
+received: List[Dict[str, Any]] = []
+idempotent_responses: Dict[str, Dict[str, Any]] = {}
+request_times: List[float] = []
+
+
+def _error(status: int, name: str, message: str, headers: Dict[str, str] = None) -> JSONResponse:
+    return JSONResponse({"statusCode": status, "name": name, "message": message}, status_code=status, headers=headers)
+
+
+def _invalid(email: Dict[str, Any]) -> str:
+    """Validation error of one email, or an empty string."""
+    for field in ("from", "to", "subject"):
+        if not email.get(field):
+            return f"Missing `{field}` field."
+    recipients = email["to"] if isinstance(email["to"], list) else [email["to"]]
+    if any(str(r).endswith("@" + options.reject_domain) for r in recipients):
+        return "Invalid `to` field."
+    return ""
+
+
+async def _misbehave(authorization: str):
+    """Auth, injected latency, rate limit and random server errors; None when the request may proceed."""
+    if not authorization or not authorization.startswith("Bearer "):
+        return _error(401, "missing_api_key", "Missing API key in the authorization header.")
+    if options.latency:
+        await asyncio.sleep(options.latency)
+    now = time.monotonic()
+    request_times[:] = [t for t in request_times if now - t < 1.0]
+    if options.rate_limit and len(request_times) >= options.rate_limit:
+        return _error(429, "rate_limit_exceeded", "Too many requests.", {"retry-after": "1"})
+    request_times.append(now)
+    if random.random() < options.fail_rate:
+        return _error(500, "internal_server_error", "Injected failure.")
+    return None
+
+
+def _accept(email: Dict[str, Any]) -> Dict[str, str]:
+    email_id = str(uuid.uuid4())
+    received.append({"id": email_id, **email})
+    return {"id": email_id}
+
+
+@app.post("/emails/batch")
+async def send_batch(
+    request: Request,
+    authorization: str = Header(None),
+    idempotency_key: str = Header(None),
+    x_batch_validation: str = Header("strict")
+):
+    if idempotency_key and idempotency_key in idempotent_responses:
+        return idempotent_responses[idempotency_key]
+    failure = await _misbehave(authorization)
+    if failure:
+        return failure
+
+    emails = await request.json()
+    if not isinstance(emails, list) or not 1 <= len(emails) <= 100:
+        return _error(422, "validation_error", "Send between 1 and 100 emails.")
+    errors = [{"index": i, "message": message} for i, message in ((i, _invalid(e)) for i, e in enumerate(emails)) if message]
+    if errors and x_batch_validation != "permissive":
+        return _error(422, "validation_error", errors[0]["message"])
+
+    rejected = {error["index"] for error in errors}
+    response: Dict[str, Any] = {"data": [_accept(e) for i, e in enumerate(emails) if i not in rejected]}
+    if x_batch_validation == "permissive":
+        response["errors"] = errors
+    if idempotency_key:
+        idempotent_responses[idempotency_key] = response
+    return response
+
+
+@app.post("/emails")
+async def send_email(request: Request, authorization: str = Header(None), idempotency_key: str = Header(None)):
+    if idempotency_key and idempotency_key in idempotent_responses:
+        return idempotent_responses[idempotency_key]
+    failure = await _misbehave(authorization)
+    if failure:
+        return failure
+
+    email = await request.json()
+    message = _invalid(email)
+    if message:
+        return _error(422, "validation_error", message)
+    response = _accept(email)
+    if idempotency_key:
+        idempotent_responses[idempotency_key] = response
+    return response
+
+
+@app.get("/emails")
+def list_emails():
+    return {"data": received}
+
+
+@app.delete("/emails")
+def clear_emails():
+    received.clear()
+    idempotent_responses.clear()
+    return {"deleted": True}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in for the Resend API")
+    parser.add_argument("--port", type=int, default=8025)
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="Requests per second before 429 (0 = unlimited)")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="Share of requests answered with a 500")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every send")
+    parser.add_argument("--reject-domain", default="invalid.test", help="Recipients at this domain fail validation")
+    args = parser.parse_args()
+    vars(options).update(vars(args))
+    uvicorn.run(app, host="127.0.0.1", port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,4 @@
-import { getEvent } from '@/lib/api';
+import { getEvent, getEventMetrics } from '@/lib/api';
 import { HypeChart } from '@/components/hype-chart';
 import { Badge } from '@/components/ui/badge';
 import { Button } from '@/components/ui/button';
@@ -32,6 +32,12 @@ export default async function EventDetailPage({ params }: PageProps) {
         notFound();
     }
 
+    // The chart is optional: an event still renders if its series cannot be loaded
+    const series = await getEventMetrics(eventId).catch((e) => {
+        console.error("Failed to fetch event metrics:", e);
+        return null;
+    });
+
     return (
         <main className="container mx-auto py-8 px-4 max-w-5xl">
             <div className="mb-6">
@@ -64,7 +70,7 @@ export default async function EventDetailPage({ params }: PageProps) {
                         </div>
                     </div>
 
-                    <HypeChart data={event.hype_metrics || []} />
+                    <HypeChart data={series?.points || []} />
 
                     <Card>
                         <CardHeader>
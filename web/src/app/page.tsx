@@ -1,5 +1,5 @@
 import { getEvents } from '@/lib/api';
-import { EventCard } from '@/components/event-card';
+import { LiveEventGrid } from '@/components/live-event-grid';
 import { Alert, AlertDescription, AlertTitle } from "@/components/ui/alert"
 import { Terminal } from "lucide-react"
 import { Event } from '@/types/event';
@@ -46,11 +46,7 @@ export default async function Home() {
         </Alert>
       )}
 
-      <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-6">
-        {sortedEvents.map((event) => (
-          <EventCard key={event.id} event={event} />
-        ))}
-      </div>
+      <LiveEventGrid initialEvents={sortedEvents} />
 
       {!error && sortedEvents.length === 0 && (
         <div className="text-center py-20 text-muted-foreground border rounded-lg bg-slate-50">
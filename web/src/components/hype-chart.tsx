@@ -1,11 +1,11 @@
 "use client"
 
-import { HypeMetric } from '@/types/event';
+import { HypeSeriesPoint } from '@/types/event';
 import { Line, LineChart, ResponsiveContainer, Tooltip, XAxis, YAxis, CartesianGrid, Legend } from "recharts"
 import { Card, CardContent, CardHeader, CardTitle } from "@/components/ui/card"
 
 interface HypeChartProps {
-    data: HypeMetric[];
+    data: HypeSeriesPoint[];
 }
 
 export function HypeChart({ data }: HypeChartProps) {
@@ -15,7 +15,7 @@ export function HypeChart({ data }: HypeChartProps) {
         search: metric.search_volume,
         buzz: metric.community_buzz,
         youtube: metric.youtube_count
-    })).reverse(); // Assuming API returns newest first, we want oldest first for chart
+    })); // The series API returns oldest first
 
     if (data.length === 0) {
         return (
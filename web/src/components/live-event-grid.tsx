@@ -0,0 +1,72 @@
+"use client"
+
+import { useEffect, useRef, useState } from 'react';
+import { EventCard } from '@/components/event-card';
+import { getEvents, subscribeEventUpdates } from '@/lib/api';
+import { Event, LiveEventUpdate } from '@/types/event';
+
+interface LiveEventGridProps {
+    initialEvents: Event[];
+}
+
+// Fields a card renders; an event we do not have yet is only added from a delta that carries them all
+const CARD_FIELDS = [
+    'title', 'target_date', 'is_date_confirmed', 'event_type', 'hype_score', 'related_tickers', 'status',
+] as const;
+
+function isCompleteEvent(update: LiveEventUpdate): update is LiveEventUpdate & Pick<Event, typeof CARD_FIELDS[number]> {
+    return CARD_FIELDS.every((field) => update[field] !== undefined);
+}
+
+// Event cards kept current by the live stream instead of reloading the page
+export function LiveEventGrid({ initialEvents }: LiveEventGridProps) {
+    const [events, setEvents] = useState<Event[]>(initialEvents);
+    const eventsRef = useRef(events);
+
+    useEffect(() => {
+        eventsRef.current = events;
+    }, [events]);
+
+    useEffect(() => {
+        let refetching: Promise<void> | null = null;
+        const refetch = () => {
+            // Coalesce: one refetch covers every delta that asked for it meanwhile
+            refetching ??= getEvents()
+                .then(setEvents)
+                .catch((e) => console.error('Refetch of live events failed:', e))
+                .finally(() => { refetching = null; });
+        };
+
+        return subscribeEventUpdates(
+            (update) => {
+                const known = eventsRef.current.some((event) => event.id === update.id);
+                if (!known && !isCompleteEvent(update)) {
+                    // A partial delta for an event we never loaded cannot be rendered
+                    refetch();
+                    return;
+                }
+                setEvents((current) => {
+                    const index = current.findIndex((event) => event.id === update.id);
+                    if (index === -1) {
+                        return isCompleteEvent(update) ? [...current, update as Event] : current;
+                    }
+                    const next = [...current];
+                    next[index] = { ...next[index], ...update };
+                    return next;
+                });
+            },
+            refetch
+        );
+    }, []);
+
+    // Sort by Hype Score descending
+    const sortedEvents = [...events].sort((a, b) => b.hype_score - a.hype_score);
+
+    return (
+        <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-6">
+            {sortedEvents.map((event) => (
+                <EventCard key={event.id} event={event} />
+            ))}
+        </div>
+    );
+}
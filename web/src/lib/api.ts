@@ -1,11 +1,13 @@
-import { Event } from '@/types/event';
+import { Event, HypeSeries, LiveEventUpdate, LiveEventUpdateKind } from '@/types/event';
 
 const API_BASE_URL = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000/api/v1';
 
 export async function getEvents(): Promise<Event[]> {
-    console.log('Fetching events from:', `${API_BASE_URL}/events`);
+    // card preset: only the fields EventCard renders
+    const url = `${API_BASE_URL}/events?fields=card`;
+    console.log('Fetching events from:', url);
     try {
-        const res = await fetch(`${API_BASE_URL}/events`, {
+        const res = await fetch(url, {
             cache: 'no-store', // Always fetch fresh data for now
         });
 
@@ -33,3 +35,38 @@ export async function getEvent(id: number): Promise<Event> {
 
     return res.json();
 }
+
+export async function getEventMetrics(id: number, resolution: 'daily' | 'weekly' = 'daily'): Promise<HypeSeries> {
+    const res = await fetch(`${API_BASE_URL}/events/${id}/metrics?resolution=${resolution}`, {
+        cache: 'no-store',
+    });
+
+    if (!res.ok) {
+        throw new Error('Failed to fetch event metrics');
+    }
+
+    return res.json();
+}
+
+const LIVE_EVENT_KINDS: LiveEventUpdateKind[] = ['created', 'score', 'status', 'updated'];
+
+// Live score/status/new-event deltas over SSE; the browser reconnects and resumes by
+// itself. onReset: updates were missed, refetch. Returns a function that closes it.
+export function subscribeEventUpdates(
+    onUpdate: (update: LiveEventUpdate, kind: LiveEventUpdateKind) => void,
+    onReset: () => void,
+    filter: { tickers?: string[]; ids?: number[] } = {}
+): () => void {
+    const params = new URLSearchParams();
+    if (filter.tickers?.length) params.set('tickers', filter.tickers.join(','));
+    if (filter.ids?.length) params.set('ids', filter.ids.join(','));
+    const source = new EventSource(`${API_BASE_URL}/stream/events?${params}`);
+
+    for (const kind of LIVE_EVENT_KINDS) {
+        source.addEventListener(kind, (message) => {
+            onUpdate(JSON.parse((message as MessageEvent).data), kind);
+        });
+    }
+    source.addEventListener('reset', onReset);
+    return () => source.close();
+}
@@ -11,6 +11,27 @@ export interface HypeMetric {
     created_at: string;
 }
 
+// Bucketed series from /events/{id}/metrics (recorded_at = bucket start)
+export interface HypeSeriesPoint {
+    recorded_at: string; // Date string
+    search_volume: number;
+    community_buzz: number;
+    youtube_count: number;
+}
+
+export interface HypeSeries {
+    event_id: number;
+    resolution: 'daily' | 'weekly';
+    points: HypeSeriesPoint[]; // Oldest first, downsampled to max_points
+    buckets: number;
+}
+
+export interface HypeMetricsSummary {
+    latest: HypeSeriesPoint | null;
+    delta_7d: Omit<HypeSeriesPoint, 'recorded_at'> | null;
+    sparkline: number[]; // Daily totals of the last 30 days, oldest first
+}
+
 export interface EventProxy {
     id: number;
     parent_event_id: number;
@@ -34,6 +55,12 @@ export interface Event {
     updated_at: string;
 
     // Relationships
-    hype_metrics?: HypeMetric[];
+    hype_metrics?: HypeMetric[]; // Not embedded in event detail; see getEventMetrics
     proxies?: EventProxy[];
+    metrics_summary?: HypeMetricsSummary; // Event detail only
 }
+
+// Delta from /stream/events: the card fields of one event (missing keys are unchanged)
+export type LiveEventUpdateKind = 'created' | 'score' | 'status' | 'updated';
+export type LiveEventUpdate = Pick<Event, 'id'> & Partial<Pick<Event,
+    'title' | 'target_date' | 'is_date_confirmed' | 'event_type' | 'hype_score' | 'related_tickers' | 'status'>>;